@@ -20,10 +20,12 @@ import android.util.Base64
 import android.util.Log
 import androidx.core.app.NotificationCompat
 import kotlinx.coroutines.*
+import kotlinx.coroutines.channels.Channel
 import okhttp3.MediaType.Companion.toMediaType
 import okhttp3.OkHttpClient
 import okhttp3.Request
 import okhttp3.RequestBody.Companion.toRequestBody
+import org.json.JSONArray
 import org.json.JSONObject
 import java.io.ByteArrayOutputStream
 import java.util.concurrent.TimeUnit
@@ -42,6 +44,11 @@ class CaptureService : Service() {
         .readTimeout(30, TimeUnit.SECONDS)
         .build()
 
+    // Frame checks are small; a slow network falls back to uploading instead of waiting
+    private val checkClient = client.newBuilder()
+        .callTimeout(CHECK_TIMEOUT_SECONDS, TimeUnit.SECONDS)
+        .build()
+
     private val scope = CoroutineScope(Dispatchers.IO + SupervisorJob())
 
     // Callback required by Android 14+ before createVirtualDisplay
@@ -66,8 +73,15 @@ class CaptureService : Service() {
             private set
         var lastError: String? = null
             private set
+        var skippedCount = 0
+            private set
+
+        private const val UPLOAD_ATTEMPTS = 3
+        private const val CHECK_TIMEOUT_SECONDS = 5L
     }
 
+    private class PendingFrame(val index: Int, val base64: String, val phash: String)
+
     override fun onCreate() {
         super.onCreate()
         Log.d(TAG, "CaptureService created")
@@ -189,6 +203,7 @@ class CaptureService : Service() {
     private fun startCaptureLoop(intervalMs: Long, totalCaptures: Int, sessionCode: String, apiUrl: String, scrollPercent: Int, autoScroll: Boolean) {
         isRunning = true
         capturedCount = 0
+        skippedCount = 0
         totalToCapture = totalCaptures
         lastError = null
 
@@ -201,8 +216,24 @@ class CaptureService : Service() {
             updateNotification("Switch to target app! Starting in 4s...")
             delay(4000)
 
-            // Upload frames in background without blocking the capture loop
-            val uploadJobs = mutableListOf<Job>()
+            // Frames are checked in capture order and uploaded in the background,
+            // so the capture loop never waits on the network
+            val online = sessionCode.isNotEmpty() && apiUrl.isNotEmpty()
+            val pending = Channel<PendingFrame>(Channel.UNLIMITED)
+            val uploader = launch {
+                val uploadJobs = mutableListOf<Job>()
+                for (frame in pending) {
+                    if (!isFrameNeeded(apiUrl, sessionCode, frame.index, frame.phash)) {
+                        skippedCount++
+                        Log.d(TAG, "Frame ${frame.index} unchanged, not uploaded")
+                        continue
+                    }
+                    uploadJobs.add(scope.launch {
+                        uploadFrame(apiUrl, sessionCode, frame.index, frame.base64, frame.phash)
+                    })
+                }
+                uploadJobs.joinAll()
+            }
 
             for (i in 1..totalCaptures) {
                 if (!isActive || !isRunning) break
@@ -220,14 +251,13 @@ class CaptureService : Service() {
 
                 if (bitmap != null) {
                     capturedCount = i
+                    val phash = frameHash(bitmap)
                     val base64 = bitmapToBase64(bitmap)
                     bitmap.recycle()
                     Log.d(TAG, "Frame $i captured (${base64.length / 1024}KB)")
 
-                    if (sessionCode.isNotEmpty() && apiUrl.isNotEmpty()) {
-                        uploadJobs.add(scope.launch {
-                            uploadFrame(apiUrl, sessionCode, i, base64)
-                        })
+                    if (online) {
+                        pending.send(PendingFrame(i, base64, phash))
                     }
                 } else {
                     Log.w(TAG, "Frame $i: null after 5 attempts, skipping")
@@ -246,12 +276,13 @@ class CaptureService : Service() {
                 }
             }
 
-            // Wait for all uploads to finish
-            Log.d(TAG, "Waiting for ${uploadJobs.size} uploads to complete...")
+            // Wait for all checks and uploads to finish
+            Log.d(TAG, "Waiting for uploads to complete...")
             updateNotification("Uploading $capturedCount frames...")
-            uploadJobs.forEach { it.join() }
+            pending.close()
+            uploader.join()
 
-            Log.d(TAG, "All done: $capturedCount/$totalCaptures")
+            Log.d(TAG, "All done: $capturedCount/$totalCaptures ($skippedCount unchanged, not uploaded)")
             updateNotification("Done! $capturedCount/$totalCaptures frames")
 
             if (sessionCode.isNotEmpty() && apiUrl.isNotEmpty() && capturedCount > 0) {
@@ -261,6 +292,7 @@ class CaptureService : Service() {
             sendBroadcast(Intent("com.framereader.CAPTURE_COMPLETE").apply {
                 setPackage(packageName)
                 putExtra("capturedCount", capturedCount)
+                putExtra("skippedCount", skippedCount)
                 putExtra("totalCaptures", totalCaptures)
             })
 
@@ -311,29 +343,98 @@ class CaptureService : Service() {
         return Base64.encodeToString(outputStream.toByteArray(), Base64.NO_WRAP)
     }
 
-    private suspend fun uploadFrame(apiUrl: String, sessionCode: String, frameIndex: Int, base64: String) {
-        withContext(Dispatchers.IO) {
-            try {
-                val body = JSONObject().apply {
-                    put("frame_index", frameIndex)
-                    put("timestamp", System.currentTimeMillis())
-                    put("image_base64", base64)
+    /**
+     * 256-bit difference hash as 64 hex digits: the frame is scaled to 17x16 grayscale
+     * and each bit is set when a sample is brighter than its right-hand neighbour.
+     * Must match the server's description in the frame pre-check section.
+     */
+    private fun frameHash(bitmap: Bitmap): String {
+        val small = Bitmap.createScaledBitmap(bitmap, 17, 16, true)
+        val pixels = IntArray(17 * 16)
+        small.getPixels(pixels, 0, 17, 0, 0, 17, 16)
+        if (small != bitmap) small.recycle()
+
+        val luma = IntArray(pixels.size) { i ->
+            val p = pixels[i]
+            (((p shr 16) and 0xFF) * 299 + ((p shr 8) and 0xFF) * 587 + (p and 0xFF) * 114) / 1000
+        }
+        val hex = StringBuilder(64)
+        var nibble = 0
+        var bits = 0
+        for (row in 0 until 16) {
+            for (col in 0 until 16) {
+                val left = luma[row * 17 + col]
+                val right = luma[row * 17 + col + 1]
+                nibble = (nibble shl 1) or (if (left > right) 1 else 0)
+                if (++bits == 4) {
+                    hex.append(Character.forDigit(nibble, 16))
+                    nibble = 0
+                    bits = 0
                 }
+            }
+        }
+        return hex.toString()
+    }
 
+    /** Asks the server whether it needs this frame; uploads anyway if the check fails or times out. */
+    private suspend fun isFrameNeeded(apiUrl: String, sessionCode: String, frameIndex: Int, phash: String): Boolean {
+        return withContext(Dispatchers.IO) {
+            try {
+                val body = JSONObject().put("frames", JSONArray().put(
+                    JSONObject().put("frame_index", frameIndex).put("phash", phash)
+                ))
                 val request = Request.Builder()
-                    .url("$apiUrl/mobile/upload-frame/$sessionCode")
+                    .url("$apiUrl/mobile/frame-check/$sessionCode")
                     .post(body.toString().toRequestBody("application/json".toMediaType()))
                     .build()
 
-                client.newCall(request).execute().use { response ->
+                checkClient.newCall(request).execute().use { response ->
                     if (!response.isSuccessful) {
-                        Log.w(TAG, "Upload frame $frameIndex failed: ${response.code}")
-                    } else {
-                        Log.d(TAG, "Upload frame $frameIndex OK")
+                        Log.w(TAG, "Frame check $frameIndex failed: ${response.code}")
+                        return@withContext true
                     }
+                    val needed = JSONObject(response.body?.string() ?: "{}").optJSONArray("needed")
+                    (0 until (needed?.length() ?: 0)).any { needed!!.getInt(it) == frameIndex }
                 }
             } catch (e: Exception) {
-                Log.e(TAG, "Upload error: ${e.message}", e)
+                Log.w(TAG, "Frame check error: ${e.message}")
+                true
+            }
+        }
+    }
+
+    private suspend fun uploadFrame(apiUrl: String, sessionCode: String, frameIndex: Int, base64: String, phash: String) {
+        withContext(Dispatchers.IO) {
+            val body = JSONObject().apply {
+                put("frame_index", frameIndex)
+                put("timestamp", System.currentTimeMillis())
+                put("image_base64", base64)
+                put("phash", phash)
+            }.toString()
+
+            for (attempt in 1..UPLOAD_ATTEMPTS) {
+                // A failed attempt may still have been stored; don't send the frame twice
+                if (attempt > 1 && !isFrameNeeded(apiUrl, sessionCode, frameIndex, phash)) {
+                    Log.d(TAG, "Upload frame $frameIndex already on server")
+                    return@withContext
+                }
+                try {
+                    val request = Request.Builder()
+                        .url("$apiUrl/mobile/upload-frame/$sessionCode")
+                        .post(body.toRequestBody("application/json".toMediaType()))
+                        .build()
+
+                    client.newCall(request).execute().use { response ->
+                        if (response.isSuccessful) {
+                            Log.d(TAG, "Upload frame $frameIndex OK")
+                            return@withContext
+                        }
+                        Log.w(TAG, "Upload frame $frameIndex failed: ${response.code}")
+                    }
+                } catch (e: Exception) {
+                    Log.e(TAG, "Upload error: ${e.message}", e)
+                }
+                if (attempt < UPLOAD_ATTEMPTS) delay(1000L * attempt)
             }
         }
     }
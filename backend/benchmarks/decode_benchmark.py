@@ -0,0 +1,81 @@
+"""Compare frame extraction time of the cv2 and PyAV decode backends.
+
+Usage:
+    python benchmarks/decode_benchmark.py [video_path] [--interval 1.0] [--crop 10]
+
+Without a video path a synthetic 60s 1080x2400 screen recording is generated.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "benchmark")
+
+import server  # noqa: E402
+
+
+def create_test_video(path: str, seconds: int = 60, fps: int = 30, width: int = 1080, height: int = 2400):
+    """Write a scrolling-text video similar to a phone screen recording."""
+    out = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), fps, (width, height))
+    for i in range(seconds * fps):
+        frame = np.full((height, width, 3), 255, dtype=np.uint8)
+        offset = (i * 8) % 120
+        for line in range(22):
+            y = 100 + line * 120 - offset
+            cv2.putText(frame, f"Line {line + i // 15} of the transcript", (40, y),
+                        cv2.FONT_HERSHEY_SIMPLEX, 1.6, (0, 0, 0), 3)
+        out.write(frame)
+    out.release()
+
+
+async def run(video_path: str, interval: float, crop: dict):
+    configs = [
+        ("cv2", {"backend": "cv2"}),
+        ("pyav threads=1", {"backend": "pyav", "threads": 1}),
+        ("pyav threads=auto", {"backend": "pyav", "threads": 0}),
+        ("pyav nonref", {"backend": "pyav", "threads": 0, "skip_frames": "nonref"}),
+        ("pyav keyframes", {"backend": "pyav", "threads": 0, "skip_frames": "keyframes"}),
+    ]
+    if server.av is None:
+        print("PyAV not installed - only benchmarking cv2")
+        configs = configs[:1]
+
+    print(f"{'backend':<20} {'frames':>7} {'seconds':>9} {'ms/frame':>9} {'KB/frame':>9}")
+    for name, decode in configs:
+        start = time.perf_counter()
+        frames = await server.extract_frames_from_video(video_path, interval, crop, decode)
+        elapsed = time.perf_counter() - start
+        per_frame = elapsed / len(frames) * 1000 if frames else 0
+        avg_kb = sum(len(f[2]) for f in frames) / len(frames) / 1024 if frames else 0
+        print(f"{name:<20} {len(frames):>7} {elapsed:>9.2f} {per_frame:>9.1f} {avg_kb:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("video", nargs="?")
+    parser.add_argument("--interval", type=float, default=1.0)
+    parser.add_argument("--crop", type=float, default=0, help="crop percentage applied to top and bottom")
+    args = parser.parse_args()
+
+    video_path = args.video
+    if not video_path:
+        video_path = os.path.join(tempfile.gettempdir(), "decode_benchmark.mp4")
+        if not os.path.exists(video_path):
+            print("Generating synthetic test video...")
+            create_test_video(video_path)
+
+    crop = {"top": args.crop, "bottom": args.crop, "left": 0, "right": 0} if args.crop else None
+    asyncio.run(run(video_path, args.interval, crop))
+
+
+if __name__ == "__main__":
+    main()
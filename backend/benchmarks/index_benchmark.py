@@ -0,0 +1,125 @@
+"""Measure hot-path lookup latency with and without the startup indexes.
+
+Seeds a scratch database with N mobile sessions and OCR jobs, times the
+lookups the API performs (session_code, session_id, job id, newest-first job
+listing, optionally by status) before and after `server.ensure_indexes()`, and prints the winning
+query plan stage for each.
+
+Usage:
+    MONGO_URL=mongodb://localhost:27017 python benchmarks/index_benchmark.py [--docs 100000]
+
+The scratch database (BENCHMARK_DB_NAME, default "index_benchmark") is dropped at the end.
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ["DB_NAME"] = os.environ.get("BENCHMARK_DB_NAME", "index_benchmark")
+
+import server  # noqa: E402
+
+db = server.db
+
+
+async def seed(count: int):
+    await db.mobile_sessions.drop()
+    await db.ocr_jobs.drop()
+    start = datetime.now(timezone.utc) - timedelta(days=30)
+    batch_sessions, batch_jobs = [], []
+    for i in range(count):
+        created_at = (start + timedelta(seconds=i * 20)).isoformat()
+        batch_sessions.append({
+            "session_id": str(uuid.uuid4()),
+            "session_code": f"{i:07d}",
+            "status": "completed",
+            "frames": [],
+            "created_at": created_at,
+        })
+        batch_jobs.append({
+            "id": str(uuid.uuid4()),
+            "filename": f"video_{i}.mp4",
+            "status": "completed" if i % 10 else "failed",
+            "progress": 100,
+            "total_frames": 10,
+            "transcripts": [],
+            "created_at": created_at,
+        })
+        if len(batch_sessions) == 5000:
+            await db.mobile_sessions.insert_many(batch_sessions)
+            await db.ocr_jobs.insert_many(batch_jobs)
+            batch_sessions, batch_jobs = [], []
+    if batch_sessions:
+        await db.mobile_sessions.insert_many(batch_sessions)
+        await db.ocr_jobs.insert_many(batch_jobs)
+
+
+async def timed(label: str, make_query, runs: int):
+    samples = []
+    for _ in range(runs):
+        collection, query, kwargs = make_query()
+        start = time.perf_counter()
+        if kwargs.get("sort"):
+            await collection.find(query, kwargs.get("projection")).sort(kwargs["sort"]).limit(100).to_list(100)
+        else:
+            await collection.find_one(query, {"_id": 0})
+        samples.append((time.perf_counter() - start) * 1000)
+
+    collection, query, kwargs = make_query()
+    cursor = collection.find(query)
+    if kwargs.get("sort"):
+        cursor = cursor.sort(kwargs["sort"]).limit(100)
+    else:
+        cursor = cursor.limit(1)
+    plan = (await cursor.explain())["queryPlanner"]["winningPlan"]
+    stages = []
+    while plan:
+        stages.append(plan.get("stage"))
+        plan = plan.get("inputStage")
+    print(f"  {label:<28} p50 {statistics.median(samples):8.2f} ms   "
+          f"p95 {sorted(samples)[int(len(samples) * 0.95) - 1]:8.2f} ms   plan {' <- '.join(stages)}")
+
+
+async def run_suite(sessions: list, jobs: list, runs: int):
+    await timed("session by session_code",
+                lambda: (db.mobile_sessions, {"session_code": random.choice(sessions)["session_code"]}, {}), runs)
+    await timed("session by session_id",
+                lambda: (db.mobile_sessions, {"session_id": random.choice(sessions)["session_id"]}, {}), runs)
+    await timed("job by id",
+                lambda: (db.ocr_jobs, {"id": random.choice(jobs)["id"]}, {}), runs)
+    listing = {"sort": [("created_at", -1), ("id", -1)],
+               "projection": {"_id": 0, "id": 1, "status": 1, "created_at": 1}}
+    await timed("list jobs by created_at", lambda: (db.ocr_jobs, {}, listing), runs)
+    await timed("list failed jobs", lambda: (db.ocr_jobs, {"status": "failed"}, listing), runs)
+
+
+async def main(count: int, runs: int):
+    print(f"Seeding {count} sessions and jobs...")
+    await seed(count)
+    sessions = await db.mobile_sessions.aggregate([{"$sample": {"size": 500}}]).to_list(500)
+    jobs = await db.ocr_jobs.aggregate([{"$sample": {"size": 500}}]).to_list(500)
+
+    print("Without indexes:")
+    await run_suite(sessions, jobs, runs)
+
+    await server.ensure_indexes()
+    print("With indexes:")
+    await run_suite(sessions, jobs, runs)
+
+    await server.client.drop_database(os.environ["DB_NAME"])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=100_000)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.docs, args.runs))
@@ -0,0 +1,138 @@
+"""Measure per-request overhead of a fresh HTTP client per frame versus the pooled OCR client.
+
+Starts a local OpenAI-compatible stub (`/chat/completions`, fixed reply after
+--delay ms) and sends the same OCR request through:
+
+  * a new httpx client per call, as happens when every frame builds its own
+    LlmChat and connection;
+  * `server.ocr_client`, one keep-alive pool sized to OCR_CONCURRENCY.
+
+With --tls the stub serves HTTPS with a throwaway self-signed certificate
+(needs the openssl binary), which is closer to the real API where each new
+connection pays a TLS handshake.
+
+Usage:
+    python benchmarks/ocr_client_benchmark.py [--requests 200] [--concurrency 4] [--delay 0] [--tls]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import ssl
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "benchmark")
+
+REPLY = json.dumps({"choices": [{"message": {"role": "assistant", "content": "Line of transcript text"}}]}).encode()
+
+
+def make_certificate(directory: str) -> tuple:
+    cert, key = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1", "-subj", "/CN=127.0.0.1",
+         "-addext", "subjectAltName=IP:127.0.0.1", "-keyout", key, "-out", cert],
+        check=True, capture_output=True
+    )
+    return cert, key
+
+
+async def start_stub(delay: float, ssl_context):
+    """Minimal HTTP/1.1 keep-alive server answering every request with REPLY."""
+    async def handle(reader, writer):
+        try:
+            while True:
+                headers = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in headers.split(b"\r\n"):
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":")[1])
+                await reader.readexactly(length)
+                if delay:
+                    await asyncio.sleep(delay)
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                             b"Content-Length: %d\r\n\r\n%s" % (len(REPLY), REPLY))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0, ssl=ssl_context)
+
+
+async def measure(label: str, call, requests: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    samples = []
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            await call()
+            samples.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<24} p50 {statistics.median(samples):7.2f} ms   "
+          f"p95 {sorted(samples)[int(len(samples) * 0.95) - 1]:7.2f} ms   {requests / elapsed:8.1f} req/s")
+    return statistics.median(samples)
+
+
+async def main(args):
+    ssl_context = None
+    scheme = "http"
+    if args.tls:
+        directory = tempfile.mkdtemp()
+        cert, key = make_certificate(directory)
+        ssl_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        ssl_context.load_cert_chain(cert, key)
+        os.environ["SSL_CERT_FILE"] = cert
+        scheme = "https"
+
+    stub = await start_stub(args.delay / 1000, ssl_context)
+    port = stub.sockets[0].getsockname()[1]
+    os.environ["OCR_API_BASE"] = f"{scheme}://127.0.0.1:{port}/v1"
+    os.environ["OCR_CONCURRENCY"] = str(args.concurrency)
+    os.environ.setdefault("OCR_API_KEY", "benchmark")
+
+    import server  # noqa: E402  (reads OCR_API_BASE at import)
+    import httpx
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    image = "A" * 200_000  # about the size of a base64 1024px JPEG frame
+    body = {"model": server.OCR_MODEL, "messages": [{"role": "user", "content": image}]}
+
+    async def fresh_client():
+        async with httpx.AsyncClient(base_url=server.OCR_API_BASE) as http:
+            response = await http.post("/chat/completions", json=body)
+            response.raise_for_status()
+
+    async def pooled_client():
+        await server.ocr_client.complete(image, "key", server.OCR_SYSTEM_MESSAGE, "Extract all text")
+
+    await server.ocr_client.start()
+    print(f"{args.requests} requests, concurrency {args.concurrency}, stub delay {args.delay} ms, {scheme}")
+    fresh = await measure("new client per call", fresh_client, args.requests, args.concurrency)
+    pooled = await measure("pooled OCR client", pooled_client, args.requests, args.concurrency)
+    print(f"  per-call overhead saved: {fresh - pooled:.2f} ms (p50)")
+
+    await server.ocr_client.aclose()
+    stub.close()
+    await stub.wait_closed()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--delay", type=float, default=0, help="stub response delay in ms")
+    parser.add_argument("--tls", action="store_true")
+    asyncio.run(main(parser.parse_args()))
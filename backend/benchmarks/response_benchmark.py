@@ -0,0 +1,89 @@
+"""Compare JSON serialization and compressed size of a large job response.
+
+Builds a completed OCR job document with N transcript entries (default 5,000)
+and times FastAPI's default path (jsonable_encoder + JSONResponse) against
+FastJSONResponse, then reports bytes on the wire and encode time for each
+encoding the compression middleware can pick.
+
+Usage:
+    python benchmarks/response_benchmark.py [--entries 5000] [--runs 20]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "benchmark")
+
+import server  # noqa: E402
+from synthetic import scrolling_transcripts  # noqa: E402
+
+
+def make_job(entries: int) -> dict:
+    """A job document shaped like `ocr_jobs` results of a long scrolling recording."""
+    transcripts = scrolling_transcripts(entries)
+    now = datetime.now(timezone.utc)
+    return {
+        "id": "benchmark-job",
+        "file_id": "benchmark-file",
+        "filename": "recording.mp4",
+        "status": "completed",
+        "progress": 100,
+        "total_frames": entries,
+        "transcripts": transcripts,
+        "error": None,
+        "created_at": now.isoformat(),
+        "expires_at": now + timedelta(days=30),
+    }
+
+
+def timed(func, runs: int):
+    samples, result = [], None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    job = make_job(args.entries)
+    print(f"Job with {args.entries} transcript entries")
+    if server.orjson is None:
+        print("orjson not installed - FastJSONResponse falls back to the stdlib encoder")
+
+    print(f"\n{'serializer':<36} {'p50 ms':>9} {'bytes':>11}")
+    default_ms, body = timed(lambda: JSONResponse(jsonable_encoder(job)).body, args.runs)
+    print(f"{'jsonable_encoder + JSONResponse':<36} {default_ms:>9.2f} {len(body):>11,}")
+    fast_ms, body = timed(lambda: server.FastJSONResponse(job).body, args.runs)
+    print(f"{'FastJSONResponse':<36} {fast_ms:>9.2f} {len(body):>11,}")
+    print(f"speedup x{default_ms / fast_ms:.1f}")
+
+    print(f"\n{'encoding':<36} {'p50 ms':>9} {'bytes':>11} {'ratio':>7}")
+    print(f"{'identity':<36} {0:>9.2f} {len(body):>11,} {1:>7.1f}")
+    encodings = ["gzip"] + (["br"] if server.brotli is not None else [])
+    for encoding in encodings:
+        def encode():
+            compressor = server.StreamCompressor(encoding)
+            return compressor.compress(body) + compressor.finish()
+        ms, encoded = timed(encode, args.runs)
+        print(f"{encoding:<36} {ms:>9.2f} {len(encoded):>11,} {len(body) / len(encoded):>7.1f}")
+    if server.brotli is None:
+        print("brotli not installed - only gzip measured")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Measure the import time of `server` with and without the media/LLM stack.
+
+Each run is a fresh interpreter started with `python -X importtime`. The
+"api-only" variant imports `server` as an API replica does. The "with media"
+variant also loads every lazily imported module, which is what a job worker
+(or PRELOAD_MEDIA_MODULES=1) pays. Prints the median cumulative import time
+of each variant, the slowest direct imports of the last api-only run, and any
+media module that was imported although it should load lazily. Exits with
+status 1 when the api-only median is over the budget.
+
+Usage:
+    python benchmarks/startup_benchmark.py [--runs 5] [--budget-ms 1000] [--top 10]
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+LAZY_MODULES = ("cv2", "numpy", "PIL.Image", "av", "httpx", "emergentintegrations", "pytesseract")
+
+API_ONLY = (
+    "import sys, server; "
+    f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+)
+WITH_MEDIA = (
+    "import server; "
+    "[m.load() for m in (server.cv2, server.Image, server.httpx, server.llm_chat, server.av, server.pytesseract) "
+    "if m is not None]"
+)
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_times(code: str) -> tuple:
+    """Run `code` in a fresh interpreter; return (server cumulative ms, import lines, stdout)."""
+    env = {**os.environ, "MONGO_URL": os.environ.get("MONGO_URL", "mongodb://localhost:27017"),
+           "DB_NAME": os.environ.get("DB_NAME", "benchmark")}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    lines = []
+    for match in LINE.finditer(result.stderr):
+        self_us, cumulative_us, indent, name = match.groups()
+        lines.append((name, len(indent), int(self_us), int(cumulative_us)))
+    # Top-level imports from `server` on; earlier ones come from interpreter/site setup
+    start = next(i for i, line in enumerate(lines) if line[0] == "server" and line[1] == 1)
+    total = sum(cumulative / 1000 for _, depth, _, cumulative in lines[start:] if depth == 1)
+    return total, lines, result.stdout.strip()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1000)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    api_samples, media_samples = [], []
+    for _ in range(args.runs):
+        total, lines, loaded = import_times(API_ONLY)
+        api_samples.append(total)
+        media_samples.append(import_times(WITH_MEDIA)[0])
+
+    api_ms, media_ms = statistics.median(api_samples), statistics.median(media_samples)
+    print(f"{'variant':<14} {'median ms':>10}")
+    print(f"{'api-only':<14} {api_ms:>10.0f}")
+    print(f"{'with media':<14} {media_ms:>10.0f}")
+    print(f"lazy imports save {media_ms - api_ms:.0f} ms ({(media_ms - api_ms) / media_ms:.0%})")
+
+    # Direct imports of server are listed (indented one level) before its own line
+    end = next(i for i, line in enumerate(lines) if line[0] == "server" and line[1] == 1)
+    start = max((i + 1 for i, line in enumerate(lines[:end]) if line[1] == 1), default=0)
+    direct = sorted((line for line in lines[start:end] if line[1] == 3), key=lambda line: -line[3])
+    print("\nSlowest imports of server (last api-only run):")
+    for name, _, _, cumulative in direct[:args.top]:
+        print(f"  {name:<32} {cumulative / 1000:>8.1f} ms")
+    server_line = next((line for line in lines if line[0] == "server"), None)
+    if server_line:
+        print(f"  {'(server module body)':<32} {server_line[2] / 1000:>8.1f} ms")
+
+    if loaded:
+        print(f"\nImported eagerly although lazy: {loaded}")
+    if api_ms > args.budget_ms:
+        print(f"\nOVER BUDGET: {api_ms:.0f} ms > {args.budget_ms:.0f} ms")
+        sys.exit(1)
+    print(f"\nWithin budget ({args.budget_ms:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+"""Synthetic transcripts shared by the benchmarks."""
+import random
+
+WORDS = ("the", "message", "scroll", "reply", "today", "photo", "sent", "you", "meeting", "tomorrow",
+         "thanks", "okay", "see", "link", "call", "later", "what", "time", "great", "sounds")
+
+
+def scrolling_transcripts(entries: int, window: int = 12) -> list:
+    """Transcript entries of a long scrolling recording: each frame shares most lines with the previous one."""
+    rng = random.Random(1)
+    lines = [" ".join(rng.choices(WORDS, k=rng.randint(3, 9))) for _ in range(entries + window)]
+    return [
+        {"timestamp": round(i * 1.0, 2), "text": "\n".join(lines[i:i + window]), "frame_index": i * 30}
+        for i in range(entries)
+    ]
@@ -0,0 +1,62 @@
+"""Compare stored size and encode/decode time of the transcript storage formats.
+
+Builds N transcript entries (default 5,000) shaped like a long scrolling
+recording, where each frame shares most lines with the previous one, and
+reports the BSON size written to Mongo plus pack/unpack time for the full
+array, delta storage and delta storage with zstd (when installed).
+
+Usage:
+    python benchmarks/transcript_storage_benchmark.py [--entries 5000] [--lines 12] [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "benchmark")
+
+import server  # noqa: E402
+from bson import BSON  # noqa: E402
+from synthetic import scrolling_transcripts  # noqa: E402
+
+
+def timed(func, runs: int):
+    samples, result = [], None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=5000)
+    parser.add_argument("--lines", type=int, default=12, help="lines visible per frame")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    transcripts = scrolling_transcripts(args.entries, args.lines)
+    full_bytes = len(BSON.encode({"transcripts": transcripts}))
+    print(f"{args.entries} entries, {args.lines} lines per frame, keyframe every {server.TRANSCRIPT_KEYFRAME_INTERVAL}")
+    print(f"\n{'format':<12} {'bytes':>11} {'ratio':>7} {'pack ms':>9} {'unpack ms':>10}")
+    print(f"{'full':<12} {full_bytes:>11,} {1:>7.1f} {'-':>9} {'-':>10}")
+
+    variants = [False] + ([True] if server.zstandard is not None else [])
+    for zstd in variants:
+        server.TRANSCRIPT_ZSTD = zstd
+        pack_ms, packed = timed(lambda: server.pack_transcripts(transcripts), args.runs)
+        unpack_ms, restored = timed(lambda: server.unpack_transcripts(packed), args.runs)
+        assert restored == transcripts, "round trip mismatch"
+        size = len(BSON.encode({"transcripts_packed": packed}))
+        print(f"{packed['format']:<12} {size:>11,} {full_bytes / size:>7.1f} {pack_ms:>9.2f} {unpack_ms:>10.2f}")
+    if server.zstandard is None:
+        print("zstandard not installed - delta+zstd not measured")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
-from fastapi import FastAPI, APIRouter, UploadFile, File, HTTPException, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, APIRouter, UploadFile, File, HTTPException, BackgroundTasks, Query, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from fastapi.encoders import jsonable_encoder
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
+from starlette.datastructures import Headers, MutableHeaders
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
 import logging
@@ -9,17 +11,83 @@ from pathlib import Path
 from pydantic import BaseModel, Field, ConfigDict
 from typing import List, Optional
 import uuid
-from datetime import datetime, timezone
-import cv2
+from datetime import datetime, timezone, timedelta
 import base64
 import io
-from PIL import Image
 import tempfile
 import asyncio
-from emergentintegrations.llm.chat import LlmChat, UserMessage, ImageContent
 import difflib
 import secrets
 import json
+import time
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+)
+from bson import BSON
+from pymongo import ASCENDING, DESCENDING, TEXT, ReturnDocument
+from pymongo.errors import DuplicateKeyError, PyMongoError
+import threading
+import sqlite3
+import hashlib
+import shutil
+import random
+import math
+import importlib
+import importlib.util
+from collections import deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+import re
+import zipfile
+import zlib
+
+class LazyModule:
+    """Stand-in for a module that is imported on first attribute access.
+
+    Media and LLM libraries take most of the import time but are only used by
+    jobs, so replicas serving sessions and polls never load them.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.module = None
+
+    def load(self):
+        if self.module is None:
+            self.module = importlib.import_module(self.name)
+        return self.module
+
+    def __getattr__(self, attr: str):
+        return getattr(self.load(), attr)
+
+def optional_module(name: str) -> Optional[LazyModule]:
+    """LazyModule for an installed optional dependency, None if it is not installed."""
+    return LazyModule(name) if importlib.util.find_spec(name) is not None else None
+
+cv2 = LazyModule("cv2")
+np = LazyModule("numpy")
+Image = LazyModule("PIL.Image")
+httpx = LazyModule("httpx")
+llm_chat = LazyModule("emergentintegrations.llm.chat")
+
+av = optional_module("av")  # optional PyAV decode backend
+pytesseract = optional_module("pytesseract")  # optional local engine for layout OCR
+zstandard = optional_module("zstandard")  # optional compression of packed transcripts
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:  # optional OpenTelemetry export of job spans
+    otel_trace = None
+
+try:
+    import orjson
+except ImportError:  # optional fast JSON encoding of API responses
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # optional brotli response compression (gzip otherwise)
+    brotli = None
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -29,16 +97,255 @@ mongo_url = os.environ['MONGO_URL']
 client = AsyncIOMotorClient(mongo_url)
 db = client[os.environ['DB_NAME']]
 
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded with orjson when installed, the stdlib encoder otherwise.
+
+    Raw Mongo documents (datetimes included) can be passed as content; the
+    stdlib fallback runs them through jsonable_encoder first.
+    """
+
+    def render(self, content) -> bytes:
+        if orjson is None:
+            return super().render(jsonable_encoder(content))
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+# Import cv2, PIL, PyAV and the LLM integration at startup rather than on first use
+PRELOAD_MEDIA_MODULES = os.environ.get('PRELOAD_MEDIA_MODULES', '0') == '1'
+
 # Create the main app without a prefix
 app = FastAPI()
 
 # Create a router with the /api prefix
-api_router = APIRouter(prefix="/api")
+api_router = APIRouter(prefix="/api", default_response_class=FastJSONResponse)
+
+# Retention for documents carrying an `expires_at` date (enforced by TTL indexes)
+JOB_TTL_DAYS = float(os.environ.get('JOB_TTL_DAYS', 30))
+MOBILE_SESSION_TTL_HOURS = float(os.environ.get('MOBILE_SESSION_TTL_HOURS', 72))
+
+def job_expiry() -> datetime:
+    return datetime.now(timezone.utc) + timedelta(days=JOB_TTL_DAYS)
+
+def session_expiry() -> datetime:
+    return datetime.now(timezone.utc) + timedelta(hours=MOBILE_SESSION_TTL_HOURS)
+
+# Indexes backing every hot lookup, created on startup
+INDEXES = {
+    "ocr_jobs": [
+        ([("id", ASCENDING)], {"unique": True, "name": "id_unique"}),
+        ([("content_id", ASCENDING), ("status", ASCENDING)], {"name": "content_id_status"}),
+        ([("batch_id", ASCENDING)], {"name": "batch_id"}),
+        ([("created_at", DESCENDING), ("id", DESCENDING)], {"name": "created_at_id_desc"}),
+        ([("status", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], {"name": "status_created_at_id_desc"}),
+        ([("expires_at", ASCENDING)], {"expireAfterSeconds": 0, "name": "expires_at_ttl"}),
+    ],
+    "batches": [
+        ([("id", ASCENDING)], {"unique": True, "name": "id_unique"}),
+        ([("expires_at", ASCENDING)], {"expireAfterSeconds": 0, "name": "expires_at_ttl"}),
+    ],
+    "benchmark_jobs": [
+        ([("id", ASCENDING)], {"unique": True, "name": "id_unique"}),
+        ([("content_id", ASCENDING), ("status", ASCENDING)], {"name": "content_id_status"}),
+        ([("created_at", DESCENDING), ("id", DESCENDING)], {"name": "created_at_id_desc"}),
+        ([("status", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], {"name": "status_created_at_id_desc"}),
+        ([("expires_at", ASCENDING)], {"expireAfterSeconds": 0, "name": "expires_at_ttl"}),
+    ],
+    "videos": [
+        ([("file_id", ASCENDING)], {"unique": True, "name": "file_id_unique"}),
+        ([("sha256", ASCENDING)], {"name": "sha256"}),
+        ([("expires_at", ASCENDING)], {"expireAfterSeconds": 0, "name": "expires_at_ttl"}),
+    ],
+    "video_blobs": [
+        ([("sha256", ASCENDING)], {"unique": True, "name": "sha256_unique"}),
+    ],
+    "frame_ocr": [
+        ([("content_id", ASCENDING), ("frame_index", ASCENDING)], {"unique": True, "name": "content_frame_unique"}),
+        ([("expires_at", ASCENDING)], {"expireAfterSeconds": 0, "name": "expires_at_ttl"}),
+    ],
+    "transcript_entries": [
+        ([("text", TEXT)], {"default_language": "none", "name": "text"}),
+        ([("source", ASCENDING), ("source_id", ASCENDING)], {"name": "source_source_id"}),
+        ([("expires_at", ASCENDING)], {"expireAfterSeconds": 0, "name": "expires_at_ttl"}),
+    ],
+    "mobile_sessions": [
+        ([("session_code", ASCENDING)], {"unique": True, "name": "session_code_unique"}),
+        ([("session_id", ASCENDING)], {"unique": True, "name": "session_id_unique"}),
+        ([("created_at", DESCENDING), ("session_id", DESCENDING)], {"name": "created_at_session_id_desc"}),
+        ([("status", ASCENDING), ("created_at", DESCENDING), ("session_id", DESCENDING)],
+         {"name": "status_created_at_session_id_desc"}),
+        ([("expires_at", ASCENDING)], {"expireAfterSeconds": 0, "name": "expires_at_ttl"}),
+    ],
+}
+
+async def ensure_indexes():
+    """Create missing indexes. Failures are logged so a bad index never blocks startup."""
+    for collection, indexes in INDEXES.items():
+        for keys, options in indexes:
+            try:
+                await db[collection].create_index(keys, **options)
+            except PyMongoError as e:
+                logging.error(f"Could not create index {collection}.{options['name']}: {str(e)}")
 
 # Upload directory
 UPLOAD_DIR = Path(tempfile.gettempdir()) / "video_ocr_uploads"
 UPLOAD_DIR.mkdir(exist_ok=True)
 
+# ==================== METRICS ====================
+# Job types used as the `job_type` label: "video", "benchmark", "mobile"
+
+FRAMES_EXTRACTED = Counter(
+    "frames_extracted_total", "Frames decoded and encoded for OCR", ["job_type", "backend"]
+)
+FRAME_EXTRACTION_SECONDS = Histogram(
+    "frame_extraction_seconds", "Wall time to extract all frames of a video", ["job_type", "backend"],
+    buckets=(0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+)
+OCR_REQUESTS = Counter(
+    "ocr_requests_total", "OCR calls by outcome (text, empty, error)", ["job_type", "outcome"]
+)
+OCR_FRAMES_REUSED = Counter(
+    "ocr_frames_reused_total", "Frames that reused a near-duplicate frame's text instead of an OCR call", ["job_type"]
+)
+OCR_LATENCY_SECONDS = Histogram(
+    "ocr_latency_seconds", "Latency of a single OCR call", ["job_type"],
+    buckets=(0.25, 0.5, 1, 2, 3, 5, 8, 13, 20, 30, 60)
+)
+OCR_RETRIES = Counter(
+    "ocr_retries_total", "OCR attempts retried after a timeout or transient error", ["job_type"]
+)
+OCR_HEDGES = Counter(
+    "ocr_hedged_requests_total", "Duplicate OCR requests sent because the first was slower than p95", ["job_type"]
+)
+OCR_BYTES_SENT = Counter(
+    "ocr_bytes_sent_total", "Base64 image bytes sent to the OCR model", ["job_type"]
+)
+DB_WRITES = Counter(
+    "db_progress_writes_total", "Job progress/result writes to MongoDB", ["job_type"]
+)
+DB_WRITE_BYTES = Counter(
+    "db_progress_write_bytes_total", "Encoded size of job progress/result updates", ["job_type"]
+)
+UPLOAD_REQUESTS = Counter(
+    "upload_requests_total", "Upload requests received", ["endpoint"]
+)
+UPLOAD_BYTES = Counter(
+    "upload_bytes_total", "Payload bytes received by upload endpoints", ["endpoint"]
+)
+FRAMES_SKIPPED = Counter(
+    "mobile_frames_skipped_total", "Captured frames the device was told not to upload", ["reason"]
+)
+JOBS_FINISHED = Counter(
+    "jobs_finished_total", "Background jobs finished by final status", ["job_type", "status"]
+)
+JOB_DURATION_SECONDS = Histogram(
+    "job_duration_seconds", "End-to-end background job duration", ["job_type"],
+    buckets=(5, 15, 30, 60, 120, 300, 600, 1200, 1800, 3600, 7200)
+)
+JOBS_IN_PROGRESS = Gauge(
+    "jobs_in_progress", "Background jobs currently running", ["job_type"],
+    multiprocess_mode="livesum"
+)
+
+# ==================== JOB TRACING ====================
+# Per-stage timings are collected for every job unless JOB_TRACING=0.
+# JOB_TRACING_OTEL=1 additionally emits each span through OpenTelemetry
+# (exporter/provider configuration is left to the OpenTelemetry SDK).
+
+JOB_TRACING = os.environ.get("JOB_TRACING", "1") != "0"
+JOB_TRACING_OTEL = os.environ.get("JOB_TRACING_OTEL") == "1" and otel_trace is not None
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class _StageSpan:
+    __slots__ = ("trace", "stage", "start", "otel_span")
+
+    def __init__(self, trace: "JobTrace", stage: str):
+        self.trace = trace
+        self.stage = stage
+        self.otel_span = None
+
+    def __enter__(self):
+        if self.trace.otel_span is not None:
+            self.otel_span = self.trace.tracer.start_span(
+                self.stage, context=otel_trace.set_span_in_context(self.trace.otel_span)
+            )
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.trace.add(self.stage, time.perf_counter() - self.start)
+        if self.otel_span is not None:
+            self.otel_span.end()
+        return False
+
+class JobTrace:
+    """Accumulates wall time per processing stage for a single job.
+
+    Stage times are summed over frames (and over threads when extraction runs
+    concurrently), so they can add up to more than the job's wall time.
+    """
+
+    def __init__(self, job_type: str, job_id: str, enabled: bool = JOB_TRACING):
+        self.enabled = enabled
+        self.stages = {}
+        self.start = time.perf_counter()
+        self._lock = threading.Lock()
+        self.tracer = None
+        self.otel_span = None
+        if enabled and JOB_TRACING_OTEL:
+            self.tracer = otel_trace.get_tracer("framereader.jobs")
+            self.otel_span = self.tracer.start_span(
+                f"{job_type}_job", attributes={"job.id": job_id, "job.type": job_type}
+            )
+
+    def span(self, stage: str):
+        """Context manager timing one occurrence of `stage`."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _StageSpan(self, stage)
+
+    def add(self, stage: str, seconds: float):
+        if not self.enabled:
+            return
+        with self._lock:
+            entry = self.stages.get(stage)
+            if entry is None:
+                self.stages[stage] = [seconds, 1]
+            else:
+                entry[0] += seconds
+                entry[1] += 1
+
+    def summary(self) -> Optional[dict]:
+        """Summary stored on the job document, or None when tracing is disabled."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            stages = {
+                stage: {"seconds": round(seconds, 3), "count": count}
+                for stage, (seconds, count) in self.stages.items()
+            }
+        return {"total_seconds": round(time.perf_counter() - self.start, 3), "stages": stages}
+
+    def finish(self):
+        if self.otel_span is not None:
+            self.otel_span.end()
+            self.otel_span = None
+
+NULL_TRACE = JobTrace("none", "", enabled=False)
+
+async def update_progress(collection, job_type: str, query: dict, update: dict, trace: JobTrace = None):
+    """Write a job progress/result update and record its volume."""
+    DB_WRITES.labels(job_type).inc()
+    DB_WRITE_BYTES.labels(job_type).inc(len(BSON.encode(update)))
+    with (trace or NULL_TRACE).span("persist"):
+        return await collection.update_one(query, update)
+
 # Define Models
 class StatusCheck(BaseModel):
     model_config = ConfigDict(extra="ignore")
@@ -68,11 +375,362 @@ class JobResponse(BaseModel):
     error: Optional[str] = None
     created_at: str
 
-# In-memory job storage for quick access
-jobs_cache = {}
+# ==================== CANCELLATION ====================
+# Background jobs run as their own asyncio tasks registered in
+# `running_jobs`. Cancelling one cancels the task, which aborts in-flight OCR
+# calls and frees scheduler slots, and sets a threading.Event that decode
+# threads poll through `check_cancelled()` (asyncio.to_thread carries the
+# job's context into the thread). Cancellation is also recorded on the
+# document as `cancel_requested`, which jobs in other worker processes poll.
+
+CANCEL_POLL_SECONDS = 2.0
+
+class JobCancelled(Exception):
+    pass
+
+job_cancel_event: ContextVar[Optional[threading.Event]] = ContextVar("job_cancel_event", default=None)
+
+def check_cancelled():
+    """Raise JobCancelled if the current job was cancelled; callable from decode threads."""
+    event = job_cancel_event.get()
+    if event is not None and event.is_set():
+        raise JobCancelled()
+
+# Collection and id field of each cancellable job kind
+CANCELLABLE_JOBS = {
+    "job": ("ocr_jobs", "id"),
+    "benchmark": ("benchmark_jobs", "id"),
+    "session": ("mobile_sessions", "session_id"),
+}
+
+running_jobs = {}  # "<kind>:<id>" -> (task, threading.Event)
+
+def cancel_local_job(kind: str, record_id: str) -> bool:
+    """Cancel a job running in this process; returns whether one was found."""
+    entry = running_jobs.get(f"{kind}:{record_id}")
+    if entry is None:
+        return False
+    task, event = entry
+    event.set()
+    task.cancel()
+    return True
+
+async def request_cancel(kind: str, record_id: str, active_statuses: List[str]) -> dict:
+    """Flag a job for cancellation and stop it if it runs in this process."""
+    collection, id_field = CANCELLABLE_JOBS[kind]
+    doc = await db[collection].find_one_and_update(
+        {id_field: record_id, "status": {"$in": active_statuses}},
+        {"$set": {"cancel_requested": True}},
+        {"_id": 0, "status": 1}
+    )
+    if doc is None:
+        if not await db[collection].find_one({id_field: record_id}, {"_id": 1}):
+            raise HTTPException(status_code=404, detail="Not found")
+        raise HTTPException(status_code=409, detail="Not running")
+
+    if cancel_local_job(kind, record_id):
+        return {"status": "cancelling"}
+    if doc["status"] == "queued":
+        await db[collection].update_one({id_field: record_id, "status": "queued"}, {"$set": {"status": "cancelled"}})
+        return {"status": "cancelled"}
+    # Running in another worker process, which polls cancel_requested
+    return {"status": "cancelling"}
+
+async def run_cancellable(kind: str, record_id: str, func, *args):
+    """Run `func(*args)` as a cancellable job task once a running slot is free, and wait for it.
+
+    Job functions call `check_cancelled()` first thing in their try block so a
+    job cancelled before it started still records its status and cleans up.
+    """
+    collection, id_field = CANCELLABLE_JOBS[kind]
+    query = {id_field: record_id}
+
+    async def cancel_wanted() -> bool:
+        # A deleted record (possibly deleted by another worker) cancels its job too
+        doc = await db[collection].find_one(query, {"_id": 0, "cancel_requested": 1})
+        return doc is None or bool(doc.get("cancel_requested"))
+
+    async with admission.running_slot():
+        event = threading.Event()
+        if await cancel_wanted():
+            # Cancelled while still queued: the job stops at its first check and cleans up
+            event.set()
+        
+        async def run():
+            job_cancel_event.set(event)
+            await func(*args)
+        
+        async def watch():
+            while True:
+                await asyncio.sleep(CANCEL_POLL_SECONDS)
+                if await cancel_wanted():
+                    cancel_local_job(kind, record_id)
+                    return
+        
+        key = f"{kind}:{record_id}"
+        task = asyncio.create_task(run())
+        running_jobs[key] = (task, event)
+        watcher = asyncio.create_task(watch())
+        try:
+            await asyncio.wait({task})
+        finally:
+            watcher.cancel()
+            running_jobs.pop(key, None)
+
+# ==================== ADMISSION CONTROL ====================
+# Submissions (video, batch, benchmark and mobile processing requests) are
+# admitted against per-process limits: at most MAX_ACTIVE_JOBS jobs run at
+# once, at most MAX_QUEUED_JOBS more wait for a slot, and one client address
+# may have at most MAX_JOBS_PER_CLIENT queued or running. Video uploads are
+# limited the same way. Per-client limits are keyed by the client address
+# (client_host), never by the caller-chosen client_id. Behind a reverse proxy
+# either run uvicorn with --proxy-headers and --forwarded-allow-ips, or list
+# the proxy addresses in TRUSTED_PROXIES so X-Forwarded-For is used; otherwise
+# every request appears to come from the proxy and the per-client limits act
+# as global ones. Requests over a limit get 429 with a Retry-After estimated
+# from recent job (or upload) durations; admitted ones get their queue
+# position and estimated start time.
+
+MAX_ACTIVE_JOBS = int(os.environ.get('MAX_ACTIVE_JOBS', 4))
+MAX_QUEUED_JOBS = int(os.environ.get('MAX_QUEUED_JOBS', 50))
+MAX_JOBS_PER_CLIENT = int(os.environ.get('MAX_JOBS_PER_CLIENT', 10))
+MAX_CONCURRENT_UPLOADS = int(os.environ.get('MAX_CONCURRENT_UPLOADS', 8))
+MAX_UPLOADS_PER_CLIENT = int(os.environ.get('MAX_UPLOADS_PER_CLIENT', 2))
+# Comma-separated proxy addresses whose X-Forwarded-For is trusted, or "*"
+TRUSTED_PROXIES = {ip.strip() for ip in os.environ.get('TRUSTED_PROXIES', '').split(',') if ip.strip()}
+
+class Ewma:
+    """Exponentially weighted moving average, seeded with a default."""
+    def __init__(self, initial: float, alpha: float = 0.2):
+        self.value = initial
+        self.alpha = alpha
+
+    def add(self, sample: float):
+        self.value += self.alpha * (sample - self.value)
+
+class AdmissionController:
+    def __init__(self):
+        self.outstanding = {}  # owner -> admitted job units not finished yet
+        self.uploads = {}  # owner -> uploads in progress
+        self.job_seconds = Ewma(60.0)
+        self.upload_seconds = Ewma(5.0)
+        self.running = asyncio.Semaphore(MAX_ACTIVE_JOBS)
+
+    def total(self) -> int:
+        return sum(self.outstanding.values())
 
-# Mobile capture sessions
-mobile_sessions = {}
+    def wait_estimate(self, position: int) -> float:
+        """Seconds until the `position`-th queued unit (1-based) can start."""
+        if position <= 0:
+            return 0.0
+        return math.ceil(position / MAX_ACTIVE_JOBS) * self.job_seconds.value
+
+    def reject(self, detail: str, retry_after: float):
+        raise HTTPException(
+            status_code=429, detail=detail, headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+        )
+
+    def admit(self, owner: str, units: int = 1) -> dict:
+        """Reserve `units` job slots for `owner` or raise 429. Release with `discharge`."""
+        total = self.total()
+        if self.outstanding.get(owner, 0) + units > MAX_JOBS_PER_CLIENT:
+            self.reject(
+                f"Too many jobs in progress for this client (limit {MAX_JOBS_PER_CLIENT})",
+                self.job_seconds.value
+            )
+        if total + units > MAX_ACTIVE_JOBS + MAX_QUEUED_JOBS:
+            self.reject(
+                "Job queue is full, retry later",
+                self.wait_estimate(total + units - MAX_ACTIVE_JOBS - MAX_QUEUED_JOBS)
+            )
+        self.outstanding[owner] = self.outstanding.get(owner, 0) + units
+        position = max(0, total + 1 - MAX_ACTIVE_JOBS)
+        return {
+            "admission": "queued" if position else "accepted",
+            "queue_position": position,
+            "estimated_start_seconds": round(self.wait_estimate(position), 1)
+        }
+
+    def discharge(self, owner: str, units: int = 1):
+        remaining = self.outstanding.get(owner, 0) - units
+        if remaining > 0:
+            self.outstanding[owner] = remaining
+        else:
+            self.outstanding.pop(owner, None)
+
+    @asynccontextmanager
+    async def running_slot(self):
+        """Hold one of the MAX_ACTIVE_JOBS running slots while a job runs."""
+        async with self.running:
+            start = time.perf_counter()
+            try:
+                yield
+            finally:
+                self.job_seconds.add(time.perf_counter() - start)
+
+    def enter_upload(self, owner: str):
+        if self.uploads.get(owner, 0) >= MAX_UPLOADS_PER_CLIENT:
+            self.reject(f"Too many uploads in progress for this client (limit {MAX_UPLOADS_PER_CLIENT})",
+                        self.upload_seconds.value)
+        if sum(self.uploads.values()) >= MAX_CONCURRENT_UPLOADS:
+            self.reject("Too many uploads in progress, retry later", self.upload_seconds.value)
+        self.uploads[owner] = self.uploads.get(owner, 0) + 1
+
+    def exit_upload(self, owner: str, seconds: float):
+        self.upload_seconds.add(seconds)
+        if self.uploads.get(owner, 0) > 1:
+            self.uploads[owner] -= 1
+        else:
+            self.uploads.pop(owner, None)
+
+    def stats(self) -> dict:
+        total = self.total()
+        return {
+            "running_limit": MAX_ACTIVE_JOBS,
+            "queue_limit": MAX_QUEUED_JOBS,
+            "jobs": total,
+            "queued": max(0, total - MAX_ACTIVE_JOBS),
+            "uploads": sum(self.uploads.values()),
+            "estimated_start_seconds": round(self.wait_estimate(max(0, total + 1 - MAX_ACTIVE_JOBS)), 1),
+            "average_job_seconds": round(self.job_seconds.value, 1)
+        }
+
+admission = AdmissionController()
+
+async def run_admitted(client: str, units: int, func, *args):
+    """Background task wrapper returning an admission reservation when the work ends."""
+    try:
+        await func(*args)
+    finally:
+        admission.discharge(client, units)
+
+# ==================== METADATA CACHE ====================
+# Set METADATA_CACHE_PATH to a local SQLite file to share cache entries (and
+# their invalidation) between uvicorn workers on the same host.
+
+METADATA_CACHE_PATH = os.environ.get('METADATA_CACHE_PATH')
+SESSION_CACHE_TTL = float(os.environ.get('SESSION_CACHE_TTL', 300))
+JOB_CACHE_TTL = float(os.environ.get('JOB_CACHE_TTL', 600))
+
+class TTLCache:
+    """Per-process cache with a fixed entry TTL and a bounded size."""
+
+    def __init__(self, name: str, ttl: float, max_entries: int = 10000):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = {}
+
+    def get(self, key: str):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires < time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        return value
+
+    def set(self, key: str, value):
+        if len(self._entries) >= self.max_entries and key not in self._entries:
+            # Drop the entry closest to expiry (dicts keep insertion order)
+            self._entries.pop(next(iter(self._entries)))
+        self._entries.pop(key, None)
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def invalidate(self, key: str):
+        self._entries.pop(key, None)
+
+class SqliteTTLCache:
+    """TTL cache stored in a local SQLite file shared by all workers."""
+
+    def __init__(self, name: str, ttl: float, path: str, max_entries: int = 10000):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._conn = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS cache_{name} (key TEXT PRIMARY KEY, value TEXT, expires REAL)"
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, expires FROM cache_{self.name} WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return json.loads(row[0])
+
+    def set(self, key: str, value):
+        payload = json.dumps(value, default=lambda o: o.isoformat() if isinstance(o, datetime) else str(o))
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO cache_{self.name} (key, value, expires) VALUES (?, ?, ?)",
+                (key, payload, now + self.ttl)
+            )
+            # Occasional cleanup keeps the table bounded
+            if secrets.randbelow(100) == 0:
+                self._conn.execute(f"DELETE FROM cache_{self.name} WHERE expires < ?", (now,))
+                self._conn.execute(
+                    f"DELETE FROM cache_{self.name} WHERE key IN (SELECT key FROM cache_{self.name} "
+                    f"ORDER BY expires DESC LIMIT -1 OFFSET ?)", (self.max_entries,)
+                )
+
+    def invalidate(self, key: str):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM cache_{self.name} WHERE key = ?", (key,))
+
+def make_cache(name: str, ttl: float, max_entries: int = 10000):
+    if METADATA_CACHE_PATH:
+        return SqliteTTLCache(name, ttl, METADATA_CACHE_PATH, max_entries)
+    return TTLCache(name, ttl, max_entries)
+
+# Finished job documents keyed by "<collection>:<id>" (only terminal jobs are cached)
+jobs_cache = make_cache("jobs", JOB_CACHE_TTL, max_entries=256)
+
+# Mobile session metadata keyed by session_code: {"session_id", "status", "live_ocr"}
+mobile_sessions = make_cache("mobile_sessions", SESSION_CACHE_TTL)
+
+async def get_session_meta(session_code: str) -> Optional[dict]:
+    """Resolve a session code to its id, status and live-OCR flag, hitting Mongo only on a cache miss."""
+    meta = mobile_sessions.get(session_code)
+    if meta is None:
+        session = await db.mobile_sessions.find_one(
+            {"session_code": session_code},
+            {"_id": 0, "session_id": 1, "status": 1, "settings.live_ocr": 1}
+        )
+        if session is None:
+            return None
+        meta = {
+            "session_id": session["session_id"],
+            "status": session.get("status"),
+            "live_ocr": bool(session.get("settings", {}).get("live_ocr"))
+        }
+        mobile_sessions.set(session_code, meta)
+    return meta
+
+def cache_session_status(session_code: str, session_id: str, status: str):
+    """Record a status transition; unknown sessions are left to be loaded on next lookup."""
+    meta = mobile_sessions.get(session_code)
+    if meta is None or meta["session_id"] != session_id:
+        mobile_sessions.invalidate(session_code)
+        return
+    mobile_sessions.set(session_code, {**meta, "status": status})
+
+async def get_cached_job(collection, job_id: str) -> Optional[dict]:
+    """Fetch a job document, serving finished jobs from the cache."""
+    key = f"{collection.name}:{job_id}"
+    job = jobs_cache.get(key)
+    if job is None:
+        job = unpack_record(await collection.find_one({"id": job_id}, {"_id": 0}), "transcripts")
+        if job is not None and job.get("status") in ("completed", "failed", "cancelled"):
+            jobs_cache.set(key, job)
+    return job
 
 class MobileCaptureSession(BaseModel):
     model_config = ConfigDict(extra="ignore")
@@ -93,100 +751,1212 @@ class MobileCaptureSettings(BaseModel):
     screen_height: Optional[int] = None
     estimated_content_height: Optional[int] = None
     total_captures_estimate: Optional[int] = None
+    live_ocr: bool = False  # OCR frames as they are uploaded instead of after capture
+
+# Longest side (px) of frames sent to OCR
+MAX_FRAME_SIZE = 1024
+
+# Available frame decode backends; "pyav" requires the optional `av` package
+DECODE_BACKENDS = ("cv2", "pyav")
+
+def crop_box(width: int, height: int, crop: dict = None) -> tuple:
+    """Convert percentage crop values into a pixel box (x1, y1, x2, y2)."""
+    crop_top = crop.get('top', 0) if crop else 0
+    crop_bottom = crop.get('bottom', 0) if crop else 0
+    crop_left = crop.get('left', 0) if crop else 0
+    crop_right = crop.get('right', 0) if crop else 0
+
+    y1 = int(height * crop_top / 100)
+    y2 = int(height * (100 - crop_bottom) / 100)
+    x1 = int(width * crop_left / 100)
+    x2 = int(width * (100 - crop_right) / 100)
 
-async def extract_frames_from_video(video_path: str, interval: float, crop: dict = None) -> List[tuple]:
-    """Extract frames from video at specified interval with optional cropping."""
+    # Fall back to the full frame if the crop region is empty
+    if y2 <= y1 or x2 <= x1:
+        return 0, 0, width, height
+    return x1, y1, x2, y2
+
+def encode_frame(frame_rgb, trace: JobTrace = NULL_TRACE) -> str:
+    """Downscale and JPEG-encode an RGB frame, returning base64."""
+    pil_image = Image.fromarray(frame_rgb)
+
+    # Resize if too large (max MAX_FRAME_SIZE px on longest side)
+    if max(pil_image.size) > MAX_FRAME_SIZE:
+        with trace.span("resize"):
+            ratio = MAX_FRAME_SIZE / max(pil_image.size)
+            new_size = (int(pil_image.size[0] * ratio), int(pil_image.size[1] * ratio))
+            pil_image = pil_image.resize(new_size, Image.LANCZOS)
+
+    with trace.span("encode"):
+        buffer = io.BytesIO()
+        pil_image.save(buffer, format="JPEG", quality=85)
+        return base64.b64encode(buffer.getvalue()).decode('utf-8')
+
+def _extract_frames_cv2(
+    video_path: str,
+    interval: float,
+    crop: dict = None,
+    trace: JobTrace = NULL_TRACE
+) -> List[tuple]:
+    """Extract frames by seeking with OpenCV's VideoCapture."""
     frames = []
     cap = cv2.VideoCapture(video_path)
-    
+
     if not cap.isOpened():
         raise ValueError("Could not open video file")
-    
+
     fps = cap.get(cv2.CAP_PROP_FPS)
     total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-    duration = total_frames / fps if fps > 0 else 0
-    
+
     frame_step = int(fps * interval) if fps > 0 else 1
     frame_step = max(1, frame_step)
-    
-    # Default crop values (percentages)
-    crop_top = crop.get('top', 0) if crop else 0
-    crop_bottom = crop.get('bottom', 0) if crop else 0
-    crop_left = crop.get('left', 0) if crop else 0
-    crop_right = crop.get('right', 0) if crop else 0
-    
-    frame_index = 0
-    while True:
-        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
-        ret, frame = cap.read()
-        
-        if not ret:
-            break
-        
-        timestamp = frame_index / fps if fps > 0 else frame_index
-        
-        # Apply cropping based on percentages
-        h, w = frame.shape[:2]
-        y1 = int(h * crop_top / 100)
-        y2 = int(h * (100 - crop_bottom) / 100)
-        x1 = int(w * crop_left / 100)
-        x2 = int(w * (100 - crop_right) / 100)
-        
-        # Ensure valid crop region
-        if y2 > y1 and x2 > x1:
-            frame = frame[y1:y2, x1:x2]
-        
-        # Convert BGR to RGB
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+    try:
+        frame_index = 0
+        while True:
+            check_cancelled()
+            with trace.span("decode"):
+                cap.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
+                ret, frame = cap.read()
+            
+            if not ret:
+                break
+            
+            timestamp = frame_index / fps if fps > 0 else frame_index
+            
+            with trace.span("crop"):
+                # Apply cropping based on percentages
+                h, w = frame.shape[:2]
+                x1, y1, x2, y2 = crop_box(w, h, crop)
+                frame = frame[y1:y2, x1:x2]
+                
+                # Convert BGR to RGB
+                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            
+            frames.append((frame_index, timestamp, encode_frame(frame_rgb, trace)))
+            frame_index += frame_step
+            
+            if frame_index >= total_frames:
+                break
         
-        # Convert to PIL Image and then to base64
-        pil_image = Image.fromarray(frame_rgb)
+    finally:
+        cap.release()
+    return frames
+
+def _extract_frames_pyav(
+    video_path: str,
+    interval: float,
+    crop: dict = None,
+    threads: int = 0,
+    skip_frames: str = None,
+    trace: JobTrace = NULL_TRACE
+) -> List[tuple]:
+    """Extract frames by decoding sequentially with PyAV/FFmpeg.
+
+    `threads` sets the decoder thread count (0 lets FFmpeg pick), and
+    `skip_frames` ("keyframes" or "nonref") tells the decoder to drop frames
+    it would otherwise have to fully decode. Frames are scaled by swscale
+    during conversion so the cropped region is already within MAX_FRAME_SIZE.
+    """
+    if av is None:
+        raise ValueError("PyAV is not installed")
+
+    frames = []
+    with av.open(video_path) as container:
+        if not container.streams.video:
+            raise ValueError("Could not open video file")
         
-        # Resize if too large (max 1024px on longest side)
-        max_size = 1024
-        if max(pil_image.size) > max_size:
-            ratio = max_size / max(pil_image.size)
-            new_size = (int(pil_image.size[0] * ratio), int(pil_image.size[1] * ratio))
-            pil_image = pil_image.resize(new_size, Image.LANCZOS)
+        stream = container.streams.video[0]
+        stream.thread_type = "AUTO"
+        stream.codec_context.thread_count = threads
+        if skip_frames == "keyframes":
+            stream.codec_context.skip_frame = "NONKEY"
+        elif skip_frames == "nonref":
+            stream.codec_context.skip_frame = "NONREF"
         
-        # Convert to base64
-        buffer = io.BytesIO()
-        pil_image.save(buffer, format="JPEG", quality=85)
-        base64_image = base64.b64encode(buffer.getvalue()).decode('utf-8')
+        fps = float(stream.average_rate) if stream.average_rate else 0
         
-        frames.append((frame_index, timestamp, base64_image))
-        frame_index += frame_step
+        # Scale the full frame so the cropped region fits in MAX_FRAME_SIZE
+        width, height = stream.codec_context.width, stream.codec_context.height
+        x1, y1, x2, y2 = crop_box(width, height, crop)
+        scale = min(1.0, MAX_FRAME_SIZE / max(x2 - x1, y2 - y1))
+        out_width = max(2, int(width * scale)) & ~1
+        out_height = max(2, int(height * scale)) & ~1
         
-        if frame_index >= total_frames:
+        next_timestamp = 0.0
+        decode_start = time.perf_counter()
+        for decoded_count, frame in enumerate(container.decode(stream)):
+            check_cancelled()
+            if frame.time is not None:
+                timestamp = frame.time
+            else:
+                timestamp = decoded_count / fps if fps > 0 else decoded_count
+            
+            # Take the first decoded frame at or after each sampling point
+            if timestamp + 1e-6 < next_timestamp:
+                continue
+            
+            frame_index = int(round(timestamp * fps)) if fps > 0 else decoded_count
+            frame_rgb = frame.to_ndarray(width=out_width, height=out_height, format="rgb24")
+            # Decode time includes skipped frames and the swscale conversion
+            trace.add("decode", time.perf_counter() - decode_start)
+            
+            with trace.span("crop"):
+                # Crop in scaled coordinates
+                x1, y1, x2, y2 = crop_box(out_width, out_height, crop)
+                frame_rgb = frame_rgb[y1:y2, x1:x2]
+            
+            frames.append((frame_index, timestamp, encode_frame(frame_rgb, trace)))
+            while next_timestamp <= timestamp + 1e-6:
+                next_timestamp += interval
+            decode_start = time.perf_counter()
+
+    return frames
+
+# ==================== TRANSCRIPT STORAGE ====================
+# With TRANSCRIPT_STORAGE=delta, finished transcripts are stored packed in
+# `<field>_packed` (the array field is left empty): every
+# TRANSCRIPT_KEYFRAME_INTERVAL-th entry keeps its text, the others store only
+# line edits against the previous entry, which for scrolling captures and
+# slow video is a small fraction of the text. With TRANSCRIPT_ZSTD=1 and
+# `zstandard` installed the packed entries are also zstd-compressed.
+# Readers restore the array with unpack_record / stored_transcripts, so API
+# responses, exports, search indexing and reuse see the same entries either way.
+
+TRANSCRIPT_STORAGE = os.environ.get('TRANSCRIPT_STORAGE', 'full')
+TRANSCRIPT_KEYFRAME_INTERVAL = int(os.environ.get('TRANSCRIPT_KEYFRAME_INTERVAL', 50))
+TRANSCRIPT_ZSTD = os.environ.get('TRANSCRIPT_ZSTD', '0') == '1'
+TRANSCRIPT_ZSTD_LEVEL = 10
+
+def line_delta(previous: List[str], lines: List[str]) -> list:
+    """Edits turning `previous` into `lines`: [[start, end, replacement lines], ...] on `previous` indices."""
+    matcher = difflib.SequenceMatcher(None, previous, lines, autojunk=False)
+    return [[i1, i2, lines[j1:j2]] for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != "equal"]
+
+def pack_transcripts(entries: List[dict]) -> dict:
+    """Keyframe/delta form of a transcript array, optionally zstd-compressed."""
+    packed, previous = [], None
+    for position, entry in enumerate(entries):
+        text = entry.get("text") or ""
+        lines = text.split("\n")
+        item = {k: v for k, v in entry.items() if k != "text"}
+        if previous is not None and position % TRANSCRIPT_KEYFRAME_INTERVAL:
+            ops = line_delta(previous, lines)
+            # Entries that changed almost completely are cheaper stored whole
+            if sum(len(line) + 1 for op in ops for line in op[2]) + 8 * len(ops) < len(text):
+                item["ops"] = ops
+        if "ops" not in item:
+            item["text"] = text
+        packed.append(item)
+        previous = lines
+
+    if TRANSCRIPT_ZSTD and zstandard is not None:
+        data = zstandard.ZstdCompressor(level=TRANSCRIPT_ZSTD_LEVEL).compress(BSON.encode({"entries": packed}))
+        return {"format": "delta+zstd", "data": data}
+    return {"format": "delta", "entries": packed}
+
+def unpack_transcripts(packed: dict) -> List[dict]:
+    """Rebuild the transcript array from pack_transcripts output."""
+    if packed["format"] == "delta+zstd":
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd-compressed transcripts")
+        items = BSON(zstandard.ZstdDecompressor().decompress(packed["data"])).decode()["entries"]
+    else:
+        items = packed["entries"]
+
+    entries, lines = [], []
+    for item in items:
+        entry = {k: v for k, v in item.items() if k != "ops"}
+        if "ops" in item:
+            lines = list(lines)
+            for start, end, replacement in reversed(item["ops"]):
+                lines[start:end] = replacement
+            entry["text"] = "\n".join(lines)
+        else:
+            lines = entry["text"].split("\n")
+        entries.append(entry)
+    return entries
+
+def transcript_fields(field: str, entries: List[dict]) -> dict:
+    """`$set` fields storing a finished transcript array in the configured format."""
+    if TRANSCRIPT_STORAGE == "delta" and entries:
+        return {field: [], f"{field}_packed": pack_transcripts(entries)}
+    return {field: entries, f"{field}_packed": None}
+
+def stored_transcripts(record: dict, field: str) -> List[dict]:
+    """The transcript array of a job or session document, packed or not."""
+    packed = record.get(f"{field}_packed")
+    return unpack_transcripts(packed) if packed else record.get(field) or []
+
+def unpack_record(record: Optional[dict], field: str) -> Optional[dict]:
+    """Replace a packed transcript field of `record` by the plain array, in place."""
+    if record is not None and f"{field}_packed" in record:
+        record[field] = stored_transcripts(record, field)
+        del record[f"{field}_packed"]
+    return record
+
+# ==================== FRAME CACHE ====================
+# Extracted frames are kept on disk as JPEGs, one directory per video content
+# and preparation parameters (interval, crop, decode options, frame size), so
+# later jobs with the same settings skip decoding entirely. Directories are
+# evicted least-recently-used once the cache exceeds FRAME_CACHE_MAX_MB.
+
+FRAME_CACHE_DIR = UPLOAD_DIR / "frame_cache"
+FRAME_CACHE_MAX_BYTES = int(float(os.environ.get('FRAME_CACHE_MAX_MB', 2048)) * 1024 * 1024)
+
+def frame_cache_dir(cache_key: str, interval: float, crop: dict, decode: dict) -> Path:
+    decode = decode or {}
+    params = json.dumps({
+        "interval": interval,
+        "crop": crop_box(10000, 10000, crop),
+        "backend": decode.get("backend", "cv2"),
+        "skip_frames": decode.get("skip_frames"),
+        "max_size": MAX_FRAME_SIZE
+    }, sort_keys=True)
+    return FRAME_CACHE_DIR / cache_key / hashlib.sha1(params.encode()).hexdigest()[:16]
+
+def load_cached_frames(set_dir: Path) -> Optional[List[tuple]]:
+    """Read a cached frame set, or None if it is missing or incomplete."""
+    manifest_path = set_dir / "manifest.json"
+    try:
+        manifest = json.loads(manifest_path.read_text())
+        frames = [
+            (frame_index, timestamp, base64.b64encode((set_dir / f"{frame_index}.jpg").read_bytes()).decode('utf-8'))
+            for frame_index, timestamp in manifest["frames"]
+        ]
+        # The manifest's mtime is the set's last use for LRU eviction
+        os.utime(manifest_path)
+    except (OSError, ValueError, KeyError):
+        return None
+    return frames
+
+def store_cached_frames(set_dir: Path, frames: List[tuple]):
+    """Write a frame set atomically (via a temporary directory), then enforce the size limit."""
+    tmp_dir = set_dir.with_name(f"{set_dir.name}.tmp-{uuid.uuid4().hex[:8]}")
+    try:
+        tmp_dir.mkdir(parents=True)
+        for frame_index, _, base64_image in frames:
+            (tmp_dir / f"{frame_index}.jpg").write_bytes(base64.b64decode(base64_image))
+        (tmp_dir / "manifest.json").write_text(
+            json.dumps({"frames": [[frame_index, timestamp] for frame_index, timestamp, _ in frames]})
+        )
+        tmp_dir.rename(set_dir)
+    except OSError as e:
+        # Another job stored the same set first, or the disk is full
+        logging.warning(f"Could not cache frames in {set_dir}: {str(e)}")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        return
+    evict_frame_cache()
+
+def evict_frame_cache(max_bytes: int = None) -> int:
+    """Delete least-recently-used frame sets until the cache fits in `max_bytes`; returns bytes kept."""
+    max_bytes = FRAME_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    sets = []
+    total = 0
+    for manifest_path in FRAME_CACHE_DIR.glob("*/*/manifest.json"):
+        set_dir = manifest_path.parent
+        try:
+            size = sum(f.stat().st_size for f in set_dir.iterdir())
+            sets.append((manifest_path.stat().st_mtime, size, set_dir))
+        except OSError:
+            continue
+        total += size
+
+    for _, size, set_dir in sorted(sets, key=lambda s: s[0]):
+        if total <= max_bytes:
             break
-    
-    cap.release()
+        shutil.rmtree(set_dir, ignore_errors=True)
+        try:
+            set_dir.parent.rmdir()
+        except OSError:
+            pass
+        total -= size
+    return total
+
+async def video_content_id(file_id: Optional[str]) -> Optional[str]:
+    if not file_id:
+        return None
+    video = await db.videos.find_one({"file_id": file_id}, {"_id": 0, "sha256": 1})
+    return content_key(file_id, video)
+
+async def extract_frames_from_video(
+    video_path: str,
+    interval: float,
+    crop: dict = None,
+    decode: dict = None,
+    job_type: str = "video",
+    trace: JobTrace = None,
+    cache_key: str = None
+) -> List[tuple]:
+    """Extract frames from video at specified interval with optional cropping.
+
+    `decode` selects the backend ("cv2" by default) and, for PyAV, its
+    `threads` and `skip_frames` options. Decoding runs in a worker thread.
+    With a `cache_key` (the video's content id) frames are served from and
+    stored in the on-disk frame cache.
+    """
+    decode = decode or {}
+    backend = decode.get("backend", "cv2")
+    trace = trace or NULL_TRACE
+
+    if cache_key:
+        set_dir = frame_cache_dir(cache_key, interval, crop, decode)
+        with trace.span("frame_cache"):
+            frames = await asyncio.to_thread(load_cached_frames, set_dir)
+        if frames is not None:
+            FRAMES_EXTRACTED.labels(job_type, "cache").inc(len(frames))
+            return frames
+
+    start = time.perf_counter()
+    if backend == "pyav":
+        frames = await asyncio.to_thread(
+            _extract_frames_pyav,
+            video_path,
+            interval,
+            crop,
+            decode.get("threads", 0),
+            decode.get("skip_frames"),
+            trace
+        )
+    else:
+        frames = await asyncio.to_thread(_extract_frames_cv2, video_path, interval, crop, trace)
+
+    FRAME_EXTRACTION_SECONDS.labels(job_type, backend).observe(time.perf_counter() - start)
+    FRAMES_EXTRACTED.labels(job_type, backend).inc(len(frames))
+
+    if cache_key and frames:
+        await asyncio.to_thread(store_cached_frames, set_dir, frames)
     return frames
 
-async def ocr_frame(base64_image: str, api_key: str) -> str:
-    """Extract text from a single frame using GPT-4o vision."""
+def build_decode_settings(backend: str, threads: int, skip_frames: Optional[str]) -> dict:
+    """Validate per-job decode options from request parameters."""
+    if backend not in DECODE_BACKENDS:
+        raise HTTPException(status_code=400, detail=f"Decode backend must be one of: {', '.join(DECODE_BACKENDS)}")
+    if backend == "pyav" and av is None:
+        raise HTTPException(status_code=400, detail="PyAV decode backend is not available on this server")
+    if threads < 0 or threads > 16:
+        raise HTTPException(status_code=400, detail="Decode threads must be between 0 and 16")
+    if skip_frames not in (None, "keyframes", "nonref"):
+        raise HTTPException(status_code=400, detail="skip_frames must be 'keyframes' or 'nonref'")
+    if skip_frames and backend != "pyav":
+        raise HTTPException(status_code=400, detail="skip_frames requires the pyav decode backend")
+
+    return {"backend": backend, "threads": threads, "skip_frames": skip_frames}
+
+# ==================== VIDEO METADATA ====================
+# Uploads are probed once and described in the `videos` collection (keyed by
+# file_id), so jobs can locate the file and plan decoding without reopening it.
+
+VIDEO_EXTENSIONS = ['.mp4', '.mov', '.avi', '.mkv', '.webm', '.m4v']
+
+VIDEO_PROBE_FIELDS = ("container", "codec", "fps", "frame_count", "duration", "width", "height", "keyframes")
+
+# Uploads are read and hashed in chunks of this size
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Keyframe timestamps kept per video (enough for hours of 1-2s GOPs)
+MAX_PROBED_KEYFRAMES = 20000
+
+def probe_video(video_path: str) -> dict:
+    """Read container/stream metadata and keyframe positions without decoding frames."""
+    if av is not None:
+        with av.open(video_path) as container:
+            if not container.streams.video:
+                raise ValueError("No video stream found")
+            stream = container.streams.video[0]
+            fps = float(stream.average_rate) if stream.average_rate else 0
+            time_base = float(stream.time_base) if stream.time_base else 0
+            
+            # Demux only: packets carry keyframe flags, no decoding needed
+            keyframes = []
+            packet_count = 0
+            last_time = 0.0
+            for packet in container.demux(stream):
+                if packet.pts is None:
+                    continue
+                packet_count += 1
+                packet_time = packet.pts * time_base
+                last_time = max(last_time, packet_time)
+                if packet.is_keyframe and len(keyframes) < MAX_PROBED_KEYFRAMES:
+                    keyframes.append(round(packet_time, 3))
+            
+            if container.duration:
+                duration = container.duration / 1_000_000
+            elif stream.duration and time_base:
+                duration = stream.duration * time_base
+            else:
+                duration = last_time
+            
+            return {
+                "container": container.format.name,
+                "codec": stream.codec_context.name,
+                "fps": round(fps, 3),
+                "frame_count": stream.frames or packet_count,
+                "duration": round(duration, 3),
+                "width": stream.codec_context.width,
+                "height": stream.codec_context.height,
+                "keyframes": sorted(keyframes)
+            }
+
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise ValueError("Could not open video file")
     try:
-        chat = LlmChat(
-            api_key=api_key,
-            session_id=str(uuid.uuid4()),
-            system_message="You are an OCR assistant. Extract ALL visible text from the image exactly as it appears. Include line breaks where appropriate. If there is no readable text, respond with '[No text detected]'. Do not add any commentary or explanation - only output the extracted text."
-        ).with_model("openai", "gpt-4o")
-        
-        image_content = ImageContent(image_base64=base64_image)
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        fourcc = int(cap.get(cv2.CAP_PROP_FOURCC))
+        return {
+            "container": Path(video_path).suffix.lstrip('.'),
+            "codec": "".join(chr((fourcc >> (8 * i)) & 0xFF) for i in range(4)).strip("\x00 ") or None,
+            "fps": round(fps, 3),
+            "frame_count": frame_count,
+            "duration": round(frame_count / fps, 3) if fps > 0 else 0,
+            "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            "keyframes": None
+        }
+    finally:
+        cap.release()
+
+async def find_video(file_id: str, touch: bool = True) -> Optional[dict]:
+    """Look up an uploaded video by file_id; returns its `videos` document (with `path`) or None.
+
+    `touch=False` leaves the upload's last use alone, for read-only lookups.
+    """
+    video = await db.videos.find_one({"file_id": file_id}, {"_id": 0})
+    if video is not None:
+        if not video.get("path"):
+            return None
+        if touch and video.get("sha256"):
+            # Last use orders eviction when the upload quota is exceeded
+            await db.video_blobs.update_one(
+                {"sha256": video["sha256"]}, {"$set": {"last_used": datetime.now(timezone.utc).isoformat()}}
+            )
+        return video
+
+    # Files uploaded before metadata was recorded
+    for ext in VIDEO_EXTENSIONS:
+        potential_path = UPLOAD_DIR / f"{file_id}{ext}"
+        if potential_path.exists():
+            return {"file_id": file_id, "path": str(potential_path)}
+    return None
+
+def content_key(file_id: str, video: Optional[dict]) -> str:
+    """Key for results derived from a video's content: its SHA-256, or the file_id for legacy uploads."""
+    return (video or {}).get("sha256") or file_id
+
+async def release_video(file_id: str, video_path: str):
+    """Drop a job's reference to an uploaded video, deleting the stored file once unreferenced.
+
+    Releasing an already released upload is a no-op.
+    """
+    video = await db.videos.find_one_and_update(
+        {"file_id": file_id, "path": {"$ne": None}}, {"$set": {"path": None}}, {"_id": 0, "sha256": 1}
+    )
+    if video is None and await db.videos.find_one({"file_id": file_id}, {"_id": 1}):
+        return
+    sha256 = (video or {}).get("sha256")
+    if sha256:
+        blob = await db.video_blobs.find_one_and_update(
+            {"sha256": sha256}, {"$inc": {"refcount": -1}}, return_document=ReturnDocument.AFTER
+        )
+        if blob and blob["refcount"] > 0:
+            return
+        await db.video_blobs.delete_one({"sha256": sha256, "refcount": {"$lte": 0}})
+    try:
+        os.remove(video_path)
+    except OSError:
+        pass
+
+def estimate_frame_count(video: dict, interval: float) -> Optional[int]:
+    """Frames a job will sample, from probed metadata (None if unknown)."""
+    fps, frame_count = video.get("fps"), video.get("frame_count")
+    if not fps or not frame_count:
+        return None
+    frame_step = max(1, int(fps * interval))
+    return (frame_count + frame_step - 1) // frame_step
+
+# ==================== STORAGE MANAGER ====================
+# A periodic sweep keeps UPLOAD_DIR bounded: it removes abandoned partial
+# uploads and orphaned files, deletes stored videos whose uploads were all
+# released or expired, and when usage exceeds UPLOAD_QUOTA_MB evicts the frame
+# cache first, then least-recently-used videos. Content used by a queued or
+# running job is never evicted.
+
+UPLOAD_QUOTA_BYTES = int(float(os.environ.get('UPLOAD_QUOTA_MB', 10240)) * 1024 * 1024)
+STORAGE_SWEEP_INTERVAL = float(os.environ.get('STORAGE_SWEEP_INTERVAL', 300))
+
+# Age after which an unfinished upload or an unreferenced file is considered abandoned
+STALE_UPLOAD_SECONDS = 3600
+ORPHAN_FILE_SECONDS = 86400
+
+ACTIVE_JOB_STATUSES = ["queued", "extracting_frames", "processing"]
+
+last_storage_sweep = {}
+
+async def active_content_ids() -> set:
+    """Content ids of videos that queued or running jobs still read."""
+    content_ids = set()
+    for collection in (db.ocr_jobs, db.benchmark_jobs):
+        content_ids.update(await collection.distinct("content_id", {"status": {"$in": ACTIVE_JOB_STATUSES}}))
+    return content_ids
+
+async def evict_video_blob(blob: dict):
+    """Delete a stored video and detach every upload pointing at it."""
+    await db.videos.update_many({"sha256": blob["sha256"]}, {"$set": {"path": None}})
+    await db.video_blobs.delete_one({"sha256": blob["sha256"]})
+    try:
+        os.remove(blob["path"])
+    except OSError:
+        pass
+
+def remove_stale_files(known_paths: set, active: set) -> dict:
+    """Delete abandoned partial uploads, frame cache temp dirs and files no blob refers to."""
+    now = time.time()
+    removed = {"partial_uploads": 0, "orphan_files": 0}
+    for path in UPLOAD_DIR.iterdir():
+        try:
+            if not path.is_file():
+                continue
+            age = now - path.stat().st_mtime
+            if path.suffix == ".part":
+                if age > STALE_UPLOAD_SECONDS:
+                    path.unlink()
+                    removed["partial_uploads"] += 1
+            # Uploads from before deduplication are named <file_id><ext>
+            elif str(path) not in known_paths and path.stem not in active and age > ORPHAN_FILE_SECONDS:
+                path.unlink()
+                removed["orphan_files"] += 1
+        except OSError:
+            continue
+
+    for tmp_dir in FRAME_CACHE_DIR.glob("*/*.tmp-*"):
+        try:
+            if now - tmp_dir.stat().st_mtime > STALE_UPLOAD_SECONDS:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        except OSError:
+            continue
+    return removed
+
+async def sweep_storage() -> dict:
+    """Run one storage sweep and return what it removed and the resulting usage."""
+    active = await active_content_ids()
+    blobs = await db.video_blobs.find({}, {"_id": 0}).to_list(None)
+    result = await asyncio.to_thread(remove_stale_files, {b["path"] for b in blobs}, active)
+    result.update({"released_videos": 0, "evicted_videos": 0})
+
+    # Stored videos nobody can reach any more (all uploads released or expired);
+    # recently used ones are spared so an upload in progress is not mistaken for one
+    recent = (datetime.now(timezone.utc) - timedelta(seconds=STALE_UPLOAD_SECONDS)).isoformat()
+    kept = []
+    for blob in blobs:
+        last_used = blob.get("last_used") or blob.get("created_at") or ""
+        if blob["sha256"] not in active and last_used < recent and (
+            blob.get("refcount", 0) <= 0
+            or not await db.videos.find_one({"sha256": blob["sha256"], "path": {"$ne": None}}, {"_id": 1})
+        ):
+            await evict_video_blob(blob)
+            result["released_videos"] += 1
+        else:
+            kept.append(blob)
+
+    video_bytes = sum(blob.get("size", 0) for blob in kept)
+    cache_bytes = await asyncio.to_thread(evict_frame_cache, min(FRAME_CACHE_MAX_BYTES, max(0, UPLOAD_QUOTA_BYTES - video_bytes)))
+
+    evictable = sorted(
+        (blob for blob in kept if blob["sha256"] not in active),
+        key=lambda blob: blob.get("last_used") or blob.get("created_at") or ""
+    )
+    for blob in evictable:
+        if video_bytes + cache_bytes <= UPLOAD_QUOTA_BYTES:
+            break
+        await evict_video_blob(blob)
+        video_bytes -= blob.get("size", 0)
+        result["evicted_videos"] += 1
+
+    result.update({
+        "video_bytes": video_bytes,
+        "frame_cache_bytes": cache_bytes,
+        "quota_bytes": UPLOAD_QUOTA_BYTES,
+        "swept_at": datetime.now(timezone.utc).isoformat()
+    })
+    if result["evicted_videos"]:
+        logging.warning(f"Upload quota exceeded, evicted {result['evicted_videos']} least recently used videos")
+    return result
+
+async def storage_sweep_loop():
+    while True:
+        try:
+            last_storage_sweep.clear()
+            last_storage_sweep.update(await sweep_storage())
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.error(f"Storage sweep failed: {str(e)}")
+        await asyncio.sleep(STORAGE_SWEEP_INTERVAL)
+
+OCR_SYSTEM_MESSAGE = "You are an OCR assistant. Extract ALL visible text from the image exactly as it appears. Include line breaks where appropriate. If there is no readable text, respond with '[No text detected]'. Do not add any commentary or explanation - only output the extracted text."
+
+# ==================== OCR SCHEDULER ====================
+# Every OCR request (video, benchmark, mobile and live OCR) takes a slot from
+# a fair-share scheduler. At most OCR_CONCURRENCY requests run at once per
+# worker process. Contended slots are granted round-robin across owners, so
+# one owner with many queued frames cannot starve the others. The owner of a
+# submitted job is its client address (client_host); live OCR is owned by
+# its capture session.
+
+OCR_CONCURRENCY = int(os.environ.get('OCR_CONCURRENCY', 4))
+
+class FairShareScheduler:
+    def __init__(self, slots: int):
+        self.slots = slots
+        self.free = slots
+        self.waiters = {}  # owner -> deque of futures, oldest first
+        self.turns = deque()  # owners with waiters, in round-robin order
+
+    async def acquire(self, owner: str):
+        if self.free > 0 and not self.turns:
+            self.free -= 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        queue = self.waiters.setdefault(owner, deque())
+        if not queue:
+            self.turns.append(owner)
+        queue.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just as we were cancelled: pass the slot on
+                self.release()
+            else:
+                queue.remove(future)
+                if not queue:
+                    del self.waiters[owner]
+                    self.turns.remove(owner)
+            raise
+
+    def release(self):
+        if self.turns:
+            owner = self.turns.popleft()
+            queue = self.waiters[owner]
+            queue.popleft().set_result(None)
+            if queue:
+                self.turns.append(owner)
+            else:
+                del self.waiters[owner]
+            return
+        self.free += 1
+
+    @asynccontextmanager
+    async def slot(self, owner: str, trace: JobTrace = None):
+        with (trace or NULL_TRACE).span("ocr_queue_wait"):
+            await self.acquire(owner)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self) -> dict:
+        return {
+            "slots": self.slots,
+            "free": self.free,
+            "waiting": {owner: len(queue) for owner, queue in self.waiters.items()}
+        }
+
+ocr_scheduler = FairShareScheduler(OCR_CONCURRENCY)
+
+# ==================== OCR CLIENT ====================
+# With OCR_API_BASE set (any OpenAI-compatible endpoint), OCR requests share
+# one long-lived httpx client whose keep-alive pool is sized to
+# OCR_CONCURRENCY, so frames reuse open connections instead of paying client
+# setup and a TLS handshake each. OCR_API_KEY is then required: the
+# EMERGENT_LLM_KEY is never sent to a configured endpoint. Pooling applies
+# only to OCR_API_BASE deployments: without it each request still goes
+# through a fresh LlmChat as before (its history is per instance, so it can't
+# be shared between frames).
+
+OCR_API_BASE = os.environ.get('OCR_API_BASE')
+OCR_API_KEY = os.environ.get('OCR_API_KEY')
+OCR_MODEL = os.environ.get('OCR_MODEL', 'gpt-4o')
+OCR_HTTP_TIMEOUT = float(os.environ.get('OCR_HTTP_TIMEOUT', 120))
+
+class OcrClient:
+    """OCR transport: a shared httpx pool for OCR_API_BASE, else a LlmChat per request."""
+    def __init__(self, api_base: Optional[str], max_connections: int):
+        self.api_base = api_base.rstrip('/') if api_base else None
+        self.max_connections = max_connections
+        self.http = None
+
+    async def start(self):
+        if self.api_base and not OCR_API_KEY:
+            raise RuntimeError("OCR_API_KEY must be set when OCR_API_BASE is set")
+        if self.api_base and self.http is None:
+            self.http = httpx.AsyncClient(
+                base_url=self.api_base,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=60
+                ),
+                # Waiting for a pooled connection is bounded by the scheduler, not a timeout
+                timeout=httpx.Timeout(OCR_HTTP_TIMEOUT, pool=None)
+            )
+
+    async def aclose(self):
+        if self.http is not None:
+            await self.http.aclose()
+            self.http = None
+
+    async def complete(self, base64_image: str, api_key: str, system_message: str, prompt: str) -> str:
+        """Send one image with a prompt to the vision model and return the response text."""
+        if self.http is None:
+            if llm_chat.module is None:
+                # Importing the LLM integration takes seconds; keep it off the event loop
+                await asyncio.to_thread(llm_chat.load)
+            chat = llm_chat.LlmChat(
+                api_key=api_key,
+                session_id=str(uuid.uuid4()),
+                system_message=system_message
+            ).with_model("openai", OCR_MODEL)
+            
+            image_content = llm_chat.ImageContent(image_base64=base64_image)
+            
+            user_message = llm_chat.UserMessage(
+                text=prompt,
+                file_contents=[image_content]
+            )
+            
+            return await chat.send_message(user_message)
         
-        user_message = UserMessage(
-            text="Extract all text from this image. Output only the text content, nothing else.",
-            file_contents=[image_content]
+        response = await self.http.post(
+            "/chat/completions",
+            headers={"Authorization": f"Bearer {OCR_API_KEY}"},
+            json={
+                "model": OCR_MODEL,
+                "messages": [
+                    {"role": "system", "content": system_message},
+                    {"role": "user", "content": [
+                        {"type": "text", "text": prompt},
+                        {"type": "image_url", "image_url": {"url": f"data:image/jpeg;base64,{base64_image}"}}
+                    ]}
+                ]
+            }
         )
+        response.raise_for_status()
+        return response.json()["choices"][0]["message"]["content"]
+
+# ==================== OCR DEADLINES AND RETRIES ====================
+# Every OCR attempt has a deadline (OCR_TIMEOUT). Timeouts and transient
+# errors are retried up to OCR_MAX_RETRIES times with jittered exponential
+# back-off; each attempt takes its own scheduler slot, so an owner backing off
+# does not hold one while it sleeps. With OCR_HEDGING=1 a duplicate request is
+# sent when the first has not answered within the recent p95 latency, and
+# whichever answers first wins, so one slow response no longer stalls a job's
+# frame loop.
+
+OCR_TIMEOUT = float(os.environ.get('OCR_TIMEOUT', 60))
+OCR_MAX_RETRIES = int(os.environ.get('OCR_MAX_RETRIES', 2))
+OCR_RETRY_BACKOFF = float(os.environ.get('OCR_RETRY_BACKOFF', 1.0))
+OCR_HEDGING = os.environ.get('OCR_HEDGING', '0') == '1'
+OCR_HEDGE_MIN_DELAY = float(os.environ.get('OCR_HEDGE_MIN_DELAY', 2.0))
+
+class LatencyWindow:
+    """Recent successful OCR latencies, for the hedging delay."""
+    def __init__(self, size: int = 200, min_samples: int = 20):
+        self.samples = deque(maxlen=size)
+        self.min_samples = min_samples
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        if len(self.samples) < self.min_samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[max(0, int(len(ordered) * fraction) - 1)]
+
+    def p95(self) -> Optional[float]:
+        return self.percentile(0.95)
+
+ocr_latency = LatencyWindow()
+
+# Hedged requests need connections beyond the concurrency budget
+ocr_client = OcrClient(OCR_API_BASE, OCR_CONCURRENCY * 2 if OCR_HEDGING else OCR_CONCURRENCY)
+
+# Provider errors raised through LlmChat (litellm and openai exception
+# classes), matched by name so classifying them needs no LLM import
+TRANSIENT_ERROR_NAMES = {
+    "APIConnectionError", "APITimeoutError", "Timeout", "RateLimitError",
+    "InternalServerError", "ServiceUnavailableError", "BadGatewayError"
+}
+
+def is_transient_error(error: Exception) -> bool:
+    """Whether an OCR failure is worth retrying (timeouts, connection errors, 408/429/5xx).
+
+    Anything else, such as a bad request or an invalid key, fails fast.
+    """
+    while error is not None:
+        if isinstance(error, (asyncio.TimeoutError, httpx.TransportError, ConnectionError)):
+            return True
+        if isinstance(error, httpx.HTTPStatusError):
+            status = error.response.status_code
+        else:
+            status = getattr(error, "status_code", None)
+        if isinstance(status, int):
+            return status in (408, 429) or status >= 500
+        if any(cls.__name__ in TRANSIENT_ERROR_NAMES for cls in type(error).__mro__):
+            return True
+        # Wrapped provider errors are kept as the cause
+        error = error.__cause__ or error.__context__
+    return False
+
+async def timed_complete(base64_image: str, api_key: str, system_message: str, prompt: str) -> str:
+    start = time.perf_counter()
+    response = await ocr_client.complete(base64_image, api_key, system_message, prompt)
+    ocr_latency.record(time.perf_counter() - start)
+    return response
+
+async def hedged_complete(base64_image: str, api_key: str, system_message: str, prompt: str, job_type: str) -> str:
+    """One OCR attempt; with hedging, a duplicate races the first once it exceeds p95 latency."""
+    args = (base64_image, api_key, system_message, prompt)
+    p95 = ocr_latency.p95() if OCR_HEDGING else None
+    if p95 is None:
+        return await timed_complete(*args)
+
+    tasks = {asyncio.create_task(timed_complete(*args))}
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=max(p95, OCR_HEDGE_MIN_DELAY))
+        if not done:
+            OCR_HEDGES.labels(job_type).inc()
+            tasks.add(asyncio.create_task(timed_complete(*args)))
         
-        response = await chat.send_message(user_message)
-        return response.strip() if response else "[No text detected]"
+        pending, error = tasks, None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+
+async def request_ocr(
+    base64_image: str,
+    api_key: str,
+    system_message: str,
+    prompt: str,
+    job_type: str,
+    owner: str = None,
+    trace: JobTrace = None
+) -> str:
+    """Send one image to the OCR vision model and return the raw response text.
+
+    Each attempt takes its own scheduler slot as `owner` (the job type when not
+    given), so the back-off between attempts leaves the slot to other owners.
+    Raises the last error once the attempt deadline or retries are exhausted.
+    """
+    trace = trace or NULL_TRACE
+    OCR_BYTES_SENT.labels(job_type).inc(len(base64_image))
+    start = time.perf_counter()
+    try:
+        for attempt in range(OCR_MAX_RETRIES + 1):
+            try:
+                async with ocr_scheduler.slot(owner or job_type, trace):
+                    with trace.span("ocr_call"):
+                        return await asyncio.wait_for(
+                            hedged_complete(base64_image, api_key, system_message, prompt, job_type), OCR_TIMEOUT
+                        )
+            except Exception as e:
+                if attempt == OCR_MAX_RETRIES or not is_transient_error(e):
+                    raise
+                OCR_RETRIES.labels(job_type).inc()
+                delay = random.uniform(0, OCR_RETRY_BACKOFF * 2 ** attempt)
+                logging.warning(f"OCR attempt {attempt + 1} failed ({type(e).__name__}: {e}), retrying in {delay:.1f}s")
+                with trace.span("ocr_retry_backoff"):
+                    await asyncio.sleep(delay)
+    finally:
+        OCR_LATENCY_SECONDS.labels(job_type).observe(time.perf_counter() - start)
+
+async def ocr_frame(
+    base64_image: str, api_key: str, job_type: str = "video", owner: str = None, trace: JobTrace = None
+) -> str:
+    """Extract text from a single frame using GPT-4o vision, scheduled as `owner`."""
+    try:
+        response = await request_ocr(
+            base64_image,
+            api_key,
+            OCR_SYSTEM_MESSAGE,
+            "Extract all text from this image. Output only the text content, nothing else.",
+            job_type,
+            owner,
+            trace
+        )
+        text = response.strip() if response else "[No text detected]"
+        OCR_REQUESTS.labels(job_type, "empty" if text == "[No text detected]" else "text").inc()
+        return text
+    except Exception as e:
+        OCR_REQUESTS.labels(job_type, "error").inc()
+        logging.error(f"OCR error: {str(e)}")
+        return f"[OCR Error: {str(e) or type(e).__name__}]"
+
+def is_ocr_error(text: str) -> bool:
+    return text.startswith("[OCR Error")
+
+# ==================== LAYOUT OCR ====================
+# In "layout" mode frames are OCR'd once, uncropped, and the recognised words
+# are stored with normalised bounding boxes in `frame_ocr` (one document per
+# content_id/frame_index, so identical uploads share results). Any crop is
+# then answered by filtering stored boxes.
+# LAYOUT_OCR_ENGINE selects "tesseract" (local, word boxes), "llm" (GPT-4o,
+# line boxes) or "auto" (tesseract when installed).
+
+OCR_MODES = ("text", "layout")
+LAYOUT_OCR_ENGINE = os.environ.get('LAYOUT_OCR_ENGINE', 'auto')
+
+LAYOUT_SYSTEM_MESSAGE = (
+    "You are an OCR assistant that reports text layout. Find every line of visible text in the image. "
+    "Respond with JSON only, no commentary or code fences, in the form "
+    '{"lines": [{"text": "<line text>", "box": [x0, y0, x1, y1]}]} '
+    "where box is the line's bounding box as fractions of image width and height (0 to 1, origin top-left), "
+    "in reading order. If there is no readable text, respond with {\"lines\": []}."
+)
+
+def layout_engine() -> str:
+    if LAYOUT_OCR_ENGINE == "auto":
+        return "tesseract" if pytesseract is not None else "llm"
+    return LAYOUT_OCR_ENGINE
+
+def _tesseract_words(base64_image: str) -> List[dict]:
+    image = Image.open(io.BytesIO(base64.b64decode(base64_image)))
+    width, height = image.size
+    data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT)
+
+    words = []
+    for i, text in enumerate(data["text"]):
+        if not text.strip() or float(data["conf"][i]) < 0:
+            continue
+        x, y, w, h = data["left"][i], data["top"][i], data["width"][i], data["height"][i]
+        words.append({
+            "text": text,
+            "box": [round(x / width, 4), round(y / height, 4), round((x + w) / width, 4), round((y + h) / height, 4)],
+            "line": f"{data['block_num'][i]}.{data['par_num'][i]}.{data['line_num'][i]}"
+        })
+    return words
+
+def _parse_layout_response(response: str) -> List[dict]:
+    response = (response or "").strip()
+    if response.startswith("```"):
+        response = response.strip("`")
+        response = response[response.index("{"):] if "{" in response else response
+    data = json.loads(response)
+
+    words = []
+    for idx, line in enumerate(data.get("lines", [])):
+        text = str(line.get("text", "")).strip()
+        box = line.get("box")
+        if not text or not isinstance(box, list) or len(box) != 4:
+            continue
+        words.append({
+            "text": text,
+            "box": [round(min(max(float(v), 0.0), 1.0), 4) for v in box],
+            "line": str(idx)
+        })
+    return words
+
+async def ocr_frame_layout(
+    base64_image: str, api_key: str, job_type: str = "video", owner: str = None, trace: JobTrace = None
+) -> Optional[List[dict]]:
+    """OCR a frame into words/lines with normalised boxes, scheduled as `owner`; None if OCR failed."""
+    try:
+        if layout_engine() == "tesseract":
+            start = time.perf_counter()
+            try:
+                async with ocr_scheduler.slot(owner or job_type, trace):
+                    with (trace or NULL_TRACE).span("ocr_call"):
+                        words = await asyncio.to_thread(_tesseract_words, base64_image)
+            finally:
+                OCR_LATENCY_SECONDS.labels(job_type).observe(time.perf_counter() - start)
+        else:
+            response = await request_ocr(
+                base64_image,
+                api_key,
+                LAYOUT_SYSTEM_MESSAGE,
+                "Return the text lines of this image with their bounding boxes as JSON.",
+                job_type,
+                owner,
+                trace
+            )
+            words = _parse_layout_response(response)
+        OCR_REQUESTS.labels(job_type, "text" if words else "empty").inc()
+        return words
     except Exception as e:
-        logging.error(f"OCR error: {str(e)}")
-        return f"[OCR Error: {str(e)}]"
+        OCR_REQUESTS.labels(job_type, "error").inc()
+        logging.error(f"Layout OCR error: {str(e)}")
+        return None
+
+def words_to_text(words: List[dict], crop: dict = None) -> str:
+    """Rebuild text from stored words, keeping those whose centre lies in the crop."""
+    crop = crop or {}
+    x1, x2 = crop.get('left', 0) / 100, 1 - crop.get('right', 0) / 100
+    y1, y2 = crop.get('top', 0) / 100, 1 - crop.get('bottom', 0) / 100
+
+    lines = {}
+    for word in words:
+        bx0, by0, bx1, by1 = word["box"]
+        cx, cy = (bx0 + bx1) / 2, (by0 + by1) / 2
+        if x1 <= cx <= x2 and y1 <= cy <= y2:
+            lines.setdefault(word["line"], []).append(word)
+
+    ordered = sorted(lines.values(), key=lambda ws: min(w["box"][1] for w in ws))
+    return "\n".join(" ".join(w["text"] for w in sorted(ws, key=lambda w: w["box"][0])) for ws in ordered)
+
+def plan_frame_indices(video_path: str, interval: float, video: dict = None) -> List[tuple]:
+    """Frame indices/timestamps the cv2 backend would sample, from probed or container metadata."""
+    if video and video.get("fps") and video.get("frame_count"):
+        fps, total_frames = video["fps"], video["frame_count"]
+    else:
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            raise ValueError("Could not open video file")
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        cap.release()
+
+    frame_step = max(1, int(fps * interval) if fps > 0 else 1)
+    return [(i, i / fps if fps > 0 else i) for i in range(0, max(total_frames, 1), frame_step)]
+
+async def layout_ocr_frames(
+    file_id: str,
+    video_path: str,
+    interval: float,
+    decode: dict,
+    api_key: str,
+    job_type: str,
+    trace: JobTrace,
+    on_progress=None,
+    owner: str = None
+) -> tuple:
+    """Return stored layout OCR for the sampled frames, OCR'ing only frames not stored yet.
+
+    Returns `(frames, failed_frames)`: frames that still fail after one retry
+    are not stored and are listed in `failed_frames` instead. `on_progress(done,
+    total)` is awaited after each newly OCR'd frame. OCR requests wait for a
+    fair-share scheduler slot as `owner`, or as the file when no owner is given.
+    """
+    video = await db.videos.find_one({"file_id": file_id}, {"_id": 0, "fps": 1, "frame_count": 1, "sha256": 1})
+    content_id = content_key(file_id, video)
+    frames = None
+    if (decode or {}).get("backend", "cv2") == "cv2":
+        planned = plan_frame_indices(video_path, interval, video) if video else \
+            await asyncio.to_thread(plan_frame_indices, video_path, interval)
+    else:
+        # PyAV samples by timestamp (and may skip frames), so only decoding tells
+        # which frames it picks; later runs read them from the frame cache
+        frames = await extract_frames_from_video(video_path, interval, None, decode, job_type, trace, content_id)
+        planned = [(frame_index, timestamp) for frame_index, timestamp, _ in frames]
+    stored = {}
+    async for doc in db.frame_ocr.find(
+        {"content_id": content_id, "frame_index": {"$in": [i for i, _ in planned]}}, {"_id": 0}
+    ):
+        stored[doc["frame_index"]] = doc
+
+    failed_frames = []
+    if len(stored) < len(planned):
+        if frames is None:
+            frames = await extract_frames_from_video(video_path, interval, None, decode, job_type, trace, content_id)
+        async def ocr_and_store(frame_index: int, timestamp: float, base64_image: str) -> bool:
+            words = await ocr_frame_layout(base64_image, api_key, job_type, owner or file_id, trace)
+            if words is None:
+                return False
+            doc = {
+                "content_id": content_id,
+                "frame_index": frame_index,
+                "timestamp": round(timestamp, 2),
+                "engine": layout_engine(),
+                "words": words,
+                "expires_at": job_expiry()
+            }
+            with trace.span("persist"):
+                await db.frame_ocr.update_one(
+                    {"content_id": content_id, "frame_index": frame_index}, {"$set": doc}, upsert=True
+                )
+            stored[frame_index] = doc
+            return True
+
+        missing = [f for f in frames if f[0] not in stored]
+        failed = []
+        for done, frame in enumerate(missing, 1):
+            if not await ocr_and_store(*frame):
+                # Retried once the other frames are done
+                failed.append(frame)
+            if on_progress is not None:
+                await on_progress(done, len(missing))
+            with trace.span("rate_limit_pause"):
+                await asyncio.sleep(0.1)
+        for frame_index, timestamp, base64_image in failed:
+            if not await ocr_and_store(frame_index, timestamp, base64_image):
+                failed_frames.append({
+                    "frame_index": frame_index,
+                    "timestamp": round(timestamp, 2),
+                    "error": "[OCR Error: layout OCR failed]"
+                })
+
+    return [stored[i] for i in sorted(stored)], failed_frames
+
+def layout_transcripts(frames: List[dict], crop: dict = None) -> List[dict]:
+    """Build transcript entries for a crop from stored layout OCR."""
+    transcripts = []
+    for doc in frames:
+        text = words_to_text(doc["words"], crop)
+        if text:
+            transcripts.append({
+                "timestamp": doc["timestamp"],
+                "text": text,
+                "frame_index": doc["frame_index"]
+            })
+    return transcripts
+
+# ==================== NEAR-DUPLICATE FRAMES ====================
+# A text-mode video job compares each frame with the last frame it OCR'd, on
+# 64px grayscale thumbnails. When they are the same screen (mean absolute
+# difference below NEAR_DUPLICATE_DIFF, on a 0-255 scale) the frame reuses that
+# frame's text instead of an OCR call. The estimator samples the same measure.
+# Set OCR_SKIP_NEAR_DUPLICATES=0 to OCR every sampled frame.
+
+OCR_SKIP_NEAR_DUPLICATES = os.environ.get('OCR_SKIP_NEAR_DUPLICATES', '1') == '1'
+NEAR_DUPLICATE_DIFF = 2.0
+
+def thumbnail(gray):
+    """64px float thumbnail of a grayscale image, for near-duplicate checks."""
+    return cv2.resize(gray, (64, 64), interpolation=cv2.INTER_AREA).astype("float32")
+
+def frame_thumbnail(base64_image: str):
+    """Thumbnail of an encoded frame as sent to OCR."""
+    data = np.frombuffer(base64.b64decode(base64_image), dtype=np.uint8)
+    return thumbnail(cv2.imdecode(data, cv2.IMREAD_GRAYSCALE))
 
-async def process_video_job(job_id: str, video_path: str, interval: float, crop: dict = None):
-    """Background task to process video and extract text."""
+def is_near_duplicate(a, b) -> bool:
+    return a is not None and b is not None and float(abs(a - b).mean()) < NEAR_DUPLICATE_DIFF
+
+async def process_video_job(
+    job_id: str,
+    video_path: str,
+    interval: float,
+    crop: dict = None,
+    decode: dict = None,
+    ocr_mode: str = "text",
+    file_id: str = None,
+    owner: str = None
+):
+    """Background task to process video and extract text.
+
+    OCR slots are requested from the fair-share scheduler as `owner`
+    (the job itself when not given).
+    """
+    owner = owner or job_id
     api_key = os.environ.get('EMERGENT_LLM_KEY')
     if not api_key:
         await db.ocr_jobs.update_one(
@@ -194,63 +1964,147 @@ async def process_video_job(job_id: str, video_path: str, interval: float, crop:
             {"$set": {"status": "failed", "error": "EMERGENT_LLM_KEY not configured"}}
         )
         return
-    
+
+    job_start = time.perf_counter()
+    final_status = "failed"
+    trace = JobTrace("video", job_id)
+    JOBS_IN_PROGRESS.labels("video").inc()
     try:
+        check_cancelled()
         # Extract frames
         await db.ocr_jobs.update_one(
             {"id": job_id},
             {"$set": {"status": "extracting_frames"}}
         )
         
-        frames = await extract_frames_from_video(video_path, interval, crop)
-        total_frames = len(frames)
-        
-        await db.ocr_jobs.update_one(
-            {"id": job_id},
-            {"$set": {"status": "processing", "total_frames": total_frames}}
-        )
-        
-        transcripts = []
-        
-        for idx, (frame_index, timestamp, base64_image) in enumerate(frames):
-            # OCR the frame
-            text = await ocr_frame(base64_image, api_key)
+        if ocr_mode == "layout":
+            async def report_progress(done: int, total: int):
+                await update_progress(
+                    db.ocr_jobs, "video",
+                    {"id": job_id},
+                    {"$set": {"status": "processing", "total_frames": total, "progress": int(done / total * 100)}},
+                    trace
+                )
             
-            if text and text != "[No text detected]":
-                transcripts.append({
-                    "timestamp": round(timestamp, 2),
-                    "text": text,
-                    "frame_index": frame_index
-                })
+            layout_frames, failed_frames = await layout_ocr_frames(
+                file_id, video_path, interval, decode, api_key, "video", trace, report_progress, owner
+            )
+            transcripts = layout_transcripts(layout_frames, crop)
+            await update_progress(
+                db.ocr_jobs, "video",
+                {"id": job_id},
+                {"$set": {
+                    "total_frames": len(layout_frames) + len(failed_frames),
+                    "transcripts": transcripts,
+                    "failed_frames": failed_frames
+                }},
+                trace
+            )
+        else:
+            frames = await extract_frames_from_video(
+                video_path, interval, crop, decode, "video", trace, await video_content_id(file_id)
+            )
+            total_frames = len(frames)
             
-            # Update progress
-            progress = int(((idx + 1) / total_frames) * 100)
             await db.ocr_jobs.update_one(
                 {"id": job_id},
-                {"$set": {"progress": progress, "transcripts": transcripts}}
+                {"$set": {"status": "processing", "total_frames": total_frames}}
             )
             
-            # Small delay to avoid rate limiting
-            await asyncio.sleep(0.1)
+            transcripts = []
+            failed = []
+            last_thumbnail, last_text = None, None
+            
+            for idx, (frame_index, timestamp, base64_image) in enumerate(frames):
+                frame_thumb = None
+                if OCR_SKIP_NEAR_DUPLICATES:
+                    frame_thumb = await asyncio.to_thread(frame_thumbnail, base64_image)
+                reused = last_text is not None and is_near_duplicate(frame_thumb, last_thumbnail)
+                if reused:
+                    # Same screen as the last OCR'd frame: reuse its text
+                    text = last_text
+                    OCR_FRAMES_REUSED.labels("video").inc()
+                else:
+                    # OCR the frame
+                    text = await ocr_frame(base64_image, api_key, "video", owner, trace)
+                    if not is_ocr_error(text):
+                        last_thumbnail, last_text = frame_thumb, text
+            
+                if is_ocr_error(text):
+                    # Retried once the other frames are done instead of stored as text
+                    failed.append((frame_index, timestamp, base64_image))
+                elif text and text != "[No text detected]":
+                    transcripts.append({
+                        "timestamp": round(timestamp, 2),
+                        "text": text,
+                        "frame_index": frame_index
+                    })
+            
+                # Update progress
+                progress = int(((idx + 1) / total_frames) * 100)
+                await update_progress(
+                    db.ocr_jobs, "video",
+                    {"id": job_id},
+                    {"$set": {"progress": progress, "transcripts": transcripts}},
+                    trace
+                )
+            
+                # Small delay to avoid rate limiting
+                if not reused:
+                    with trace.span("rate_limit_pause"):
+                        await asyncio.sleep(0.1)
+            
+            failed_frames = []
+            for frame_index, timestamp, base64_image in failed:
+                text = await ocr_frame(base64_image, api_key, "video", owner, trace)
+                if is_ocr_error(text):
+                    failed_frames.append({"frame_index": frame_index, "timestamp": round(timestamp, 2), "error": text})
+                elif text != "[No text detected]":
+                    transcripts.append({"timestamp": round(timestamp, 2), "text": text, "frame_index": frame_index})
+            if failed:
+                transcripts.sort(key=lambda t: t["frame_index"])
+                await update_progress(
+                    db.ocr_jobs, "video",
+                    {"id": job_id},
+                    {"$set": {"transcripts": transcripts, "failed_frames": failed_frames}},
+                    trace
+                )
         
         # Mark as completed
+        completed = {"status": "completed", "progress": 100, "trace": trace.summary()}
+        if TRANSCRIPT_STORAGE != "full":
+            completed.update(transcript_fields("transcripts", transcripts))
+        await db.ocr_jobs.update_one({"id": job_id}, {"$set": completed})
+        final_status = "completed"
+        await index_transcripts("job", job_id, transcripts)
+        
+    except (asyncio.CancelledError, JobCancelled):
+        # Transcripts persisted so far are kept
+        final_status = "cancelled"
         await db.ocr_jobs.update_one(
             {"id": job_id},
-            {"$set": {"status": "completed", "progress": 100}}
+            {"$set": {"status": "cancelled", "trace": trace.summary()}}
         )
-        
     except Exception as e:
         logging.error(f"Job {job_id} failed: {str(e)}")
         await db.ocr_jobs.update_one(
             {"id": job_id},
-            {"$set": {"status": "failed", "error": str(e)}}
+            {"$set": {"status": "failed", "error": str(e), "trace": trace.summary()}}
         )
     finally:
-        # Cleanup video file
-        try:
-            os.remove(video_path)
-        except:
-            pass
+        trace.finish()
+        JOBS_IN_PROGRESS.labels("video").dec()
+        JOBS_FINISHED.labels("video", final_status).inc()
+        JOB_DURATION_SECONDS.labels("video").observe(time.perf_counter() - job_start)
+        
+        # Release the video file (shared uploads are kept while referenced)
+        if file_id:
+            await release_video(file_id, video_path)
+        else:
+            try:
+                os.remove(video_path)
+            except:
+                pass
 
 # Routes
 @api_router.get("/")
@@ -262,35 +2116,101 @@ async def upload_video(file: UploadFile = File(...)):
     """Upload a video file for processing."""
     if not file.filename:
         raise HTTPException(status_code=400, detail="No file provided")
-    
+
     # Validate file type
-    allowed_extensions = ['.mp4', '.mov', '.avi', '.mkv', '.webm', '.m4v']
     file_ext = Path(file.filename).suffix.lower()
-    
-    if file_ext not in allowed_extensions:
+
+    if file_ext not in VIDEO_EXTENSIONS:
         raise HTTPException(
             status_code=400, 
-            detail=f"Invalid file type. Allowed: {', '.join(allowed_extensions)}"
+            detail=f"Invalid file type. Allowed: {', '.join(VIDEO_EXTENSIONS)}"
         )
-    
-    # Save file
+
+    # Stream to disk while hashing; identical content is stored once
     file_id = str(uuid.uuid4())
-    file_path = UPLOAD_DIR / f"{file_id}{file_ext}"
-    
+    part_path = UPLOAD_DIR / f"{file_id}.part"
+    hasher = hashlib.sha256()
+    size = 0
+
     try:
-        contents = await file.read()
-        with open(file_path, 'wb') as f:
-            f.write(contents)
+        with open(part_path, 'wb') as f:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                hasher.update(chunk)
+                f.write(chunk)
+                size += len(chunk)
+        sha256 = hasher.hexdigest()
         
-        return {
-            "file_id": file_id,
-            "filename": file.filename,
-            "path": str(file_path),
-            "size": len(contents)
-        }
+        blob = await db.video_blobs.find_one_and_update(
+            {"sha256": sha256},
+            {
+                "$inc": {"refcount": 1},
+                "$setOnInsert": {
+                    "path": str(UPLOAD_DIR / f"{sha256}{file_ext}"),
+                    "size": size,
+                    "created_at": datetime.now(timezone.utc).isoformat()
+                }
+            },
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        file_path = Path(blob["path"])
+        deduplicated = file_path.exists()
+        if deduplicated:
+            os.remove(part_path)
+        else:
+            os.replace(part_path, file_path)
+        
+        UPLOAD_REQUESTS.labels("upload_video").inc()
+        UPLOAD_BYTES.labels("upload_video").inc(size)
     except Exception as e:
+        try:
+            os.remove(part_path)
+        except OSError:
+            pass
         raise HTTPException(status_code=500, detail=f"Failed to save file: {str(e)}")
 
+    video_doc = {
+        "file_id": file_id,
+        "filename": file.filename,
+        "path": str(file_path),
+        "size": size,
+        "sha256": sha256,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "expires_at": job_expiry()
+    }
+
+    # Probe once so jobs can plan decoding without reopening the file;
+    # identical content reuses an earlier probe
+    probed = None
+    if deduplicated:
+        probed = await db.videos.find_one(
+            {"sha256": sha256, "fps": {"$exists": True}},
+            {"_id": 0, **{k: 1 for k in VIDEO_PROBE_FIELDS}}
+        )
+    try:
+        video_doc.update(probed or await asyncio.to_thread(probe_video, str(file_path)))
+    except Exception as e:
+        logging.warning(f"Could not probe video {file_id}: {str(e)}")
+        video_doc["probe_error"] = str(e)
+    await db.videos.insert_one(video_doc)
+
+    return {
+        "file_id": file_id,
+        "filename": file.filename,
+        "path": str(file_path),
+        "size": size,
+        "deduplicated": deduplicated,
+        "video": {k: video_doc.get(k) for k in ("container", "codec", "fps", "duration", "width", "height")}
+    }
+
+@api_router.get("/video/{file_id}")
+async def get_video_metadata(file_id: str):
+    """Probed metadata of an uploaded video."""
+    video = await db.videos.find_one({"file_id": file_id}, {"_id": 0, "path": 0, "expires_at": 0})
+    if not video:
+        raise HTTPException(status_code=404, detail="Video not found")
+    return video
+
 class BenchmarkResult(BaseModel):
     model_config = ConfigDict(extra="ignore")
     id: str
@@ -307,34 +2227,34 @@ def compare_texts(uncropped_texts: List[str], cropped_texts: List[str]) -> dict:
     # Combine all texts
     uncropped_combined = "\n".join(uncropped_texts)
     cropped_combined = "\n".join(cropped_texts)
-    
+
     # Calculate similarity ratio
     similarity = difflib.SequenceMatcher(None, cropped_combined, uncropped_combined).ratio()
-    
+
     # Find unique words in each
     uncropped_words = set(uncropped_combined.lower().split())
     cropped_words = set(cropped_combined.lower().split())
-    
+
     # Extra words in uncropped (potential artifacts)
     extra_in_uncropped = uncropped_words - cropped_words
     extra_in_cropped = cropped_words - uncropped_words
     common_words = uncropped_words & cropped_words
-    
+
     # Character counts
     uncropped_chars = len(uncropped_combined)
     cropped_chars = len(cropped_combined)
-    
+
     # Line-by-line diff
     uncropped_lines = uncropped_combined.split('\n')
     cropped_lines = cropped_combined.split('\n')
-    
+
     differ = difflib.Differ()
     diff_lines = list(differ.compare(cropped_lines, uncropped_lines))
-    
+
     # Count additions and removals
     additions = [line[2:] for line in diff_lines if line.startswith('+ ')]
     removals = [line[2:] for line in diff_lines if line.startswith('- ')]
-    
+
     return {
         "similarity_percentage": round(similarity * 100, 2),
         "uncropped_char_count": uncropped_chars,
@@ -351,10 +2271,82 @@ def compare_texts(uncropped_texts: List[str], cropped_texts: List[str]) -> dict:
         "lines_only_in_cropped": removals[:20],  # Lines present only in cropped
     }
 
-async def process_benchmark_job(job_id: str, video_path: str, interval: float, crop: dict):
-    """Background task to process video twice - uncropped and cropped - for comparison."""
-    import time
-    
+async def process_layout_benchmark(
+    job_id: str,
+    file_id: str,
+    video_path: str,
+    interval: float,
+    crop: dict,
+    decode: dict,
+    api_key: str,
+    trace: JobTrace,
+    owner: str = None
+):
+    """Benchmark from a single layout OCR pass: both transcripts come from the same stored boxes."""
+    async def report_progress(done: int, total: int):
+        await update_progress(
+            db.benchmark_jobs, "benchmark",
+            {"id": job_id},
+            {"$set": {"status": "processing", "total_frames": total, "progress": int(done / total * 100)}},
+            trace
+        )
+
+    ocr_start = time.time()
+    layout_frames, failed_frames = await layout_ocr_frames(
+        file_id, video_path, interval, decode, api_key, "benchmark", trace, report_progress, owner
+    )
+    uncropped_transcripts = layout_transcripts(layout_frames)
+    uncropped_total_time = round(time.time() - ocr_start, 2)
+
+    crop_start = time.time()
+    cropped_transcripts = layout_transcripts(layout_frames, crop)
+    cropped_total_time = round(time.time() - crop_start, 2)
+
+    with trace.span("compare"):
+        comparison = compare_texts(
+            [t["text"] for t in uncropped_transcripts],
+            [t["text"] for t in cropped_transcripts]
+        )
+    comparison["ocr_mode"] = "layout"
+    comparison["uncropped_processing_time"] = uncropped_total_time
+    comparison["cropped_processing_time"] = cropped_total_time
+    comparison["time_saved"] = round(uncropped_total_time - cropped_total_time, 2)
+    comparison["uncropped_frames_processed"] = len(layout_frames)
+    comparison["cropped_frames_processed"] = len(layout_frames)
+
+    await update_progress(
+        db.benchmark_jobs, "benchmark",
+        {"id": job_id},
+        {"$set": {
+            "status": "completed",
+            "progress": 100,
+            "total_frames": len(layout_frames) + len(failed_frames),
+            "failed_frames": [{"variant": "layout", **frame} for frame in failed_frames],
+            "uncropped_transcripts": uncropped_transcripts,
+            "cropped_transcripts": cropped_transcripts,
+            "comparison": comparison,
+            "uncropped_processing_time": uncropped_total_time,
+            "cropped_processing_time": cropped_total_time,
+            "trace": trace.summary()
+        }}
+    )
+
+async def process_benchmark_job(
+    job_id: str,
+    video_path: str,
+    interval: float,
+    crop: dict,
+    decode: dict = None,
+    ocr_mode: str = "text",
+    file_id: str = None,
+    owner: str = None
+):
+    """Background task to process video twice - uncropped and cropped - for comparison.
+
+    OCR slots are requested from the fair-share scheduler as `owner`
+    (the job itself when not given).
+    """
+    owner = owner or job_id
     api_key = os.environ.get('EMERGENT_LLM_KEY')
     if not api_key:
         await db.benchmark_jobs.update_one(
@@ -362,21 +2354,31 @@ async def process_benchmark_job(job_id: str, video_path: str, interval: float, c
             {"$set": {"status": "failed", "error": "EMERGENT_LLM_KEY not configured"}}
         )
         return
-    
+
+    job_start = time.perf_counter()
+    final_status = "failed"
+    trace = JobTrace("benchmark", job_id)
+    JOBS_IN_PROGRESS.labels("benchmark").inc()
     try:
+        check_cancelled()
         # Update status
         await db.benchmark_jobs.update_one(
             {"id": job_id},
             {"$set": {"status": "extracting_frames"}}
         )
         
+        if ocr_mode == "layout":
+            await process_layout_benchmark(job_id, file_id, video_path, interval, crop, decode, api_key, trace, owner)
+            final_status = "completed"
+            return
+        
         # Extract frames for both versions in parallel
-        import asyncio
+        cache_key = await video_content_id(file_id)
         uncropped_task = asyncio.create_task(
-            extract_frames_from_video(video_path, interval, None)
+            extract_frames_from_video(video_path, interval, None, decode, "benchmark", trace, cache_key)
         )
         cropped_task = asyncio.create_task(
-            extract_frames_from_video(video_path, interval, crop)
+            extract_frames_from_video(video_path, interval, crop, decode, "benchmark", trace, cache_key)
         )
         
         uncropped_frames, cropped_frames = await asyncio.gather(uncropped_task, cropped_task)
@@ -392,12 +2394,30 @@ async def process_benchmark_job(job_id: str, video_path: str, interval: float, c
         uncropped_transcripts = []
         cropped_transcripts = []
         processed = 0
+        failed_frames = []
+        
+        async def retry_failed(failed: list, transcripts: list, variant: str) -> List[dict]:
+            """Retry a pass's failed frames once the others are done; return the ones that failed again."""
+            still_failed = []
+            for frame_index, timestamp, base64_image in failed:
+                text = await ocr_frame(base64_image, api_key, "benchmark", owner, trace)
+                if is_ocr_error(text):
+                    still_failed.append({
+                        "variant": variant, "frame_index": frame_index, "timestamp": round(timestamp, 2), "error": text
+                    })
+                elif text and text != "[No text detected]":
+                    transcripts.append({"timestamp": round(timestamp, 2), "text": text, "frame_index": frame_index})
+            transcripts.sort(key=lambda t: t["frame_index"])
+            return still_failed
         
         # Process uncropped frames with timing
         uncropped_start_time = time.time()
+        failed = []
         for idx, (frame_index, timestamp, base64_image) in enumerate(uncropped_frames):
-            text = await ocr_frame(base64_image, api_key)
-            if text and text != "[No text detected]":
+            text = await ocr_frame(base64_image, api_key, "benchmark", owner, trace)
+            if is_ocr_error(text):
+                failed.append((frame_index, timestamp, base64_image))
+            elif text and text != "[No text detected]":
                 uncropped_transcripts.append({
                     "timestamp": round(timestamp, 2),
                     "text": text,
@@ -405,23 +2425,30 @@ async def process_benchmark_job(job_id: str, video_path: str, interval: float, c
                 })
             processed += 1
             progress = int((processed / total_frames) * 100)
-            await db.benchmark_jobs.update_one(
+            await update_progress(
+                db.benchmark_jobs, "benchmark",
                 {"id": job_id},
                 {"$set": {
                     "progress": progress, 
                     "uncropped_transcripts": uncropped_transcripts,
                     "uncropped_processing_time": round(time.time() - uncropped_start_time, 2)
-                }}
+                }},
+                trace
             )
-            await asyncio.sleep(0.1)
+            with trace.span("rate_limit_pause"):
+                await asyncio.sleep(0.1)
+        failed_frames += await retry_failed(failed, uncropped_transcripts, "uncropped")
         uncropped_end_time = time.time()
         uncropped_total_time = round(uncropped_end_time - uncropped_start_time, 2)
         
         # Process cropped frames with timing
         cropped_start_time = time.time()
+        failed = []
         for idx, (frame_index, timestamp, base64_image) in enumerate(cropped_frames):
-            text = await ocr_frame(base64_image, api_key)
-            if text and text != "[No text detected]":
+            text = await ocr_frame(base64_image, api_key, "benchmark", owner, trace)
+            if is_ocr_error(text):
+                failed.append((frame_index, timestamp, base64_image))
+            elif text and text != "[No text detected]":
                 cropped_transcripts.append({
                     "timestamp": round(timestamp, 2),
                     "text": text,
@@ -429,15 +2456,19 @@ async def process_benchmark_job(job_id: str, video_path: str, interval: float, c
                 })
             processed += 1
             progress = int((processed / total_frames) * 100)
-            await db.benchmark_jobs.update_one(
+            await update_progress(
+                db.benchmark_jobs, "benchmark",
                 {"id": job_id},
                 {"$set": {
                     "progress": progress, 
                     "cropped_transcripts": cropped_transcripts,
                     "cropped_processing_time": round(time.time() - cropped_start_time, 2)
-                }}
+                }},
+                trace
             )
-            await asyncio.sleep(0.1)
+            with trace.span("rate_limit_pause"):
+                await asyncio.sleep(0.1)
+        failed_frames += await retry_failed(failed, cropped_transcripts, "cropped")
         cropped_end_time = time.time()
         cropped_total_time = round(cropped_end_time - cropped_start_time, 2)
         
@@ -445,7 +2476,8 @@ async def process_benchmark_job(job_id: str, video_path: str, interval: float, c
         uncropped_texts = [t["text"] for t in uncropped_transcripts]
         cropped_texts = [t["text"] for t in cropped_transcripts]
         
-        comparison = compare_texts(uncropped_texts, cropped_texts)
+        with trace.span("compare"):
+            comparison = compare_texts(uncropped_texts, cropped_texts)
         
         # Add timing to comparison
         comparison["uncropped_processing_time"] = uncropped_total_time
@@ -455,29 +2487,45 @@ async def process_benchmark_job(job_id: str, video_path: str, interval: float, c
         comparison["cropped_frames_processed"] = len(cropped_frames)
         
         # Mark as completed
-        await db.benchmark_jobs.update_one(
+        await update_progress(
+            db.benchmark_jobs, "benchmark",
             {"id": job_id},
             {"$set": {
                 "status": "completed", 
                 "progress": 100,
                 "comparison": comparison,
+                "uncropped_transcripts": uncropped_transcripts,
+                "cropped_transcripts": cropped_transcripts,
+                "failed_frames": failed_frames,
                 "uncropped_processing_time": uncropped_total_time,
-                "cropped_processing_time": cropped_total_time
+                "cropped_processing_time": cropped_total_time,
+                "trace": trace.summary()
             }}
         )
+        final_status = "completed"
         
+    except (asyncio.CancelledError, JobCancelled):
+        final_status = "cancelled"
+        await db.benchmark_jobs.update_one(
+            {"id": job_id},
+            {"$set": {"status": "cancelled", "trace": trace.summary()}}
+        )
     except Exception as e:
         logging.error(f"Benchmark job {job_id} failed: {str(e)}")
         await db.benchmark_jobs.update_one(
             {"id": job_id},
-            {"$set": {"status": "failed", "error": str(e)}}
+            {"$set": {"status": "failed", "error": str(e), "trace": trace.summary()}}
         )
     finally:
+        trace.finish()
+        JOBS_IN_PROGRESS.labels("benchmark").dec()
+        JOBS_FINISHED.labels("benchmark", final_status).inc()
+        JOB_DURATION_SECONDS.labels("benchmark").observe(time.perf_counter() - job_start)
         # Don't delete video file - might be used for regular processing too
-        pass
 
 @api_router.post("/benchmark-video")
 async def benchmark_video(
+    request: Request,
     background_tasks: BackgroundTasks,
     file_id: str,
     filename: str,
@@ -485,35 +2533,38 @@ async def benchmark_video(
     crop_top: float = 0,
     crop_bottom: float = 0,
     crop_left: float = 0,
-    crop_right: float = 0
+    crop_right: float = 0,
+    decode_backend: str = "cv2",
+    decode_threads: int = 0,
+    skip_frames: Optional[str] = None,
+    ocr_mode: str = "text"
 ):
     """Start benchmark processing - runs OCR on both cropped and uncropped versions."""
     # Validate frame interval
     if frame_interval < 0.5 or frame_interval > 5.0:
         raise HTTPException(status_code=400, detail="Frame interval must be between 0.5 and 5.0 seconds")
-    
+
+    decode = build_decode_settings(decode_backend, decode_threads, skip_frames)
+    if ocr_mode not in OCR_MODES:
+        raise HTTPException(status_code=400, detail=f"OCR mode must be one of: {', '.join(OCR_MODES)}")
+
     # Validate crop values - need at least some crop for meaningful benchmark
     if crop_top == 0 and crop_bottom == 0 and crop_left == 0 and crop_right == 0:
         raise HTTPException(status_code=400, detail="Please set crop values to compare against uncropped version")
-    
+
     # Find the video file
-    video_path = None
-    for ext in ['.mp4', '.mov', '.avi', '.mkv', '.webm', '.m4v']:
-        potential_path = UPLOAD_DIR / f"{file_id}{ext}"
-        if potential_path.exists():
-            video_path = str(potential_path)
-            break
-    
-    if not video_path:
+    video = await find_video(file_id)
+    if not video:
         raise HTTPException(status_code=404, detail="Video file not found")
-    
+    video_path = video["path"]
+
     crop = {
         "top": crop_top,
         "bottom": crop_bottom,
         "left": crop_left,
         "right": crop_right
     }
-    
+
     # Create benchmark job
     job_id = str(uuid.uuid4())
     job_doc = {
@@ -522,32 +2573,86 @@ async def benchmark_video(
         "filename": filename,
         "frame_interval": frame_interval,
         "crop": crop,
+        "content_id": content_key(file_id, video),
+        "decode": decode,
+        "ocr_mode": ocr_mode,
         "status": "queued",
         "progress": 0,
         "total_frames": 0,
+        "estimated_frames": estimate_frame_count(video, frame_interval),
         "uncropped_transcripts": [],
         "cropped_transcripts": [],
         "comparison": None,
         "error": None,
-        "created_at": datetime.now(timezone.utc).isoformat()
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "expires_at": job_expiry()
     }
-    
-    await db.benchmark_jobs.insert_one(job_doc)
-    
+
+    client = client_host(request)
+    ticket = admission.admit(client)
+    try:
+        await db.benchmark_jobs.insert_one(job_doc)
+    except BaseException:
+        admission.discharge(client)
+        raise
+
     # Start background processing
-    background_tasks.add_task(process_benchmark_job, job_id, video_path, frame_interval, crop)
-    
-    return {"job_id": job_id, "status": "queued", "type": "benchmark"}
+    background_tasks.add_task(
+        run_admitted, client, 1, run_cancellable, "benchmark", job_id,
+        process_benchmark_job, job_id, video_path, frame_interval, crop, decode, ocr_mode, file_id, client
+    )
+
+    return {"job_id": job_id, "status": "queued", "type": "benchmark", **ticket}
 
 @api_router.get("/benchmark/{job_id}")
 async def get_benchmark_status(job_id: str):
     """Get the status and results of a benchmark job."""
-    job = await db.benchmark_jobs.find_one({"id": job_id}, {"_id": 0})
-    
+    job = await get_cached_job(db.benchmark_jobs, job_id)
+
     if not job:
         raise HTTPException(status_code=404, detail="Benchmark job not found")
-    
-    return job
+
+    return FastJSONResponse(job)
+
+@api_router.post("/benchmark/{job_id}/cancel")
+async def cancel_benchmark(job_id: str):
+    """Stop a queued or running benchmark job."""
+    return await request_cancel("benchmark", job_id, ACTIVE_JOB_STATUSES)
+
+@api_router.get("/crop-preview/{file_id}")
+async def crop_preview(
+    file_id: str,
+    frame_interval: Optional[float] = None,
+    crop_top: float = 0,
+    crop_bottom: float = 0,
+    crop_left: float = 0,
+    crop_right: float = 0
+):
+    """Transcripts for a crop computed from stored layout OCR, without decoding or new OCR calls."""
+    video = await db.videos.find_one({"file_id": file_id}, {"_id": 0, "sha256": 1})
+    frames = await db.frame_ocr.find(
+        {"content_id": content_key(file_id, video)}, {"_id": 0, "content_id": 0, "expires_at": 0}
+    ).sort("frame_index", 1).to_list(None)
+    if not frames:
+        raise HTTPException(status_code=404, detail="No layout OCR stored for this video; process it with ocr_mode=layout first")
+
+    if frame_interval:
+        # Keep the first stored frame at or after each sampling point
+        sampled, next_timestamp = [], 0.0
+        for doc in frames:
+            if doc["timestamp"] + 1e-6 >= next_timestamp:
+                sampled.append(doc)
+                while next_timestamp <= doc["timestamp"] + 1e-6:
+                    next_timestamp += frame_interval
+        frames = sampled
+
+    crop = {"top": crop_top, "bottom": crop_bottom, "left": crop_left, "right": crop_right}
+    return {
+        "file_id": file_id,
+        "crop": crop,
+        "frames": len(frames),
+        "transcripts": layout_transcripts(frames, crop)
+    }
 
 # ==================== MOBILE CAPTURE ENDPOINTS ====================
 
@@ -555,23 +2660,36 @@ async def get_benchmark_status(job_id: str):
 async def create_mobile_session(settings: MobileCaptureSettings = None):
     """Create a new mobile capture session with a pairing code."""
     session_id = str(uuid.uuid4())
-    session_code = ''.join([str(secrets.randbelow(10)) for _ in range(6)])
-    
-    session_doc = {
+
+    # Session codes are unique (indexed); retry on the rare collision
+    for _ in range(10):
+        session_code = ''.join([str(secrets.randbelow(10)) for _ in range(6)])
+        session_doc = {
+            "session_id": session_id,
+            "session_code": session_code,
+            "status": "waiting",
+            "settings": settings.model_dump() if settings else MobileCaptureSettings().model_dump(),
+            "frames": [],
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "expires_at": session_expiry(),
+            "device_info": None,
+            "processed_transcripts": [],
+            "processing_status": None
+        }
+        try:
+            await db.mobile_sessions.insert_one(session_doc)
+            break
+        except DuplicateKeyError:
+            continue
+    else:
+        raise HTTPException(status_code=503, detail="Could not allocate a session code, please retry")
+
+    mobile_sessions.set(session_code, {
         "session_id": session_id,
-        "session_code": session_code,
         "status": "waiting",
-        "settings": settings.model_dump() if settings else MobileCaptureSettings().model_dump(),
-        "frames": [],
-        "created_at": datetime.now(timezone.utc).isoformat(),
-        "device_info": None,
-        "processed_transcripts": [],
-        "processing_status": None
-    }
-    
-    await db.mobile_sessions.insert_one(session_doc)
-    mobile_sessions[session_code] = session_id
-    
+        "live_ocr": session_doc["settings"].get("live_ocr", False)
+    })
+
     return {
         "session_id": session_id,
         "session_code": session_code,
@@ -585,7 +2703,12 @@ async def get_mobile_session(session_id: str):
     session = await db.mobile_sessions.find_one({"session_id": session_id}, {"_id": 0})
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
-    return session
+    return FastJSONResponse(unpack_record(session, "processed_transcripts"))
+
+@api_router.post("/mobile/session/{session_id}/cancel")
+async def cancel_mobile_processing(session_id: str):
+    """Stop OCR processing of a mobile session; processing it again resumes where it stopped."""
+    return await request_cancel("session", session_id, ["processing"])
 
 @api_router.post("/mobile/connect/{session_code}")
 async def connect_mobile_device(session_code: str, device_info: dict = None):
@@ -593,18 +2716,18 @@ async def connect_mobile_device(session_code: str, device_info: dict = None):
     session = await db.mobile_sessions.find_one({"session_code": session_code})
     if not session:
         raise HTTPException(status_code=404, detail="Invalid session code")
-    
+
     # Extract device dimensions for smart scroll calculation
     screen_width = device_info.get('screenWidth', 0) if device_info else 0
     screen_height = device_info.get('screenHeight', 0) if device_info else 0
     pixel_ratio = device_info.get('pixelRatio', 1) if device_info else 1
-    
+
     # Update settings with detected device info
     current_settings = session.get('settings', {})
     current_settings['screen_width'] = screen_width
     current_settings['screen_height'] = screen_height
     current_settings['pixel_ratio'] = pixel_ratio
-    
+
     # Calculate smart defaults based on screen size
     if screen_height > 0:
         # Effective scroll = screen height * scroll_percent * (1 - overlap)
@@ -612,7 +2735,7 @@ async def connect_mobile_device(session_code: str, device_info: dict = None):
         overlap_percent = current_settings.get('overlap_margin_percent', 10) / 100
         effective_scroll = int(screen_height * scroll_percent * (1 - overlap_percent))
         current_settings['effective_scroll_px'] = effective_scroll
-    
+
     await db.mobile_sessions.update_one(
         {"session_code": session_code},
         {"$set": {
@@ -622,7 +2745,8 @@ async def connect_mobile_device(session_code: str, device_info: dict = None):
             "connected_at": datetime.now(timezone.utc).isoformat()
         }}
     )
-    
+    cache_session_status(session_code, session["session_id"], "connected")
+
     return {
         "session_id": session["session_id"],
         "status": "connected",
@@ -637,10 +2761,10 @@ async def connect_mobile_device(session_code: str, device_info: dict = None):
 @api_router.post("/mobile/upload-frame/{session_code}")
 async def upload_mobile_frame(session_code: str, body: dict):
     """Upload a single frame from mobile device as JSON with base64 image."""
-    session = await db.mobile_sessions.find_one({"session_code": session_code})
+    session = await get_session_meta(session_code)
     if not session:
         raise HTTPException(status_code=404, detail="Invalid session code")
-    
+
     image_base64 = body.get("image_base64", "")
     frame_data = {
         "frame_index": body.get("frame_index", 0),
@@ -649,24 +2773,34 @@ async def upload_mobile_frame(session_code: str, body: dict):
         "image_base64": image_base64,
         "size": len(image_base64)
     }
-    
-    await db.mobile_sessions.update_one(
+    UPLOAD_REQUESTS.labels("mobile_upload_frame").inc()
+    UPLOAD_BYTES.labels("mobile_upload_frame").inc(len(image_base64))
+
+    result = await db.mobile_sessions.update_one(
         {"session_code": session_code},
         {
             "$push": {"frames": frame_data},
-            "$set": {"status": "capturing"}
+            "$set": {"status": "capturing", **frame_hash_updates([body])}
         }
     )
-    
+    if result.matched_count == 0:
+        # Cached meta outlived the session (expired or deleted)
+        mobile_sessions.invalidate(session_code)
+        raise HTTPException(status_code=404, detail="Invalid session code")
+    if session["status"] != "capturing":
+        cache_session_status(session_code, session["session_id"], "capturing")
+    if session.get("live_ocr"):
+        submit_live_frames(session["session_id"], [frame_data])
+
     return {"status": "uploaded", "frame_index": frame_data["frame_index"]}
 
 @api_router.post("/mobile/upload-batch/{session_code}")
 async def upload_mobile_batch(session_code: str, frames: List[dict]):
     """Upload multiple frames at once from mobile device."""
-    session = await db.mobile_sessions.find_one({"session_code": session_code})
+    session = await get_session_meta(session_code)
     if not session:
         raise HTTPException(status_code=404, detail="Invalid session code")
-    
+
     # Process each frame
     processed_frames = []
     for frame in frames:
@@ -678,82 +2812,324 @@ async def upload_mobile_batch(session_code: str, frames: List[dict]):
             "size": len(frame.get("image_base64", ""))
         }
         processed_frames.append(frame_data)
-    
-    await db.mobile_sessions.update_one(
+
+    UPLOAD_REQUESTS.labels("mobile_upload_batch").inc()
+    UPLOAD_BYTES.labels("mobile_upload_batch").inc(sum(f["size"] for f in processed_frames))
+
+    result = await db.mobile_sessions.update_one(
         {"session_code": session_code},
         {
             "$push": {"frames": {"$each": processed_frames}},
-            "$set": {"status": "capturing"}
+            "$set": {"status": "capturing", **frame_hash_updates(frames)}
         }
     )
-    
+    if result.matched_count == 0:
+        # Cached meta outlived the session (expired or deleted)
+        mobile_sessions.invalidate(session_code)
+        raise HTTPException(status_code=404, detail="Invalid session code")
+    if session["status"] != "capturing":
+        cache_session_status(session_code, session["session_id"], "capturing")
+    if session.get("live_ocr"):
+        submit_live_frames(session["session_id"], processed_frames)
+
     return {"status": "uploaded", "frames_count": len(processed_frames)}
 
+# ==================== FRAME PRE-CHECK ====================
+# Before uploading a frame the device sends its perceptual hash: a 256-bit
+# difference hash (16 rows of 17 grayscale samples, one bit per horizontally
+# adjacent pair, set when the left sample is brighter), as 64 hex digits.
+# The server answers which frames it needs. A frame is skipped when that
+# frame_index was already uploaded (a retry), or when its hash is within
+# PHASH_MAX_DISTANCE bits of the last frame before it that was needed (the
+# screen did not change). Hashes of needed frames are kept per session in
+# `frame_hashes`, so consecutive checks compare against each other while
+# uploads are still in flight.
+
+PHASH_MAX_DISTANCE = int(os.environ.get('PHASH_MAX_DISTANCE', 3))
+PHASH_HEX_DIGITS = 64
+
+def parse_phash(value) -> Optional[int]:
+    """The hash as an int, or None if it is not PHASH_HEX_DIGITS hex digits."""
+    if not isinstance(value, str) or len(value) != PHASH_HEX_DIGITS:
+        return None
+    try:
+        return int(value, 16)
+    except ValueError:
+        return None
+
+def frame_hash_updates(frames: List[dict]) -> dict:
+    """`$set` fields recording the hashes sent along with uploaded frames."""
+    return {
+        f"frame_hashes.{int(frame.get('frame_index', 0))}": frame["phash"].lower()
+        for frame in frames if parse_phash(frame.get("phash")) is not None
+    }
+
+def select_frames(hashes: dict, uploaded: set, known: dict) -> tuple:
+    """Split checked frames into (needed indices, skipped entries); records needed hashes in `known`."""
+    needed, skipped = [], []
+    for frame_index in sorted(hashes):
+        value = hashes[frame_index]
+        if frame_index in uploaded:
+            skipped.append({"frame_index": frame_index, "reason": "uploaded"})
+            continue
+        previous = max((index for index in known if index < frame_index), default=None)
+        if previous is not None and (known[previous] ^ value).bit_count() <= PHASH_MAX_DISTANCE:
+            skipped.append({"frame_index": frame_index, "reason": "unchanged", "duplicate_of": previous})
+            continue
+        needed.append(frame_index)
+        known[frame_index] = value
+    return needed, skipped
+
+class FrameCheck(BaseModel):
+    frame_index: int
+    phash: str
+
+class FrameCheckRequest(BaseModel):
+    frames: List[FrameCheck]
+
+@api_router.post("/mobile/frame-check/{session_code}")
+async def check_mobile_frames(session_code: str, body: FrameCheckRequest):
+    """Tell the device which captured frames to upload, from their perceptual hashes."""
+    if not await get_session_meta(session_code):
+        raise HTTPException(status_code=404, detail="Invalid session code")
+    hashes = {}
+    for frame in body.frames:
+        value = parse_phash(frame.phash)
+        if value is None:
+            raise HTTPException(
+                status_code=400, detail=f"phash must be {PHASH_HEX_DIGITS} hex digits (frame {frame.frame_index})"
+            )
+        hashes[frame.frame_index] = value
+
+    session = await db.mobile_sessions.find_one(
+        {"session_code": session_code}, {"_id": 0, "frame_hashes": 1, "frames.frame_index": 1}
+    )
+    if session is None:
+        # Cached meta outlived the session (expired or deleted)
+        mobile_sessions.invalidate(session_code)
+        raise HTTPException(status_code=404, detail="Invalid session code")
+    uploaded = {frame.get("frame_index") for frame in session.get("frames", [])}
+    known = {int(index): int(value, 16) for index, value in session.get("frame_hashes", {}).items()}
+    needed, skipped = select_frames(hashes, uploaded, known)
+
+    UPLOAD_REQUESTS.labels("mobile_frame_check").inc()
+    for entry in skipped:
+        FRAMES_SKIPPED.labels(entry["reason"]).inc()
+    update = {}
+    if needed:
+        update["$set"] = {f"frame_hashes.{index}": f"{hashes[index]:0{PHASH_HEX_DIGITS}x}" for index in needed}
+    unchanged = sum(1 for entry in skipped if entry["reason"] == "unchanged")
+    if unchanged:
+        update["$inc"] = {"frames_skipped": unchanged}
+    if update:
+        await db.mobile_sessions.update_one({"session_code": session_code}, update)
+
+    return {"needed": needed, "skipped": skipped}
+
 @api_router.post("/mobile/complete-capture/{session_code}")
 async def complete_mobile_capture(session_code: str):
     """Mark capture as complete. Does NOT auto-process — user can review, crop, and benchmark first."""
     session = await db.mobile_sessions.find_one({"session_code": session_code})
     if not session:
         raise HTTPException(status_code=404, detail="Invalid session code")
-    
+
     await db.mobile_sessions.update_one(
         {"session_code": session_code},
         {"$set": {"status": "captured"}}
     )
-    
+    cache_session_status(session_code, session["session_id"], "captured")
+
     return {
         "status": "captured",
         "session_id": session["session_id"],
         "frames_count": len(session.get("frames", []))
     }
 
+# ==================== LIVE MOBILE OCR ====================
+# Sessions created with settings.live_ocr OCR each frame as soon as it is
+# uploaded. Results are stored per image hash in `ocr_results`, which
+# process_mobile_capture reuses so processing after capture only covers
+# frames that have not been seen yet. Workers live in the process that
+# received the upload; results from every worker land in the same document.
+
+LIVE_OCR_IDLE_TIMEOUT = float(os.environ.get('LIVE_OCR_IDLE_TIMEOUT', 600))
+
+def frame_hash(image_base64: str) -> str:
+    return hashlib.sha1(image_base64.encode()).hexdigest()
+
+class LiveOcrWorker:
+    """OCRs the frames of one mobile session as they arrive, lowest frame_index first."""
+
+    def __init__(self, session_id: str, api_key: str):
+        self.session_id = session_id
+        self.api_key = api_key
+        self.queue = asyncio.PriorityQueue()
+        self.seen = set()
+        self._seq = 0
+        self.task = asyncio.create_task(self._run())
+
+    def submit(self, frame: dict):
+        image = frame.get("image_base64") or ""
+        image_hash = frame_hash(image)
+        if not image or image_hash in self.seen:
+            return
+        self.seen.add(image_hash)
+        self._seq += 1
+        self.queue.put_nowait((frame.get("frame_index", 0), self._seq, image_hash, image))
+
+    async def _run(self):
+        while True:
+            try:
+                frame_index, _, image_hash, image = await asyncio.wait_for(
+                    self.queue.get(), LIVE_OCR_IDLE_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                if live_ocr_workers.get(self.session_id) is self:
+                    del live_ocr_workers[self.session_id]
+                return
+            
+            try:
+                text = await ocr_frame(image, self.api_key, "mobile", self.session_id)
+                if not is_ocr_error(text):
+                    await update_progress(
+                        db.mobile_sessions, "mobile",
+                        {"session_id": self.session_id},
+                        {"$push": {"ocr_results": {
+                            "frame_index": frame_index,
+                            "image_hash": image_hash,
+                            "text": text
+                        }}}
+                    )
+            except Exception as e:
+                logging.error(f"Live OCR for session {self.session_id} failed: {str(e)}")
+            finally:
+                self.queue.task_done()
+            
+            await asyncio.sleep(0.1)
+
+    async def drain(self):
+        """Wait for queued frames, then stop the worker."""
+        await self.queue.join()
+        self.task.cancel()
+
+live_ocr_workers = {}
+
+def submit_live_frames(session_id: str, frames: List[dict]):
+    api_key = os.environ.get('EMERGENT_LLM_KEY')
+    if not api_key:
+        return
+    worker = live_ocr_workers.get(session_id)
+    if worker is None or worker.task.done():
+        worker = live_ocr_workers[session_id] = LiveOcrWorker(session_id, api_key)
+    for frame in frames:
+        worker.submit(frame)
+
 @api_router.post("/mobile/process/{session_code}")
-async def process_mobile_session(session_code: str, background_tasks: BackgroundTasks):
+async def process_mobile_session(
+    session_code: str, request: Request, background_tasks: BackgroundTasks
+):
     """Manually trigger OCR processing for a captured mobile session."""
     session = await db.mobile_sessions.find_one({"session_code": session_code})
     if not session:
         raise HTTPException(status_code=404, detail="Invalid session code")
-    
-    await db.mobile_sessions.update_one(
-        {"session_code": session_code},
-        {"$set": {"status": "processing", "processing_status": "queued"}}
+
+    client = client_host(request)
+    ticket = admission.admit(client)
+    try:
+        await db.mobile_sessions.update_one(
+            {"session_code": session_code},
+            {"$set": {
+                "status": "processing", "processing_status": "queued", "cancel_requested": False,
+                "processed_transcripts_packed": None
+            }}
+        )
+    except BaseException:
+        admission.discharge(client)
+        raise
+    cache_session_status(session_code, session["session_id"], "processing")
+
+    background_tasks.add_task(
+        run_admitted, client, 1, run_cancellable, "session", session["session_id"],
+        process_mobile_capture, session["session_id"], client
     )
-    
-    background_tasks.add_task(process_mobile_capture, session["session_id"])
-    
-    return {"status": "processing", "session_id": session["session_id"], "frames_count": len(session.get("frames", []))}
 
-async def process_mobile_capture(session_id: str):
-    """Process all frames from a mobile capture session."""
+    return {
+        "status": "processing",
+        "session_id": session["session_id"],
+        "frames_count": len(session.get("frames", [])),
+        **ticket
+    }
+
+async def process_mobile_capture(session_id: str, owner: str = None):
+    """Process all frames from a mobile capture session.
+
+    OCR slots are requested from the fair-share scheduler as `owner`
+    (the session itself when not given).
+    """
+    owner = owner or session_id
+    session = await db.mobile_sessions.find_one({"session_id": session_id})
+    if not session:
+        return
+
     api_key = os.environ.get('EMERGENT_LLM_KEY')
     if not api_key:
         await db.mobile_sessions.update_one(
             {"session_id": session_id},
             {"$set": {"status": "failed", "processing_status": "error", "error": "API key not configured"}}
         )
+        mobile_sessions.invalidate(session["session_code"])
         return
-    
-    session = await db.mobile_sessions.find_one({"session_id": session_id})
-    if not session:
-        return
-    
+
     frames = session.get("frames", [])
     if not frames:
         await db.mobile_sessions.update_one(
             {"session_id": session_id},
             {"$set": {"status": "completed", "processing_status": "no_frames"}}
         )
+        mobile_sessions.invalidate(session["session_code"])
         return
-    
+
+    job_start = time.perf_counter()
+    final_status = "failed"
+    trace = JobTrace("mobile", session_id)
+    JOBS_IN_PROGRESS.labels("mobile").inc()
+    worker = live_ocr_workers.pop(session_id, None)
     try:
+        # Let live OCR finish what it already has queued so no frame is OCR'd twice
+        if worker is not None:
+            with trace.span("live_ocr_drain"):
+                await worker.drain()
+            drained = await db.mobile_sessions.find_one({"session_id": session_id}, {"_id": 0, "ocr_results": 1})
+            session["ocr_results"] = (drained or {}).get("ocr_results", [])
+        check_cancelled()
         transcripts = []
+        failed_frames = []
         total = len(frames)
         
+        # OCR results from live mode or an earlier run, keyed by image hash
+        cached_results = {r["image_hash"]: r["text"] for r in session.get("ocr_results", [])}
+        
         for idx, frame in enumerate(frames):
-            # OCR the frame
-            text = await ocr_frame(frame.get("image_base64", ""), api_key)
+            image = frame.get("image_base64") or ""
+            image_hash = frame_hash(image)
+            text = cached_results.get(image_hash)
+            new_result = None
             
-            if text and text != "[No text detected]":
+            if text is None:
+                # OCR the frame
+                text = await ocr_frame(image, api_key, "mobile", owner, trace)
+                if not is_ocr_error(text):
+                    cached_results[image_hash] = text
+                    new_result = {
+                        "frame_index": frame.get("frame_index", idx),
+                        "image_hash": image_hash,
+                        "text": text
+                    }
+            
+            if is_ocr_error(text):
+                # Not cached, so processing the session again retries it
+                failed_frames.append({"frame_index": frame.get("frame_index", idx), "error": text})
+            elif text and text != "[No text detected]":
                 transcripts.append({
                     "frame_index": frame.get("frame_index", idx),
                     "scroll_position": frame.get("scroll_position", 0),
@@ -763,44 +3139,68 @@ async def process_mobile_capture(session_id: str):
             
             # Update progress
             progress = int(((idx + 1) / total) * 100)
-            await db.mobile_sessions.update_one(
-                {"session_id": session_id},
-                {"$set": {
-                    "processing_status": f"processing_{progress}",
-                    "processed_transcripts": transcripts
-                }}
-            )
+            update = {"$set": {
+                "processing_status": f"processing_{progress}",
+                "processed_transcripts": transcripts
+            }}
+            if new_result is not None:
+                update["$push"] = {"ocr_results": new_result}
+            await update_progress(db.mobile_sessions, "mobile", {"session_id": session_id}, update, trace)
             
-            await asyncio.sleep(0.1)
+            if new_result is not None:
+                with trace.span("rate_limit_pause"):
+                    await asyncio.sleep(0.1)
         
         # Deduplicate similar consecutive transcripts
-        deduplicated = deduplicate_transcripts(transcripts)
+        with trace.span("dedup"):
+            deduplicated = deduplicate_transcripts(transcripts)
         
-        await db.mobile_sessions.update_one(
+        await update_progress(
+            db.mobile_sessions, "mobile",
             {"session_id": session_id},
             {"$set": {
                 "status": "completed",
                 "processing_status": "done",
-                "processed_transcripts": deduplicated,
+                **transcript_fields("processed_transcripts", deduplicated),
                 "raw_transcript_count": len(transcripts),
-                "deduplicated_count": len(deduplicated)
+                "deduplicated_count": len(deduplicated),
+                "failed_frames": failed_frames,
+                "trace": trace.summary()
             }}
         )
+        final_status = "completed"
+        await index_transcripts("session", session_id, deduplicated)
         
+    except (asyncio.CancelledError, JobCancelled):
+        # Frames OCR'd so far stay in ocr_results, so processing again resumes
+        final_status = "cancelled"
+        await db.mobile_sessions.update_one(
+            {"session_id": session_id},
+            {"$set": {"status": "cancelled", "processing_status": "cancelled", "trace": trace.summary()}}
+        )
     except Exception as e:
         logging.error(f"Mobile capture processing failed: {str(e)}")
         await db.mobile_sessions.update_one(
             {"session_id": session_id},
-            {"$set": {"status": "failed", "processing_status": "error", "error": str(e)}}
+            {"$set": {"status": "failed", "processing_status": "error", "error": str(e), "trace": trace.summary()}}
         )
+    finally:
+        # A drain interrupted by cancellation or an error must not leave the worker OCR'ing
+        if worker is not None:
+            worker.task.cancel()
+        mobile_sessions.invalidate(session["session_code"])
+        trace.finish()
+        JOBS_IN_PROGRESS.labels("mobile").dec()
+        JOBS_FINISHED.labels("mobile", final_status).inc()
+        JOB_DURATION_SECONDS.labels("mobile").observe(time.perf_counter() - job_start)
 
 def deduplicate_transcripts(transcripts: List[dict], similarity_threshold: float = 0.85) -> List[dict]:
     """Remove near-duplicate consecutive transcripts based on text similarity."""
     if not transcripts:
         return []
-    
+
     deduplicated = [transcripts[0]]
-    
+
     for current in transcripts[1:]:
         last = deduplicated[-1]
         similarity = difflib.SequenceMatcher(None, last["text"], current["text"]).ratio()
@@ -811,7 +3211,7 @@ def deduplicate_transcripts(transcripts: List[dict], similarity_threshold: float
             # Keep the longer one if very similar
             if len(current["text"]) > len(last["text"]):
                 deduplicated[-1] = current
-    
+
     return deduplicated
 
 @api_router.put("/mobile/settings/{session_code}")
@@ -821,10 +3221,11 @@ async def update_mobile_settings(session_code: str, settings: MobileCaptureSetti
         {"session_code": session_code},
         {"$set": {"settings": settings.model_dump()}}
     )
-    
+
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Session not found")
-    
+    mobile_sessions.invalidate(session_code)
+
     return {"status": "updated", "settings": settings.model_dump()}
 
 @api_router.get("/mobile/calculate-scroll")
@@ -837,7 +3238,7 @@ async def calculate_scroll_settings(
     effective_scroll = screen_height * (1 - overlap_percent / 100)
     total_scrolls = max(1, int((content_height - screen_height) / effective_scroll) + 1)
     total_captures = total_scrolls + 1  # Include initial capture
-    
+
     return {
         "screen_height": screen_height,
         "content_height": content_height,
@@ -854,12 +3255,12 @@ async def get_tasker_profile(session_code: str):
     session = await db.mobile_sessions.find_one({"session_code": session_code})
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
-    
+
     settings = session.get("settings", {})
     device_info = session.get("device_info", {})
-    
+
     scroll_px = int(device_info.get("screenHeight", 800) * settings.get("scroll_distance_percent", 80) / 100)
-    
+
     tasker_xml = f'''<?xml version="1.0" encoding="utf-8"?>
 <TaskerData sr="" dession="com.joaomgcd.tasker" sv="4">
   <Task sr="task1">
@@ -892,7 +3293,7 @@ async def get_tasker_profile(session_code: str):
     </Action>
   </Task>
 </TaskerData>'''
-    
+
     return JSONResponse(
         content={"xml": tasker_xml, "filename": f"framereader_{session_code}.tsk.xml"},
         headers={"Content-Type": "application/json"}
@@ -900,38 +3301,130 @@ async def get_tasker_profile(session_code: str):
 
 @api_router.get("/mobile/automation/{session_code}/adb-script")
 async def get_adb_script(session_code: str):
-    """Generate an ADB shell script pre-configured with session settings."""
+    """Generate an ADB shell script pre-configured with session settings.
+
+    The script queues screenshots locally and uploads them in batches from a
+    background uploader (PARALLEL requests at a time), converting to JPEG or
+    WebP first when a converter is installed.
+    """
     session = await db.mobile_sessions.find_one({"session_code": session_code})
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
-    
+
     settings = session.get("settings", {})
     device_info = session.get("device_info", {})
-    
+
     screen_height = device_info.get("screenHeight", 2400)
+    screen_width = device_info.get("screenWidth", 1080)
     scroll_percent = settings.get("scroll_distance_percent", 80)
     scroll_px = int(screen_height * scroll_percent / 100)
     interval = settings.get("capture_interval_ms", 1500) / 1000
     total = settings.get("total_captures", 10)
-    
+
     script = f'''#!/bin/bash
 # FrameReader Auto-Capture Script
 # Session: {session_code}
 # Generated for screen height: {screen_height}px
+#
+# Screenshots are queued locally and uploaded by a background uploader, so
+# the capture cadence does not depend on network speed. Frames are converted
+# to JPEG (or WebP) before upload when ImageMagick, cwebp or ffmpeg is
+# installed, and sent to the batch endpoint several at a time.
+#
+# Override any setting from the environment, e.g. PARALLEL=4 FORMAT=webp ./script.sh
 
-API_URL="https://frame-extract-lab.preview.emergentagent.com/api"
+API_URL="${{API_URL:-https://frame-extract-lab.preview.emergentagent.com/api}}"
 SESSION="{session_code}"
+SCREEN_HEIGHT={screen_height}
 SCROLL_PX={scroll_px}
 INTERVAL={interval}
 TOTAL={total}
+FORMAT="${{FORMAT:-jpg}}"      # jpg, webp or png
+QUALITY="${{QUALITY:-80}}"
+PARALLEL="${{PARALLEL:-3}}"    # concurrent upload requests
+BATCH_SIZE="${{BATCH_SIZE:-5}}"  # max frames per upload request
+
+WORK_DIR=$(mktemp -d /tmp/framereader_XXXXXX)
+mkdir -p "$WORK_DIR/capture" "$WORK_DIR/queue" "$WORK_DIR/failed" "$WORK_DIR/time"
+
+restore() {{
+  adb shell settings put global window_animation_scale 1
+  adb shell settings put global transition_animation_scale 1
+  adb shell settings put global animator_duration_scale 1
+  rm -rf "$WORK_DIR"
+}}
+trap restore EXIT
 
-# Create temp directory
-mkdir -p /tmp/framereader_captures
+# Pick an image converter; PNG is uploaded unchanged if none is installed
+if [ "$FORMAT" = "webp" ] && command -v cwebp >/dev/null; then
+  convert_frame() {{ cwebp -quiet -q "$QUALITY" "$1" -o "$2"; }}
+elif command -v magick >/dev/null; then
+  convert_frame() {{ magick "$1" -quality "$QUALITY" "$2"; }}
+elif command -v convert >/dev/null; then
+  convert_frame() {{ convert "$1" -quality "$QUALITY" "$2"; }}
+elif command -v ffmpeg >/dev/null; then
+  convert_frame() {{ ffmpeg -loglevel error -y -i "$1" -q:v $(( (100 - QUALITY) / 3 + 2 )) "$2"; }}
+else
+  echo "No image converter found (ImageMagick, cwebp or ffmpeg); uploading PNG"
+  FORMAT="png"
+fi
+
+# Upload queued frames (files named <index>.png) in one batch request
+upload_batch() {{
+  local batch_dir=$1 payload="$1/payload.json" first=1 frame index image
+  printf '[' > "$payload"
+  for frame in "$batch_dir"/*.png; do
+    index=$(basename "$frame" .png)
+    image="$frame"
+    if [ "$FORMAT" != "png" ] && convert_frame "$frame" "$batch_dir/$index.$FORMAT" 2>/dev/null; then
+      image="$batch_dir/$index.$FORMAT"
+    fi
+    [ $first -eq 1 ] || printf ',' >> "$payload"
+    first=0
+    printf '{{"frame_index":%d,"scroll_position":%d,"timestamp":"%s","image_base64":"' \\
+      "$index" $(( (index - 1) * SCROLL_PX )) "$(cat "$WORK_DIR/time/$index")" >> "$payload"
+    base64 < "$image" | tr -d '\\n' >> "$payload"
+    printf '"}}' >> "$payload"
+  done
+  printf ']' >> "$payload"
+
+  for attempt in 1 2 3; do
+    if curl -sf -o /dev/null -X POST "$API_URL/mobile/upload-batch/$SESSION" \\
+        -H "Content-Type: application/json" --data-binary "@$payload"; then
+      echo "Uploaded frames $(ls "$batch_dir" | grep '\\.png$' | sed 's/\\.png$//' | sort -n | tr '\\n' ' ')"
+      rm -rf "$batch_dir"
+      return
+    fi
+    sleep $attempt
+  done
+  echo "Upload failed for batch $(basename "$batch_dir"), will retry after capture"
+  mv "$batch_dir"/*.png "$WORK_DIR/failed/"
+  rm -rf "$batch_dir"
+}}
+
+# Background uploader: whenever a slot is free, send what is queued (up to BATCH_SIZE)
+uploader() {{
+  local batch=0 frames
+  while true; do
+    frames=$(ls "$WORK_DIR/queue" | sort -n | head -n "$BATCH_SIZE")
+    if [ -z "$frames" ]; then
+      [ -f "$WORK_DIR/capture_done" ] && break
+      sleep 0.2
+      continue
+    fi
+    while [ "$(jobs -rp | wc -l)" -ge "$PARALLEL" ]; do sleep 0.1; done
+    batch=$((batch + 1))
+    mkdir "$WORK_DIR/batch_$batch"
+    for frame in $frames; do mv "$WORK_DIR/queue/$frame" "$WORK_DIR/batch_$batch/"; done
+    upload_batch "$WORK_DIR/batch_$batch" &
+  done
+  wait
+}}
 
 # Connect to session
-curl -X POST "$API_URL/mobile/connect/$SESSION" \\
+curl -s -o /dev/null -X POST "$API_URL/mobile/connect/$SESSION" \\
   -H "Content-Type: application/json" \\
-  -d '{{"userAgent":"ADB-Script","screenHeight":{screen_height},"screenWidth":{device_info.get("screenWidth", 1080)}}}'
+  -d '{{"userAgent":"ADB-Script","screenHeight":{screen_height},"screenWidth":{screen_width}}}'
 
 echo "Starting capture in 3 seconds..."
 sleep 3
@@ -941,41 +3434,43 @@ adb shell settings put global window_animation_scale 0
 adb shell settings put global transition_animation_scale 0
 adb shell settings put global animator_duration_scale 0
 
-# Capture loop
+uploader &
+UPLOADER_PID=$!
+
+# Capture loop: only screenshots and scrolling, uploads happen in the background
 for i in $(seq 1 $TOTAL); do
-  echo "Capturing frame $i/$TOTAL..."
-  
-  # Take screenshot
-  adb exec-out screencap -p > /tmp/framereader_captures/frame_$i.png
-  
-  # Convert to base64 and upload
-  BASE64=$(base64 -w 0 /tmp/framereader_captures/frame_$i.png)
-  
-  curl -X POST "$API_URL/mobile/upload-batch/$SESSION" \\
-    -H "Content-Type: application/json" \\
-    -d "[{{\\"frame_index\\":$i,\\"scroll_position\\":$((i * SCROLL_PX)),\\"image_base64\\":\\"$BASE64\\"}}]"
-  
-  # Scroll down
-  adb shell input swipe 540 $((screen_height - 200)) 540 $((screen_height - 200 - SCROLL_PX)) 300
-  
-  sleep $INTERVAL
+  echo "Capturing frame $i/$TOTAL ($(ls "$WORK_DIR/queue" | wc -l) queued)"
+  adb exec-out screencap -p > "$WORK_DIR/capture/$i.png"
+  date -u +%Y-%m-%dT%H:%M:%SZ > "$WORK_DIR/time/$i"
+  mv "$WORK_DIR/capture/$i.png" "$WORK_DIR/queue/$i.png"
+
+  if [ $i -lt $TOTAL ]; then
+    adb shell input swipe 540 $((SCREEN_HEIGHT - 200)) 540 $((SCREEN_HEIGHT - 200 - SCROLL_PX)) 300
+    sleep $INTERVAL
+  fi
 done
 
-# Complete capture
-curl -X POST "$API_URL/mobile/complete-capture/$SESSION" \\
-  -H "Content-Type: application/json" -d '{{}}'
+echo "Capture finished, waiting for uploads..."
+touch "$WORK_DIR/capture_done"
+wait $UPLOADER_PID
 
-# Re-enable animations
-adb shell settings put global window_animation_scale 1
-adb shell settings put global transition_animation_scale 1
-adb shell settings put global animator_duration_scale 1
+# One more pass for batches that failed during capture
+if [ -n "$(ls "$WORK_DIR/failed")" ]; then
+  mv "$WORK_DIR/failed"/*.png "$WORK_DIR/queue/"
+  uploader
+fi
+FAILED=$(ls "$WORK_DIR/failed" | wc -l)
+if [ "$FAILED" -gt 0 ]; then
+  echo "$FAILED frames could not be uploaded"
+fi
 
-# Cleanup
-rm -rf /tmp/framereader_captures
+# Complete capture
+curl -s -o /dev/null -X POST "$API_URL/mobile/complete-capture/$SESSION" \\
+  -H "Content-Type: application/json" -d '{{}}'
 
 echo "Capture complete! Check web app for results."
 '''
-    
+
     return JSONResponse(
         content={"script": script, "filename": f"framereader_{session_code}.sh"},
         headers={"Content-Type": "application/json"}
@@ -1005,8 +3500,116 @@ class CropSettings(BaseModel):
     left: float = 0
     right: float = 0
 
+def check_video_settings(frame_interval: float, crops: List[float], ocr_mode: str):
+    """Validate the settings shared by single and batch video jobs."""
+    if frame_interval < 0.5 or frame_interval > 5.0:
+        raise HTTPException(status_code=400, detail="Frame interval must be between 0.5 and 5.0 seconds")
+    if ocr_mode not in OCR_MODES:
+        raise HTTPException(status_code=400, detail=f"OCR mode must be one of: {', '.join(OCR_MODES)}")
+    for val in crops:
+        if val < 0 or val > 45:
+            raise HTTPException(status_code=400, detail="Crop values must be between 0 and 45%")
+
+def reusable_job_query(content_id: str, frame_interval: float, crop: dict, decode: dict, ocr_mode: str) -> dict:
+    """Match completed jobs whose transcripts can answer a request with these settings."""
+    return {
+        "content_id": content_id,
+        "status": "completed",
+        "frame_interval": frame_interval,
+        "crop": crop,
+        "ocr_mode": ocr_mode,
+        # Backends and frame skipping sample different frames
+        "decode.backend": decode["backend"],
+        "decode.skip_frames": decode.get("skip_frames"),
+        # Frames that failed OCR are missing from the transcript
+        "failed_frames.0": {"$exists": False}
+    }
+
+async def create_video_job(
+    video: dict,
+    filename: str,
+    frame_interval: float,
+    crop: dict,
+    decode: dict,
+    ocr_mode: str,
+    owner: str,
+    batch_id: str = None
+) -> dict:
+    """Insert an OCR job for an uploaded video and return its document.
+
+    If identical content was already processed with the same settings the
+    job is created completed with the earlier transcripts (`reused_from`).
+    """
+    file_id = video["file_id"]
+    content_id = content_key(file_id, video)
+    job_doc = {
+        "id": str(uuid.uuid4()),
+        "file_id": file_id,
+        "content_id": content_id,
+        "batch_id": batch_id,
+        "owner": owner,
+        "filename": filename,
+        "frame_interval": frame_interval,
+        "crop": crop,
+        "decode": decode,
+        "ocr_mode": ocr_mode,
+        "status": "queued",
+        "progress": 0,
+        "total_frames": 0,
+        "estimated_frames": estimate_frame_count(video, frame_interval),
+        "transcripts": [],
+        "error": None,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "expires_at": job_expiry()
+    }
+
+    # Identical content already processed with the same settings: reuse its transcripts
+    previous = await db.ocr_jobs.find_one(
+        reusable_job_query(content_id, frame_interval, crop, decode, ocr_mode),
+        {"_id": 0, "id": 1, "total_frames": 1, "transcripts": 1, "transcripts_packed": 1}
+    )
+    if previous is not None:
+        job_doc.update({
+            "status": "completed",
+            "progress": 100,
+            "total_frames": previous.get("total_frames", 0),
+            "transcripts": previous.get("transcripts", []),
+            "reused_from": previous["id"]
+        })
+        if previous.get("transcripts_packed"):
+            job_doc["transcripts_packed"] = previous["transcripts_packed"]
+        await db.ocr_jobs.insert_one(job_doc)
+        await release_video(file_id, video["path"])
+        await index_transcripts("job", job_doc["id"], stored_transcripts(job_doc, "transcripts"))
+        return job_doc
+
+    await db.ocr_jobs.insert_one(job_doc)
+    return job_doc
+
+def client_host(request: Request) -> str:
+    """The admission identity of a submitter: its address, which it cannot pick per request.
+
+    Requests from a TRUSTED_PROXIES address are attributed to the nearest
+    X-Forwarded-For entry that is not itself a trusted proxy (uvicorn's rule).
+    """
+    host = request.client.host if request.client else None
+    if host is None:
+        return "anonymous"
+    if "*" not in TRUSTED_PROXIES and host not in TRUSTED_PROXIES:
+        return host
+    forwarded = [ip.strip() for ip in request.headers.get("x-forwarded-for", "").split(",") if ip.strip()]
+    if not forwarded:
+        return host
+    if "*" in TRUSTED_PROXIES:
+        return forwarded[0]
+    for ip in reversed(forwarded):
+        if ip not in TRUSTED_PROXIES:
+            return ip
+    return forwarded[0]
+
 @api_router.post("/process-video")
 async def process_video(
+    request: Request,
     background_tasks: BackgroundTasks,
     file_id: str,
     filename: str,
@@ -1014,29 +3617,21 @@ async def process_video(
     crop_top: float = 0,
     crop_bottom: float = 0,
     crop_left: float = 0,
-    crop_right: float = 0
+    crop_right: float = 0,
+    decode_backend: str = "cv2",
+    decode_threads: int = 0,
+    skip_frames: Optional[str] = None,
+    ocr_mode: str = "text"
 ):
     """Start processing a video for OCR."""
-    # Validate frame interval
-    if frame_interval < 0.5 or frame_interval > 5.0:
-        raise HTTPException(status_code=400, detail="Frame interval must be between 0.5 and 5.0 seconds")
-    
-    # Validate crop values
-    for val in [crop_top, crop_bottom, crop_left, crop_right]:
-        if val < 0 or val > 45:
-            raise HTTPException(status_code=400, detail="Crop values must be between 0 and 45%")
-    
+    check_video_settings(frame_interval, [crop_top, crop_bottom, crop_left, crop_right], ocr_mode)
+    decode = build_decode_settings(decode_backend, decode_threads, skip_frames)
+
     # Find the video file
-    video_path = None
-    for ext in ['.mp4', '.mov', '.avi', '.mkv', '.webm', '.m4v']:
-        potential_path = UPLOAD_DIR / f"{file_id}{ext}"
-        if potential_path.exists():
-            video_path = str(potential_path)
-            break
-    
-    if not video_path:
+    video = await find_video(file_id)
+    if not video:
         raise HTTPException(status_code=404, detail="Video file not found")
-    
+
     # Crop settings
     crop = {
         "top": crop_top,
@@ -1044,58 +3639,762 @@ async def process_video(
         "left": crop_left,
         "right": crop_right
     }
-    
-    # Create job
-    job_id = str(uuid.uuid4())
-    job_doc = {
-        "id": job_id,
-        "file_id": file_id,
-        "filename": filename,
-        "frame_interval": frame_interval,
-        "crop": crop,
-        "status": "queued",
-        "progress": 0,
-        "total_frames": 0,
-        "transcripts": [],
-        "error": None,
-        "created_at": datetime.now(timezone.utc).isoformat()
-    }
-    
-    await db.ocr_jobs.insert_one(job_doc)
-    
+
+    client = client_host(request)
+    ticket = admission.admit(client)
+    try:
+        job = await create_video_job(video, filename, frame_interval, crop, decode, ocr_mode, client)
+    except BaseException:
+        admission.discharge(client)
+        raise
+    if job.get("reused_from"):
+        admission.discharge(client)
+        return {"job_id": job["id"], "status": "completed", "reused_from": job["reused_from"]}
+
     # Start background processing
-    background_tasks.add_task(process_video_job, job_id, video_path, frame_interval, crop)
-    
-    return {"job_id": job_id, "status": "queued"}
+    background_tasks.add_task(
+        run_admitted, client, 1, run_cancellable, "job", job["id"],
+        process_video_job, job["id"], video["path"], frame_interval, crop, decode, ocr_mode, file_id, client
+    )
+
+    return {"job_id": job["id"], "status": "queued", **ticket}
+
+# ==================== ESTIMATES ====================
+# A dry run predicts what processing a video would send and cost without
+# decoding it fully: frame counts come from the probed metadata, image tokens
+# from the cropped and downscaled frame size, and a handful of seeked frames
+# (within ESTIMATE_SAMPLE_BUDGET seconds) measure decode speed and how often
+# consecutive samples are near-identical.
+
+OCR_EST_OUTPUT_TOKENS = int(os.environ.get('OCR_EST_OUTPUT_TOKENS', 200))
+OCR_EST_LAYOUT_OUTPUT_TOKENS = int(os.environ.get('OCR_EST_LAYOUT_OUTPUT_TOKENS', 1500))
+OCR_EST_LATENCY = float(os.environ.get('OCR_EST_LATENCY', 4.0))
+OCR_PRICE_INPUT_PER_MTOK = float(os.environ.get('OCR_PRICE_INPUT_PER_MTOK', 2.50))
+OCR_PRICE_OUTPUT_PER_MTOK = float(os.environ.get('OCR_PRICE_OUTPUT_PER_MTOK', 10.00))
+
+ESTIMATE_SAMPLES = 16
+ESTIMATE_SAMPLE_BUDGET = 0.3
+
+
+def image_tokens(width: int, height: int) -> int:
+    """Input tokens of one high-detail image (GPT-4o tiling: 85 + 170 per 512px tile)."""
+    if not width or not height:
+        return 85 + 170 * 4
+    scale = min(1.0, 2048 / max(width, height))
+    width, height = width * scale, height * scale
+    scale = min(1.0, 768 / min(width, height))
+    width, height = width * scale, height * scale
+    return 85 + 170 * math.ceil(width / 512) * math.ceil(height / 512)
+
+def sent_frame_size(video: dict, crop: dict) -> tuple:
+    """Size of frames sent to OCR after cropping and downscaling to MAX_FRAME_SIZE."""
+    width, height = video.get("width") or 0, video.get("height") or 0
+    if not width or not height:
+        return 0, 0
+    x1, y1, x2, y2 = crop_box(width, height, crop)
+    width, height = x2 - x1, y2 - y1
+    ratio = min(1.0, MAX_FRAME_SIZE / max(width, height))
+    return int(width * ratio), int(height * ratio)
+
+def sample_frame_changes(video_path: str, crop: dict) -> dict:
+    """Seek to evenly spaced frames within the time budget; report decode speed and near-duplicate share."""
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise ValueError("Could not open video file")
+    try:
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        positions = sorted({int(frame_count * (i + 0.5) / ESTIMATE_SAMPLES) for i in range(ESTIMATE_SAMPLES)})
+        deadline = time.perf_counter() + ESTIMATE_SAMPLE_BUDGET
+        thumbnails, read_seconds = [], []
+        for position in positions:
+            if time.perf_counter() > deadline:
+                break
+            start = time.perf_counter()
+            cap.set(cv2.CAP_PROP_POS_FRAMES, position)
+            ret, frame = cap.read()
+            read_seconds.append(time.perf_counter() - start)
+            if not ret:
+                continue
+            h, w = frame.shape[:2]
+            x1, y1, x2, y2 = crop_box(w, h, crop)
+            thumbnails.append(thumbnail(cv2.cvtColor(frame[y1:y2, x1:x2], cv2.COLOR_BGR2GRAY)))
+    finally:
+        cap.release()
+
+    pairs = list(zip(thumbnails, thumbnails[1:]))
+    duplicates = sum(1 for a, b in pairs if is_near_duplicate(a, b))
+    return {
+        "samples": len(thumbnails),
+        "seconds_per_frame": sum(read_seconds) / len(read_seconds) if read_seconds else None,
+        "near_duplicate_ratio": round(duplicates / len(pairs), 3) if pairs else None
+    }
+
+@api_router.get("/estimate")
+async def estimate_processing(
+    file_id: str,
+    frame_interval: float = 1.0,
+    crop_top: float = 0,
+    crop_bottom: float = 0,
+    crop_left: float = 0,
+    crop_right: float = 0,
+    ocr_mode: str = "text",
+    decode_backend: str = "cv2",
+    skip_frames: Optional[str] = None,
+    sample: bool = True
+):
+    """Dry run of /process-video: frames sent, tokens, cost and wall-clock time, without starting a job.
+
+    `sample=false` skips the sampled decode pass (decode time and the
+    near-duplicate share are then omitted). In text mode near-duplicate frames
+    reuse earlier text, so `ocr_calls`, tokens and cost count only the rest.
+    """
+    check_video_settings(frame_interval, [crop_top, crop_bottom, crop_left, crop_right], ocr_mode)
+    decode = build_decode_settings(decode_backend, 0, skip_frames)
+    # A dry run must not count as a use that keeps the upload from eviction
+    video = await find_video(file_id, touch=False)
+    if not video:
+        raise HTTPException(status_code=404, detail="Video file not found")
+    crop = {"top": crop_top, "bottom": crop_bottom, "left": crop_left, "right": crop_right}
+    content_id = content_key(file_id, video)
+
+    try:
+        planned = plan_frame_indices(video["path"], frame_interval, video) if video.get("fps") else \
+            await asyncio.to_thread(plan_frame_indices, video["path"], frame_interval)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    result = {"file_id": file_id, "duration": video.get("duration"), "frames_sampled": len(planned)}
+
+    # Work that would be skipped: a completed identical job, or layout OCR already stored
+    previous = await db.ocr_jobs.find_one(
+        reusable_job_query(content_id, frame_interval, crop, decode, ocr_mode), {"_id": 0, "id": 1}
+    )
+    stored = 0
+    if previous is None and ocr_mode == "layout":
+        stored = await db.frame_ocr.count_documents(
+            {"content_id": content_id, "frame_index": {"$in": [i for i, _ in planned]}}
+        )
+    frames_sent = 0 if previous else len(planned) - stored
+
+    changes = {}
+    if sample and frames_sent:
+        try:
+            changes = await asyncio.to_thread(sample_frame_changes, video["path"], None if ocr_mode == "layout" else crop)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    ocr_calls = frames_sent
+    duplicate_ratio = changes.get("near_duplicate_ratio")
+    if duplicate_ratio and ocr_mode == "text" and OCR_SKIP_NEAR_DUPLICATES:
+        # The first frame is always OCR'd
+        ocr_calls = max(1, math.ceil(frames_sent * (1 - duplicate_ratio)))
+
+    width, height = sent_frame_size(video, None if ocr_mode == "layout" else crop)
+    uses_llm = ocr_mode == "text" or layout_engine() == "llm"
+    prompt_tokens = len(LAYOUT_SYSTEM_MESSAGE if ocr_mode == "layout" else OCR_SYSTEM_MESSAGE) // 4 + 20
+    input_tokens = ocr_calls * (image_tokens(width, height) + prompt_tokens) if uses_llm else 0
+    output_tokens = ocr_calls * (
+        OCR_EST_LAYOUT_OUTPUT_TOKENS if ocr_mode == "layout" else OCR_EST_OUTPUT_TOKENS
+    ) if uses_llm else 0
+
+    # Frames are OCR'd one at a time per job; slots are shared with jobs already running
+    latency = ocr_latency.percentile(0.5) or OCR_EST_LATENCY
+    running = min(admission.total(), MAX_ACTIVE_JOBS)
+    contention = max(1.0, (running + 1) / OCR_CONCURRENCY)
+    decode_seconds = frames_sent * (changes.get("seconds_per_frame") or 0)
+    ocr_seconds = ocr_calls * (latency * contention + 0.1)
+    queue_seconds = admission.wait_estimate(max(0, admission.total() + 1 - MAX_ACTIVE_JOBS))
+
+    result.update({
+        "reused_from": previous["id"] if previous else None,
+        "frames_already_stored": stored,
+        "frames_sent": frames_sent,
+        "ocr_calls": ocr_calls,
+        "frame_size": [width, height],
+        "frames_decoded_for_estimate": changes.get("samples", 0),
+        "near_duplicate_ratio": changes.get("near_duplicate_ratio"),
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "cost_usd": round(
+            input_tokens / 1e6 * OCR_PRICE_INPUT_PER_MTOK + output_tokens / 1e6 * OCR_PRICE_OUTPUT_PER_MTOK, 4
+        ),
+        "queue_seconds": round(queue_seconds, 1),
+        "processing_seconds": round(decode_seconds + ocr_seconds, 1),
+        "estimated_total_seconds": round(queue_seconds + decode_seconds + ocr_seconds, 1)
+    })
+    return result
+
+# ==================== BATCHES ====================
+# A batch submits many uploads with shared settings. Its jobs run
+# BATCH_PARALLEL_JOBS at a time and draw OCR slots from the fair-share
+# scheduler under the submitter's identity, so a large batch only gets its
+# share of OCR capacity while other users have work waiting.
+
+BATCH_PARALLEL_JOBS = int(os.environ.get('BATCH_PARALLEL_JOBS', 2))
+MAX_BATCH_SIZE = 500
+
+class BatchRequest(BaseModel):
+    file_ids: List[str]
+    filenames: Optional[List[str]] = None
+    frame_interval: float = 1.0
+    crop_top: float = 0
+    crop_bottom: float = 0
+    crop_left: float = 0
+    crop_right: float = 0
+    decode_backend: str = "cv2"
+    decode_threads: int = 0
+    skip_frames: Optional[str] = None
+    ocr_mode: str = "text"
+
+async def run_batch(runs: List[tuple]):
+    """Run a batch's jobs (process_video_job argument tuples), BATCH_PARALLEL_JOBS at a time."""
+    semaphore = asyncio.Semaphore(BATCH_PARALLEL_JOBS)
+
+    async def run(args: tuple):
+        async with semaphore:
+            await run_cancellable("job", args[0], process_video_job, *args)
+
+    await asyncio.gather(*(run(args) for args in runs))
+
+@api_router.post("/process-batch")
+async def process_batch(request: Request, background_tasks: BackgroundTasks, batch: BatchRequest):
+    """Start OCR jobs for many uploaded videos with shared settings."""
+    if not batch.file_ids or len(batch.file_ids) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"A batch needs between 1 and {MAX_BATCH_SIZE} file_ids")
+    if batch.filenames is not None and len(batch.filenames) != len(batch.file_ids):
+        raise HTTPException(status_code=400, detail="filenames must match file_ids one to one")
+    crop = {
+        "top": batch.crop_top,
+        "bottom": batch.crop_bottom,
+        "left": batch.crop_left,
+        "right": batch.crop_right
+    }
+    check_video_settings(batch.frame_interval, list(crop.values()), batch.ocr_mode)
+    decode = build_decode_settings(batch.decode_backend, batch.decode_threads, batch.skip_frames)
+
+    # Resolve every upload first so a bad id rejects the whole batch
+    videos = [await find_video(file_id) for file_id in batch.file_ids]
+    missing = [file_id for file_id, video in zip(batch.file_ids, videos) if not video]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Video files not found: {', '.join(missing)}")
+
+    batch_id = str(uuid.uuid4())
+    client = client_host(request)
+    # A batch never runs more than BATCH_PARALLEL_JOBS jobs at once, so that is what it reserves
+    units = min(len(videos), BATCH_PARALLEL_JOBS)
+    ticket = admission.admit(client, units)
+    job_ids, runs = [], []
+    try:
+        for index, video in enumerate(videos):
+            filename = batch.filenames[index] if batch.filenames else video.get("filename") or video["file_id"]
+            job = await create_video_job(
+                video, filename, batch.frame_interval, crop, decode, batch.ocr_mode, client, batch_id
+            )
+            job_ids.append(job["id"])
+            if not job.get("reused_from"):
+                runs.append((
+                    job["id"], video["path"], batch.frame_interval, crop, decode, batch.ocr_mode, video["file_id"], client
+                ))
+    except BaseException:
+        admission.discharge(client, units)
+        raise
+
+    await db.batches.insert_one({
+        "id": batch_id,
+        "owner": client,
+        "job_ids": job_ids,
+        "frame_interval": batch.frame_interval,
+        "crop": crop,
+        "decode": decode,
+        "ocr_mode": batch.ocr_mode,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "expires_at": job_expiry()
+    })
+    background_tasks.add_task(run_admitted, client, units, run_batch, runs)
+
+    return {"batch_id": batch_id, "job_ids": job_ids, "status": "queued" if runs else "completed", **ticket}
+
+@api_router.get("/batch/{batch_id}")
+async def get_batch_status(batch_id: str):
+    """Batch settings with aggregate progress and per-job status (without transcripts)."""
+    batch = await db.batches.find_one({"id": batch_id}, {"_id": 0, "expires_at": 0})
+    if not batch:
+        raise HTTPException(status_code=404, detail="Batch not found")
+
+    jobs = await db.ocr_jobs.find(
+        {"batch_id": batch_id},
+        {"_id": 0, "id": 1, "filename": 1, "status": 1, "progress": 1, "total_frames": 1, "error": 1}
+    ).to_list(None)
+    counts = {}
+    for job in jobs:
+        counts[job["status"]] = counts.get(job["status"], 0) + 1
+    finished = sum(counts.get(status, 0) for status in ("completed", "failed", "cancelled"))
+
+    batch.update({
+        "status": "completed" if finished == len(jobs) else "processing",
+        "progress": int(sum(100 if job["status"] in ("completed", "failed", "cancelled") else job.get("progress", 0)
+                            for job in jobs) / max(len(jobs), 1)),
+        "counts": counts,
+        "jobs": jobs
+    })
+    return batch
 
 @api_router.get("/job/{job_id}")
 async def get_job_status(job_id: str):
     """Get the status and results of a processing job."""
-    job = await db.ocr_jobs.find_one({"id": job_id}, {"_id": 0})
-    
+    job = await get_cached_job(db.ocr_jobs, job_id)
+
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    
-    return job
+
+    return FastJSONResponse(job)
 
 @api_router.delete("/job/{job_id}")
 async def delete_job(job_id: str):
     """Delete a job and its results."""
-    result = await db.ocr_jobs.delete_one({"id": job_id})
-    
-    if result.deleted_count == 0:
+    job = await db.ocr_jobs.find_one_and_delete({"id": job_id}, {"_id": 0, "file_id": 1, "status": 1})
+    jobs_cache.invalidate(f"ocr_jobs:{job_id}")
+
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
-    
+    await db.transcript_entries.delete_many({"source": "job", "source_id": job_id})
+
+    # A running job stops and releases its video itself; one running in another
+    # worker process sees its record gone at the next cancel poll
+    if cancel_local_job("job", job_id):
+        return {"message": "Job deleted"}
+    if job.get("file_id") and job.get("status") not in ACTIVE_JOB_STATUSES:
+        video = await find_video(job["file_id"])
+        if video:
+            await release_video(job["file_id"], video["path"])
+
     return {"message": "Job deleted"}
 
+# ==================== LISTINGS ====================
+# Listings page newest-first by keyset (created_at, then the record id as a
+# tie-breaker). The cursor is the last row's key, so every page is an index
+# range scan on the (status,) created_at, id indexes however deep the client pages.
+
+MAX_PAGE_SIZE = 200
+
+def encode_cursor(created_at: str, record_id: str) -> str:
+    return base64.urlsafe_b64encode(json.dumps([created_at, record_id]).encode()).decode()
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        created_at, record_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(created_at, str) or not isinstance(record_id, str):
+            raise ValueError
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return created_at, record_id
+
+def parse_listing_date(value: Optional[str], name: str) -> Optional[str]:
+    """Normalize a date filter to the UTC ISO format `created_at` is stored in."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"{name} must be an ISO 8601 date")
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat()
+
+def listing_filter(status: Optional[str], created_after: Optional[str], created_before: Optional[str]) -> dict:
+    """Mongo filter for a comma-separated status list and a created_at date range."""
+    query = {}
+    if status:
+        statuses = [s.strip() for s in status.split(",") if s.strip()]
+        query["status"] = statuses[0] if len(statuses) == 1 else {"$in": statuses}
+
+    created_range = {}
+    if created_after:
+        created_range["$gte"] = parse_listing_date(created_after, "created_after")
+    if created_before:
+        created_range["$lt"] = parse_listing_date(created_before, "created_before")
+    if created_range:
+        query["created_at"] = created_range
+    return query
+
+async def list_page(
+    collection,
+    id_field: str,
+    projection: dict,
+    status: Optional[str],
+    created_after: Optional[str],
+    created_before: Optional[str],
+    cursor: Optional[str],
+    limit: int
+) -> dict:
+    """Fetch one page of a collection; returns {"items": [...], "next_cursor": str or None}."""
+    query = listing_filter(status, created_after, created_before)
+    if cursor:
+        created_at, record_id = decode_cursor(cursor)
+        query["$or"] = [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, id_field: {"$lt": record_id}}
+        ]
+
+    # One extra row tells whether another page exists
+    items = await collection.find(query, {"_id": 0, **projection}).sort(
+        [("created_at", DESCENDING), (id_field, DESCENDING)]
+    ).limit(limit + 1).to_list(limit + 1)
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(items[-1]["created_at"], items[-1][id_field])
+    return {"items": items, "next_cursor": next_cursor}
+
+@api_router.post("/job/{job_id}/cancel")
+async def cancel_job(job_id: str):
+    """Stop a queued or running job, keeping the transcripts produced so far."""
+    return await request_cancel("job", job_id, ACTIVE_JOB_STATUSES)
+
 @api_router.get("/jobs")
-async def list_jobs():
-    """List all jobs (without full transcripts for performance)."""
-    jobs = await db.ocr_jobs.find(
-        {}, 
-        {"_id": 0, "id": 1, "filename": 1, "status": 1, "progress": 1, "total_frames": 1, "created_at": 1, "error": 1}
-    ).sort("created_at", -1).limit(100).to_list(100)
-    return jobs
+async def list_jobs(
+    status: Optional[str] = None,
+    created_after: Optional[str] = None,
+    created_before: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE)
+):
+    """List jobs newest first (without full transcripts for performance).
+
+    `status` accepts a comma-separated list; pass `next_cursor` back as
+    `cursor` to fetch the following page.
+    """
+    return await list_page(
+        db.ocr_jobs,
+        "id",
+        {"id": 1, "filename": 1, "status": 1, "progress": 1, "total_frames": 1, "created_at": 1, "error": 1},
+        status, created_after, created_before, cursor, limit
+    )
+
+@api_router.get("/benchmarks")
+async def list_benchmarks(
+    status: Optional[str] = None,
+    created_after: Optional[str] = None,
+    created_before: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE)
+):
+    """List benchmark jobs newest first, without transcripts."""
+    return await list_page(
+        db.benchmark_jobs,
+        "id",
+        {"id": 1, "filename": 1, "status": 1, "progress": 1, "total_frames": 1, "crop": 1,
+         "comparison": 1, "created_at": 1, "error": 1},
+        status, created_after, created_before, cursor, limit
+    )
+
+@api_router.get("/mobile/sessions")
+async def list_mobile_sessions(
+    status: Optional[str] = None,
+    created_after: Optional[str] = None,
+    created_before: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE)
+):
+    """List mobile capture sessions newest first, without frames or transcripts."""
+    return await list_page(
+        db.mobile_sessions,
+        "session_id",
+        {"session_id": 1, "session_code": 1, "status": 1, "processing_status": 1, "device_info": 1, "created_at": 1},
+        status, created_after, created_before, cursor, limit
+    )
+
+# ==================== EXPORT ====================
+# Transcripts are streamed straight from a Mongo cursor ($unwind over the
+# stored array), one entry at a time, so exports use constant memory however
+# long the transcript. Bulk exports stream a zip built on the fly.
+
+EXPORT_FORMATS = {
+    "txt": "text/plain; charset=utf-8",
+    "jsonl": "application/x-ndjson",
+    "srt": "application/x-subrip",
+    "vtt": "text/vtt; charset=utf-8",
+}
+
+# Cue length for the last transcript entry, which has no successor to end at
+LAST_CUE_SECONDS = 3.0
+
+TRANSCRIPT_SOURCES = {
+    "job": ("ocr_jobs", "id", "transcripts"),
+    "session": ("mobile_sessions", "session_id", "processed_transcripts"),
+}
+
+async def transcript_cursor(kind: str, record_id: str):
+    """Yield the transcript entries of a job or session, streamed from Mongo unless stored packed."""
+    collection, id_field, array_field = TRANSCRIPT_SOURCES[kind]
+    record = await db[collection].find_one(
+        {id_field: record_id, f"{array_field}_packed": {"$ne": None}}, {"_id": 0, f"{array_field}_packed": 1}
+    )
+    if record is not None:
+        for entry in stored_transcripts(record, array_field):
+            yield entry
+        return
+    async for entry in db[collection].aggregate([
+        {"$match": {id_field: record_id}},
+        {"$project": {"_id": 0, array_field: 1}},
+        {"$unwind": f"${array_field}"},
+        {"$replaceRoot": {"newRoot": f"${array_field}"}},
+    ]):
+        yield entry
+
+def capture_time(timestamp) -> Optional[datetime]:
+    """Capture time of a mobile frame: an ISO string (web, ADB script) or epoch milliseconds (Android app)."""
+    try:
+        if isinstance(timestamp, str):
+            moment = datetime.fromisoformat(timestamp)
+        elif isinstance(timestamp, (int, float)) and not isinstance(timestamp, bool):
+            moment = datetime.fromtimestamp(timestamp / 1000, timezone.utc)
+        else:
+            return None
+    except (ValueError, OverflowError, OSError):
+        return None
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+def entry_seconds(kind: str, entry: dict, origin: Optional[datetime]) -> Optional[float]:
+    """Offset of an entry in seconds: video timestamps directly, mobile capture times relative to the first frame."""
+    timestamp = entry.get("timestamp")
+    if kind == "job":
+        return float(timestamp) if isinstance(timestamp, (int, float)) else None
+    moment = capture_time(timestamp)
+    if moment is None or origin is None:
+        return None
+    return max(0.0, (moment - origin).total_seconds())
+
+def format_clock(seconds: float, separator: str) -> str:
+    millis = int(round(seconds * 1000))
+    hours, millis = divmod(millis, 3_600_000)
+    minutes, millis = divmod(millis, 60_000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+def format_entry(fmt: str, number: int, entry: dict, start: float, end: float) -> str:
+    if fmt == "jsonl":
+        return json.dumps(entry, default=str) + "\n"
+    if fmt == "txt":
+        return f"[{int(start // 60):02d}:{int(start % 60):02d}]\n{entry['text']}\n\n"
+    separator = "," if fmt == "srt" else "."
+    cue = f"{format_clock(start, separator)} --> {format_clock(end, separator)}\n{entry['text']}\n\n"
+    return f"{number}\n{cue}" if fmt == "srt" else cue
+
+async def iter_transcript_export(kind: str, record_id: str, fmt: str):
+    """Yield an export of one job's or session's transcript, entry by entry."""
+    if fmt == "vtt":
+        yield "WEBVTT\n\n"
+
+    # Cues end where the next one starts, so hold one entry back
+    origin = None
+    pending = None
+    number = 0
+    async for entry in transcript_cursor(kind, record_id):
+        if origin is None and kind == "session":
+            origin = capture_time(entry.get("timestamp"))
+        start = entry_seconds(kind, entry, origin)
+        if start is None:
+            start = pending[1] + LAST_CUE_SECONDS if pending else 0.0
+        if pending is not None:
+            number += 1
+            yield format_entry(fmt, number, pending[0], pending[1], max(start, pending[1]))
+        pending = (entry, start)
+
+    if pending is not None:
+        yield format_entry(fmt, number + 1, pending[0], pending[1], pending[1] + LAST_CUE_SECONDS)
+
+def export_response(chunks, media_type: str, filename: str) -> StreamingResponse:
+    return StreamingResponse(
+        chunks, media_type=media_type, headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+def check_export_format(fmt: str):
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Format must be one of: {', '.join(EXPORT_FORMATS)}")
+
+@api_router.get("/job/{job_id}/export")
+async def export_job(job_id: str, format: str = "txt"):
+    """Stream a job's transcript as txt, jsonl, srt or vtt."""
+    check_export_format(format)
+    if not await db.ocr_jobs.find_one({"id": job_id}, {"_id": 1}):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return export_response(
+        iter_transcript_export("job", job_id, format), EXPORT_FORMATS[format], f"transcript-{job_id}.{format}"
+    )
+
+@api_router.get("/mobile/session/{session_id}/export")
+async def export_mobile_session(session_id: str, format: str = "txt"):
+    """Stream a mobile session's processed transcript as txt, jsonl, srt or vtt."""
+    check_export_format(format)
+    if not await db.mobile_sessions.find_one({"session_id": session_id}, {"_id": 1}):
+        raise HTTPException(status_code=404, detail="Session not found")
+    return export_response(
+        iter_transcript_export("session", session_id, format), EXPORT_FORMATS[format], f"transcript-{session_id}.{format}"
+    )
+
+class ZipStream:
+    """Write-only sink for zipfile that hands back whatever has been written so far."""
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def write(self, data) -> int:
+        self.buffer.extend(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        return data
+
+async def iter_jobs_zip(query: dict, fmt: str):
+    """Yield a zip archive with one transcript file per matching job."""
+    stream = ZipStream()
+    used_names = set()
+    with zipfile.ZipFile(stream, "w", zipfile.ZIP_DEFLATED) as archive:
+        async for job in db.ocr_jobs.find(query, {"_id": 0, "id": 1, "filename": 1}).sort("created_at", DESCENDING):
+            stem = re.sub(r"[^A-Za-z0-9._-]+", "_", Path(job.get("filename") or "transcript").stem) or "transcript"
+            name = f"{stem}.{fmt}" if f"{stem}.{fmt}" not in used_names else f"{stem}-{job['id']}.{fmt}"
+            used_names.add(name)
+            with archive.open(name, "w") as entry:
+                async for chunk in iter_transcript_export("job", job["id"], fmt):
+                    entry.write(chunk.encode("utf-8"))
+                    if len(stream.buffer) >= UPLOAD_CHUNK_SIZE:
+                        yield stream.drain()
+            yield stream.drain()
+    yield stream.drain()
+
+@api_router.get("/export/jobs")
+async def export_jobs(
+    ids: Optional[str] = None,
+    status: Optional[str] = "completed",
+    created_after: Optional[str] = None,
+    created_before: Optional[str] = None,
+    format: str = "txt"
+):
+    """Stream a zip of transcripts for the given comma-separated job ids, or for all jobs matching the filters."""
+    check_export_format(format)
+    query = listing_filter(status, created_after, created_before)
+    if ids:
+        query["id"] = {"$in": [i.strip() for i in ids.split(",") if i.strip()]}
+
+    return export_response(
+        iter_jobs_zip(query, format), "application/zip",
+        f"transcripts-{datetime.now(timezone.utc).strftime('%Y%m%d-%H%M%S')}.zip"
+    )
+
+# ==================== SEARCH ====================
+# Completed transcripts are flattened into `transcript_entries` (one document
+# per entry, text indexed), so a phrase is found across every job and mobile
+# session with a single index lookup instead of scanning per-record arrays.
+
+# Record collection, id field and display label of each searchable source
+SEARCH_SOURCES = {
+    "job": ("ocr_jobs", "id", "filename"),
+    "session": ("mobile_sessions", "session_id", "session_code"),
+}
+
+SNIPPET_CHARS = 120
+
+async def index_transcripts(source: str, source_id: str, entries: List[dict]):
+    """Replace the search entries of a job or session. Failures are logged, never raised."""
+    collection, id_field, label_field = SEARCH_SOURCES[source]
+    try:
+        record = await db[collection].find_one(
+            {id_field: source_id}, {"_id": 0, label_field: 1, "created_at": 1, "expires_at": 1}
+        )
+        await db.transcript_entries.delete_many({"source": source, "source_id": source_id})
+        if record is None or not entries:
+            return
+        await db.transcript_entries.insert_many([
+            {
+                "source": source,
+                "source_id": source_id,
+                "label": record.get(label_field),
+                "frame_index": entry.get("frame_index"),
+                "timestamp": entry.get("timestamp"),
+                "text": entry["text"],
+                "created_at": record.get("created_at"),
+                "expires_at": record.get("expires_at")
+            }
+            for entry in entries
+        ])
+    except PyMongoError as e:
+        logging.error(f"Could not index transcripts of {source} {source_id}: {str(e)}")
+
+def make_snippet(text: str, query: str) -> str:
+    """A single-line excerpt of `text` around the first query term it contains."""
+    lower = text.lower()
+    positions = [p for p in (lower.find(term) for term in re.findall(r"\w+", query.lower())) if p >= 0]
+    start = max(0, min(positions, default=0) - SNIPPET_CHARS // 3)
+    end = min(len(text), start + SNIPPET_CHARS)
+    snippet = " ".join(text[start:end].split())
+    return ("..." if start > 0 else "") + snippet + ("..." if end < len(text) else "")
+
+@api_router.get("/search")
+async def search_transcripts(
+    q: str = Query(..., min_length=1, max_length=200),
+    source: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100)
+):
+    """Search all indexed transcripts; quote words to match an exact phrase.
+
+    Hits are ranked by relevance and carry the job or session id, frame
+    index, timestamp and a snippet of the matching entry.
+    """
+    query = {"$text": {"$search": q}}
+    if source:
+        if source not in SEARCH_SOURCES:
+            raise HTTPException(status_code=400, detail=f"Source must be one of: {', '.join(SEARCH_SOURCES)}")
+        query["source"] = source
+
+    hits = await db.transcript_entries.find(
+        query,
+        {"_id": 0, "expires_at": 0, "score": {"$meta": "textScore"}}
+    ).sort([("score", {"$meta": "textScore"})]).limit(limit).to_list(limit)
+    for hit in hits:
+        hit["snippet"] = make_snippet(hit.pop("text"), q)
+    return {"query": q, "hits": hits}
+
+@api_router.post("/search/reindex")
+async def reindex_transcripts():
+    """Rebuild search entries for every completed job and mobile session (e.g. after upgrading)."""
+    counts = {}
+    for source, (collection, id_field, _) in SEARCH_SOURCES.items():
+        array_field = TRANSCRIPT_SOURCES[source][2]
+        counts[source] = 0
+        async for record in db[collection].find(
+            {"status": "completed"}, {"_id": 0, id_field: 1, array_field: 1, f"{array_field}_packed": 1}
+        ):
+            await index_transcripts(source, record[id_field], stored_transcripts(record, array_field))
+            counts[source] += 1
+    return {"reindexed": counts}
+
+@api_router.get("/metrics")
+async def metrics():
+    """Expose Prometheus metrics, aggregated across workers in multiprocess mode."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+@api_router.get("/admission")
+async def get_admission_status():
+    """Current load, limits and the estimated start time of a job submitted now."""
+    return {**admission.stats(), "ocr": ocr_scheduler.stats()}
+
+@api_router.get("/storage")
+async def get_storage_status():
+    """Upload directory usage and the result of the most recent storage sweep."""
+    return {
+        "quota_bytes": UPLOAD_QUOTA_BYTES,
+        "sweep_interval_seconds": STORAGE_SWEEP_INTERVAL,
+        "last_sweep": last_storage_sweep or None
+    }
 
 # Legacy routes for compatibility
 @api_router.post("/status", response_model=StatusCheck)
@@ -1118,6 +4417,151 @@ async def get_status_checks():
 # Include the router in the main app
 app.include_router(api_router)
 
+# ==================== RESPONSE COMPRESSION ====================
+# Text responses of at least COMPRESS_MIN_BYTES are brotli- or gzip-encoded,
+# whichever the client accepts (brotli preferred when installed). Streamed
+# exports are compressed chunk by chunk and flushed so they keep streaming;
+# already compressed bodies (zip exports, images) pass through untouched.
+# It is registered innermost, before the function middleware below, which
+# re-streams every response body in chunks.
+
+COMPRESS_MIN_BYTES = int(os.environ.get('COMPRESS_MIN_BYTES', 1024))
+COMPRESS_GZIP_LEVEL = 6
+COMPRESS_BROTLI_QUALITY = 4
+COMPRESSIBLE_TYPES = (
+    "application/json", "application/x-ndjson", "application/x-subrip", "application/javascript", "text/"
+)
+
+def accepted_encoding(accept_encoding: str) -> Optional[str]:
+    """Preferred response encoding the client accepts, or None."""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.partition(";")
+        quality = params.strip().removeprefix("q=")
+        try:
+            if quality and float(quality) <= 0:
+                continue
+        except ValueError:
+            pass
+        accepted.add(name.strip())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+class StreamCompressor:
+    """Incremental brotli or gzip encoder; `flush` emits everything written so far."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self.encoder = brotli.Compressor(quality=COMPRESS_BROTLI_QUALITY)
+        else:
+            self.encoder = zlib.compressobj(COMPRESS_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self.encoder.process(data)
+        return self.encoder.compress(data)
+
+    def flush(self) -> bytes:
+        if self.encoding == "br":
+            return self.encoder.flush()
+        return self.encoder.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self.encoder.finish()
+        return self.encoder.flush(zlib.Z_FINISH)
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = COMPRESS_MIN_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        encoding = None
+        if scope["type"] == "http":
+            encoding = accepted_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        
+        start = None
+        compressor = None
+        passthrough = False
+        
+        async def send_compressed(message):
+            nonlocal start, compressor, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            
+            if start is not None:
+                headers = MutableHeaders(raw=start["headers"])
+                content_type = headers.get("content-type", "")
+                passthrough = (
+                    "content-encoding" in headers
+                    or not content_type.startswith(COMPRESSIBLE_TYPES)
+                    or (not more_body and len(body) < self.minimum_size)
+                )
+                if not passthrough:
+                    compressor = StreamCompressor(encoding)
+                    headers["Content-Encoding"] = encoding
+                    headers.add_vary_header("Accept-Encoding")
+                    if more_body:
+                        del headers["Content-Length"]
+                    else:
+                        body = compressor.compress(body) + compressor.finish()
+                        headers["Content-Length"] = str(len(body))
+                        message = {**message, "body": body}
+                await send(start)
+                start = None
+                if passthrough or not more_body:
+                    await send(message)
+                    return
+            elif passthrough:
+                await send(message)
+                return
+            
+            chunk = compressor.compress(body) + (compressor.flush() if more_body else compressor.finish())
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+        
+        await self.app(scope, receive, send_compressed)
+
+app.add_middleware(CompressionMiddleware)
+
+class UploadAdmissionMiddleware:
+    """Limit concurrent video uploads before their body is read; other requests pass straight through."""
+    def __init__(self, app, path: str = "/api/upload-video"):
+        self.app = app
+        self.path = path
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] != self.path:
+            await self.app(scope, receive, send)
+            return
+        client = client_host(Request(scope))
+        try:
+            admission.enter_upload(client)
+        except HTTPException as e:
+            response = JSONResponse(status_code=e.status_code, content={"detail": e.detail}, headers=e.headers)
+            await response(scope, receive, send)
+            return
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            admission.exit_upload(client, time.perf_counter() - start)
+
+app.add_middleware(UploadAdmissionMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
@@ -1133,6 +4577,29 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def create_db_indexes():
+    await ensure_indexes()
+
+@app.on_event("startup")
+async def start_storage_sweep():
+    app.state.storage_sweep = asyncio.create_task(storage_sweep_loop())
+
+@app.on_event("startup")
+async def start_ocr_client():
+    await ocr_client.start()
+
+@app.on_event("startup")
+async def preload_media_modules():
+    # Replicas that run jobs can pay the media/LLM import cost at startup
+    # instead of on their first job; API-only replicas leave this unset.
+    if PRELOAD_MEDIA_MODULES:
+        for module in (cv2, Image, llm_chat, av, pytesseract):
+            if module is not None:
+                await asyncio.to_thread(module.load)
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    app.state.storage_sweep.cancel()
+    await ocr_client.aclose()
     client.close()
@@ -246,13 +246,140 @@ class VideoOCRAPITester:
             
             if success:
                 data = response.json()
-                details += f", Jobs count: {len(data)}"
+                # Paginated: {"items": [...], "next_cursor": ...}
+                success = isinstance(data.get("items"), list) and "next_cursor" in data
+                details += f", Jobs count: {len(data.get('items', []))}"
+                if success and data["next_cursor"]:
+                    next_page = requests.get(f"{self.api_url}/jobs", params={"cursor": data["next_cursor"]})
+                    success = next_page.status_code == 200
+                    details += f", Next page: {next_page.status_code}"
             
             return self.log_test("List Jobs", success, details)
             
         except Exception as e:
             return self.log_test("List Jobs", False, f"Error: {str(e)}")
 
+    def test_cancel_job(self, job_id):
+        """Test job cancellation (a job that already finished answers 409)"""
+        try:
+            response = requests.post(f"{self.api_url}/job/{job_id}/cancel")
+            success = response.status_code in (200, 409)
+            details = f"Status: {response.status_code}"
+            if response.status_code == 200:
+                details += f", Result: {response.json().get('status')}"
+            
+            missing = requests.post(f"{self.api_url}/job/non-existent-job-id/cancel")
+            success = success and missing.status_code == 404
+            details += f", Unknown job: {missing.status_code}"
+            return self.log_test("Cancel Job", success, details)
+            
+        except Exception as e:
+            return self.log_test("Cancel Job", False, f"Error: {str(e)}")
+
+    def test_process_batch(self, uploaded_file):
+        """Test batch submission and batch status"""
+        try:
+            response = requests.post(f"{self.api_url}/process-batch", json={'file_ids': [uploaded_file['file_id']]})
+            
+            success = response.status_code == 200
+            details = f"Status: {response.status_code}"
+            if not success:
+                return self.log_test("Process Batch", False, details), None
+            
+            data = response.json()
+            self.created_jobs.extend(data.get('job_ids', []))
+            status = requests.get(f"{self.api_url}/batch/{data['batch_id']}")
+            success = status.status_code == 200 and len(data.get('job_ids', [])) == 1
+            details += f", Batch ID: {data['batch_id']}, Batch status: {status.status_code}"
+            return self.log_test("Process Batch", success, details), data
+            
+        except Exception as e:
+            return self.log_test("Process Batch", False, f"Error: {str(e)}"), None
+
+    def test_estimate(self, uploaded_file):
+        """Test dry-run estimate endpoint"""
+        try:
+            params = {'file_id': uploaded_file['file_id'], 'frame_interval': 1.0, 'sample': 'false'}
+            response = requests.get(f"{self.api_url}/estimate", params=params)
+            
+            success = response.status_code == 200
+            details = f"Status: {response.status_code}"
+            if success:
+                data = response.json()
+                success = data.get('frames_sampled', 0) > 0 and 0 <= data.get('ocr_calls', -1) <= data.get('frames_sent', -1)
+                details += f", Frames sent: {data.get('frames_sent')}, OCR calls: {data.get('ocr_calls')}"
+            
+            return self.log_test("Estimate", success, details)
+            
+        except Exception as e:
+            return self.log_test("Estimate", False, f"Error: {str(e)}")
+
+    def test_export_job(self, job_id):
+        """Test transcript export in every format"""
+        try:
+            results = []
+            for fmt in ('txt', 'jsonl', 'srt', 'vtt'):
+                response = requests.get(f"{self.api_url}/job/{job_id}/export", params={'format': fmt})
+                results.append(f"{fmt}: {response.status_code}")
+                if response.status_code != 200 or 'attachment' not in response.headers.get('content-disposition', ''):
+                    return self.log_test("Export Job", False, ", ".join(results))
+            
+            invalid = requests.get(f"{self.api_url}/job/{job_id}/export", params={'format': 'doc'})
+            results.append(f"doc: {invalid.status_code}")
+            return self.log_test("Export Job", invalid.status_code == 400, ", ".join(results))
+            
+        except Exception as e:
+            return self.log_test("Export Job", False, f"Error: {str(e)}")
+
+    def test_search(self):
+        """Test full-text transcript search"""
+        try:
+            response = requests.get(f"{self.api_url}/search", params={'q': 'Frame'})
+            
+            success = response.status_code == 200
+            details = f"Status: {response.status_code}"
+            if success:
+                hits = response.json().get('hits', [])
+                success = isinstance(hits, list)
+                details += f", Hits: {len(hits)}"
+            
+            invalid = requests.get(f"{self.api_url}/search", params={'q': 'Frame', 'source': 'nope'})
+            success = success and invalid.status_code == 400
+            details += f", Invalid source: {invalid.status_code}"
+            return self.log_test("Search", success, details)
+            
+        except Exception as e:
+            return self.log_test("Search", False, f"Error: {str(e)}")
+
+    def test_mobile_frame_check(self):
+        """Test frame pre-check: unchanged frames are skipped, bad hashes rejected"""
+        try:
+            session = requests.post(f"{self.api_url}/mobile/create-session").json()
+            code = session['session_code']
+            frames = [
+                {'frame_index': 1, 'phash': '0' * 64},
+                {'frame_index': 2, 'phash': '0' * 63 + '1'},
+                {'frame_index': 3, 'phash': 'f' * 64},
+            ]
+            response = requests.post(f"{self.api_url}/mobile/frame-check/{code}", json={'frames': frames})
+            
+            success = response.status_code == 200
+            details = f"Status: {response.status_code}"
+            if success:
+                data = response.json()
+                success = data.get('needed') == [1, 3] and [f['frame_index'] for f in data.get('skipped', [])] == [2]
+                details += f", Needed: {data.get('needed')}"
+            
+            invalid = requests.post(f"{self.api_url}/mobile/frame-check/{code}",
+                                    json={'frames': [{'frame_index': 4, 'phash': 'xyz'}]})
+            unknown = requests.post(f"{self.api_url}/mobile/frame-check/000000", json={'frames': []})
+            success = success and invalid.status_code == 400 and unknown.status_code == 404
+            details += f", Invalid hash: {invalid.status_code}, Unknown session: {unknown.status_code}"
+            return self.log_test("Mobile Frame Check", success, details)
+            
+        except Exception as e:
+            return self.log_test("Mobile Frame Check", False, f"Error: {str(e)}")
+
     def cleanup(self):
         """Clean up created resources"""
         print("\n🧹 Cleaning up...")
@@ -293,6 +420,9 @@ class VideoOCRAPITester:
             # Test 4: Upload invalid file
             self.test_upload_invalid_file()
             
+            # Test 4b: Estimate before processing (the upload is released once its job ends)
+            self.test_estimate(uploaded_file)
+            
             # Test 5: Process video
             process_success, job_data = self.test_process_video(uploaded_file)
             if not process_success or not job_data:
@@ -323,6 +453,25 @@ class VideoOCRAPITester:
                 if transcripts:
                     print(f"   Sample transcript: {transcripts[0].get('text', 'N/A')[:50]}...")
             
+            # Test 11: Cancel a finished job and a missing one
+            self.test_cancel_job(job_id)
+            
+            # Test 12: Batch submission and batch status
+            batch_upload_success, batch_file = self.test_upload_video(video_path)
+            if batch_upload_success and batch_file:
+                self.test_process_batch(batch_file)
+            
+            # Test 13: Export the finished transcript
+            if completion_success:
+                self.test_export_job(job_id)
+            
+            # Test 14: Search the indexed transcripts
+            if completion_success:
+                self.test_search()
+            
+            # Test 15: Mobile frame pre-check
+            self.test_mobile_frame_check()
+            
         finally:
             # Cleanup
             try:
@@ -0,0 +1,33 @@
+import os
+import sys
+from pathlib import Path
+
+# server reads these at import; no database connection is made until a query runs
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "unit_tests")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+import pytest
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """An in-memory database in place of the server's MongoDB."""
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    import server
+
+    database = mongomock_motor.AsyncMongoMockClient()["unit_tests"]
+    monkeypatch.setattr(server, "db", database)
+    return database
+
+
+@pytest.fixture
+def upload_dir(monkeypatch, tmp_path):
+    """Empty upload and frame cache directories in place of the server's."""
+    import server
+
+    uploads = tmp_path / "uploads"
+    uploads.mkdir()
+    monkeypatch.setattr(server, "UPLOAD_DIR", uploads)
+    monkeypatch.setattr(server, "FRAME_CACHE_DIR", uploads / "frame_cache")
+    return uploads
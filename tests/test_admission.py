@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+import server
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    monkeypatch.setattr(server, "MAX_ACTIVE_JOBS", 2)
+    monkeypatch.setattr(server, "MAX_QUEUED_JOBS", 2)
+    monkeypatch.setattr(server, "MAX_JOBS_PER_CLIENT", 3)
+    monkeypatch.setattr(server, "MAX_CONCURRENT_UPLOADS", 2)
+    monkeypatch.setattr(server, "MAX_UPLOADS_PER_CLIENT", 1)
+    controller = server.AdmissionController()
+    monkeypatch.setattr(server, "admission", controller)
+    return controller
+
+
+def test_admit_reports_queue_position(limits):
+    assert limits.admit("a")["admission"] == "accepted"
+    assert limits.admit("b")["admission"] == "accepted"
+    ticket = limits.admit("c")
+    assert ticket["admission"] == "queued"
+    assert ticket["queue_position"] == 1
+    assert ticket["estimated_start_seconds"] == 60.0
+
+
+def test_per_client_limit_rejects_with_retry_after(limits):
+    limits.admit("a", 3)
+    with pytest.raises(HTTPException) as rejected:
+        limits.admit("a")
+    assert rejected.value.status_code == 429
+    assert rejected.value.headers == {"Retry-After": "60"}
+    # Other clients are still admitted
+    limits.admit("b")
+
+
+def test_full_queue_rejects_until_discharged(limits):
+    for owner in "abcd":
+        limits.admit(owner)
+    with pytest.raises(HTTPException) as rejected:
+        limits.admit("e")
+    assert rejected.value.status_code == 429
+    assert int(rejected.value.headers["Retry-After"]) >= 1
+    limits.discharge("a")
+    limits.admit("e")
+    assert limits.stats()["queued"] == 2
+
+
+def request_from(host, forwarded=None):
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+    return Request({"type": "http", "client": (host, 1234), "headers": headers})
+
+
+def test_client_host_ignores_forwarded_header_from_untrusted_peers(monkeypatch):
+    monkeypatch.setattr(server, "TRUSTED_PROXIES", set())
+    assert server.client_host(request_from("10.0.0.5", "1.2.3.4")) == "10.0.0.5"
+
+
+def test_client_host_behind_trusted_proxies(monkeypatch):
+    monkeypatch.setattr(server, "TRUSTED_PROXIES", {"10.0.0.5", "10.0.0.6"})
+    # Spoofed left-most entry is skipped: the nearest untrusted hop is the client
+    assert server.client_host(request_from("10.0.0.5", "6.6.6.6, 1.2.3.4, 10.0.0.6")) == "1.2.3.4"
+    assert server.client_host(request_from("10.0.0.5")) == "10.0.0.5"
+    monkeypatch.setattr(server, "TRUSTED_PROXIES", {"*"})
+    assert server.client_host(request_from("10.0.0.5", "1.2.3.4, 10.0.0.6")) == "1.2.3.4"
+
+
+def test_upload_middleware_limits_only_uploads(limits, monkeypatch):
+    monkeypatch.setattr(server, "TRUSTED_PROXIES", set())
+    release = asyncio.Event()
+
+    async def app(scope, receive, send):
+        if scope["path"] == "/api/upload-video":
+            await release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    middleware = server.UploadAdmissionMiddleware(app)
+
+    async def call(path, host="10.0.0.5", method="POST"):
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "method": method, "path": path, "client": (host, 1), "headers": []}
+        await middleware(scope, None, send)
+        return sent
+
+    async def run():
+        first = asyncio.create_task(call("/api/upload-video"))
+        await asyncio.sleep(0)
+        assert limits.uploads == {"10.0.0.5": 1}
+        rejected = await call("/api/upload-video")
+        other = await call("/api/jobs", method="GET")
+        release.set()
+        await first
+        return rejected, other
+
+    rejected, other = asyncio.run(run())
+    assert rejected[0]["status"] == 429
+    assert (b"retry-after", b"5") in rejected[0]["headers"]
+    assert other[0]["status"] == 200
+    assert limits.uploads == {}
@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+
+import server
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(server.time, "monotonic", clock)
+    monkeypatch.setattr(server.time, "time", clock)
+    return clock
+
+
+def test_ttl_cache_expires_entries(clock):
+    cache = server.TTLCache("test", ttl=10)
+    cache.set("a", {"value": 1})
+    clock.now += 9
+    assert cache.get("a") == {"value": 1}
+    clock.now += 2
+    assert cache.get("a") is None
+
+
+def test_ttl_cache_evicts_oldest_when_full(clock):
+    cache = server.TTLCache("test", ttl=10, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("a", 3)  # refreshed, so "b" is now the oldest
+    cache.set("c", 4)
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (3, None, 4)
+    cache.invalidate("a")
+    assert cache.get("a") is None
+
+
+def test_sqlite_cache_is_shared_between_workers(clock, tmp_path):
+    path = str(tmp_path / "cache.db")
+    worker_a = server.SqliteTTLCache("sessions", 10, path)
+    worker_b = server.SqliteTTLCache("sessions", 10, path)
+    worker_a.set("123456", {"session_id": "s", "status": "waiting"})
+    assert worker_b.get("123456") == {"session_id": "s", "status": "waiting"}
+    worker_b.invalidate("123456")
+    assert worker_a.get("123456") is None
+    worker_a.set("654321", {"status": "capturing"})
+    clock.now += 11
+    assert worker_b.get("654321") is None
+
+
+@pytest.fixture
+def sessions(monkeypatch):
+    cache = server.TTLCache("mobile_sessions", 300)
+    monkeypatch.setattr(server, "mobile_sessions", cache)
+    return cache
+
+
+def test_session_meta_is_loaded_once(db, sessions):
+    async def run():
+        await db.mobile_sessions.insert_one(
+            {"session_id": "s1", "session_code": "123456", "status": "waiting", "settings": {"live_ocr": True}}
+        )
+        first = await server.get_session_meta("123456")
+        # Served from the cache while the document is unchanged
+        await db.mobile_sessions.update_one({"session_code": "123456"}, {"$set": {"status": "changed"}})
+        second = await server.get_session_meta("123456")
+        return first, second, await server.get_session_meta("000000")
+
+    first, second, missing = asyncio.run(run())
+    assert first == second == {"session_id": "s1", "status": "waiting", "live_ocr": True}
+    assert missing is None
+    assert sessions.get("000000") is None
+
+
+def test_session_status_updates_only_matching_entries(sessions):
+    sessions.set("123456", {"session_id": "s1", "status": "waiting", "live_ocr": False})
+    server.cache_session_status("123456", "s1", "capturing")
+    assert sessions.get("123456")["status"] == "capturing"
+    # A code reused by another session drops the stale entry
+    server.cache_session_status("123456", "s2", "completed")
+    assert sessions.get("123456") is None
+
+
+def test_only_finished_jobs_are_cached(db, monkeypatch):
+    monkeypatch.setattr(server, "jobs_cache", server.TTLCache("jobs", 600))
+
+    async def run():
+        await db.ocr_jobs.insert_one({"id": "job", "status": "processing", "transcripts": []})
+        running = await server.get_cached_job(db.ocr_jobs, "job")
+        await db.ocr_jobs.update_one({"id": "job"}, {"$set": {"status": "completed"}})
+        finished = await server.get_cached_job(db.ocr_jobs, "job")
+        await db.ocr_jobs.update_one({"id": "job"}, {"$set": {"status": "edited"}})
+        return running, finished, await server.get_cached_job(db.ocr_jobs, "job")
+
+    running, finished, cached = asyncio.run(run())
+    assert running["status"] == "processing"
+    assert finished["status"] == cached["status"] == "completed"
@@ -0,0 +1,60 @@
+import asyncio
+
+import server
+
+
+def run_job(db, monkeypatch, during):
+    """Run a long job under run_cancellable, calling `during()` once it has started."""
+    monkeypatch.setattr(server, "CANCEL_POLL_SECONDS", 0.01)
+    outcome = []
+
+    async def job():
+        try:
+            server.check_cancelled()
+            await asyncio.sleep(5)
+            outcome.append("finished")
+        except (asyncio.CancelledError, server.JobCancelled):
+            outcome.append("cancelled")
+
+    async def run():
+        await db.ocr_jobs.insert_one({"id": "job", "status": "processing"})
+        runner = asyncio.create_task(server.run_cancellable("job", "job", job))
+        await asyncio.sleep(0.02)
+        await during()
+        await asyncio.wait_for(runner, 1)
+
+    asyncio.run(run())
+    return outcome
+
+
+def test_cancel_requested_by_another_worker_stops_the_job(db, monkeypatch):
+    async def flag():
+        await db.ocr_jobs.update_one({"id": "job"}, {"$set": {"cancel_requested": True}})
+
+    assert run_job(db, monkeypatch, flag) == ["cancelled"]
+    assert server.running_jobs == {}
+
+
+def test_deleted_record_stops_the_job(db, monkeypatch):
+    async def delete():
+        await db.ocr_jobs.delete_one({"id": "job"})
+
+    assert run_job(db, monkeypatch, delete) == ["cancelled"]
+
+
+def test_job_cancelled_while_queued_stops_at_first_check(db):
+    ran = []
+
+    async def job():
+        try:
+            server.check_cancelled()
+            ran.append("started")
+        except server.JobCancelled:
+            ran.append("cancelled")
+
+    async def run():
+        await db.ocr_jobs.insert_one({"id": "job", "status": "queued", "cancel_requested": True})
+        await server.run_cancellable("job", "job", job)
+
+    asyncio.run(run())
+    assert ran == ["cancelled"]
@@ -0,0 +1,99 @@
+import gzip
+import json
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+import server
+
+BIG = {"transcripts": [{"frame_index": i, "text": "some repeated text " * 5} for i in range(200)]}
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+
+    @app.get("/big")
+    async def big():
+        return server.FastJSONResponse(BIG)
+
+    @app.get("/small")
+    async def small():
+        return server.FastJSONResponse({"ok": True})
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(50):
+                yield f"chunk {i} " * 20 + "\n"
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    @app.get("/binary")
+    async def binary():
+        return PlainTextResponse("x" * 5000, media_type="image/png")
+
+    app.add_middleware(server.CompressionMiddleware)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip", "gzip"),
+    ("gzip, deflate", "gzip"),
+    ("GZIP;q=0.5", "gzip"),
+    ("gzip;q=0", None),
+    ("identity", None),
+    ("", None),
+])
+def test_accepted_encoding(header, expected):
+    assert server.accepted_encoding(header) == expected
+
+
+def test_accepted_encoding_prefers_brotli():
+    assert server.accepted_encoding("gzip, br") == ("br" if server.brotli is not None else "gzip")
+
+
+def test_large_json_is_gzipped(client):
+    response = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) < len(json.dumps(BIG))
+    assert response.json() == BIG
+
+
+def test_brotli(client):
+    if server.brotli is None:
+        pytest.skip("brotli not installed")
+    response = client.get("/big", headers={"Accept-Encoding": "br"})
+    assert response.headers["content-encoding"] == "br"
+    assert response.json() == BIG
+
+
+def test_small_and_binary_responses_pass_through(client):
+    for path in ("/small", "/binary"):
+        response = client.get(path, headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+
+
+def test_no_accept_encoding_passes_through(client):
+    response = client.get("/big", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.json() == BIG
+
+
+def test_streaming_response_is_compressed_incrementally(client):
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        raw = b"".join(response.iter_raw())
+    assert gzip.decompress(raw).decode() == "".join(f"chunk {i} " * 20 + "\n" for i in range(50))
+
+
+def test_fast_json_response_encodes_datetimes(monkeypatch):
+    moment = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    for encoder in (server.orjson, None):
+        monkeypatch.setattr(server, "orjson", encoder)
+        body = json.loads(server.FastJSONResponse({"expires_at": moment}).body)
+        assert datetime.fromisoformat(body["expires_at"]) == moment
@@ -0,0 +1,97 @@
+import asyncio
+from datetime import datetime, timezone
+
+import cv2
+import numpy as np
+import pytest
+
+import server
+
+
+def write_video(path, screens, fps=10, seconds_per_screen=2):
+    """A video showing each text in `screens` for `seconds_per_screen` seconds."""
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), fps, (320, 240))
+    for text in screens:
+        frame = np.full((240, 320, 3), 255, dtype=np.uint8)
+        cv2.putText(frame, text, (20, 120), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 0, 0), 3)
+        for _ in range(fps * seconds_per_screen):
+            writer.write(frame)
+    writer.release()
+    return str(path)
+
+
+def encoded(text):
+    frame = np.full((120, 160, 3), 255, dtype=np.uint8)
+    cv2.putText(frame, text, (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 0), 2)
+    return server.encode_frame(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+
+
+def test_near_duplicate_frames():
+    same = server.frame_thumbnail(encoded("hello"))
+    assert server.is_near_duplicate(same, server.frame_thumbnail(encoded("hello")))
+    assert not server.is_near_duplicate(same, server.frame_thumbnail(encoded("world")))
+    assert not server.is_near_duplicate(same, None)
+
+
+def test_video_job_reuses_text_for_near_duplicate_frames(db, monkeypatch, tmp_path):
+    video_path = write_video(tmp_path / "screens.mp4", ["first", "second"])
+    monkeypatch.setenv("EMERGENT_LLM_KEY", "key")
+    monkeypatch.setattr(server, "OCR_SKIP_NEAR_DUPLICATES", True)
+    calls = []
+
+    async def ocr_frame(base64_image, *args):
+        calls.append(base64_image)
+        return f"screen {len(calls)}"
+
+    monkeypatch.setattr(server, "ocr_frame", ocr_frame)
+
+    async def run():
+        await db.ocr_jobs.insert_one({"id": "job", "status": "queued"})
+        await server.process_video_job("job", video_path, 0.5)
+        return await db.ocr_jobs.find_one({"id": "job"})
+
+    job = asyncio.run(run())
+    assert job["status"] == "completed"
+    assert len(calls) == 2
+    texts = [entry["text"] for entry in server.stored_transcripts(job, "transcripts")]
+    assert texts == ["screen 1"] * 4 + ["screen 2"] * 4
+
+
+@pytest.fixture
+def uploaded(db, tmp_path):
+    video_path = write_video(tmp_path / "static.mp4", ["same"] * 5)
+    last_used = datetime(2026, 1, 1, tzinfo=timezone.utc).isoformat()
+
+    async def seed():
+        await db.videos.insert_one({
+            "file_id": "v1", "path": video_path, "sha256": "abc",
+            "fps": 10, "frame_count": 100, "width": 320, "height": 240, "duration": 10.0
+        })
+        await db.video_blobs.insert_one({"sha256": "abc", "last_used": last_used})
+
+    asyncio.run(seed())
+    return last_used
+
+
+def test_estimate_applies_near_duplicate_share(db, uploaded, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    monkeypatch.setattr(server, "OCR_SKIP_NEAR_DUPLICATES", True)
+    client = TestClient(server.app)
+    sampled = client.get("/api/estimate", params={"file_id": "v1"}).json()
+    unsampled = client.get("/api/estimate", params={"file_id": "v1", "sample": "false"}).json()
+
+    assert sampled["frames_sent"] == unsampled["frames_sent"] == 10
+    assert sampled["near_duplicate_ratio"] == 1.0
+    assert sampled["ocr_calls"] == 1
+    assert unsampled["ocr_calls"] == 10
+    assert sampled["cost_usd"] < unsampled["cost_usd"]
+    assert sampled["input_tokens"] * 10 == unsampled["input_tokens"]
+
+
+def test_estimate_does_not_extend_retention(db, uploaded):
+    from fastapi.testclient import TestClient
+
+    TestClient(server.app).get("/api/estimate", params={"file_id": "v1", "sample": "false"})
+    blob = asyncio.run(db.video_blobs.find_one({"sha256": "abc"}))
+    assert blob["last_used"] == uploaded
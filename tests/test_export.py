@@ -0,0 +1,50 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+
+import server
+
+ORIGIN = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def test_video_timestamps_are_seconds():
+    assert server.entry_seconds("job", {"timestamp": 12.5}, None) == 12.5
+    assert server.entry_seconds("job", {"timestamp": "2026-01-01T00:00:00Z"}, None) is None
+
+
+def test_session_timestamps_are_offsets_from_the_first_frame():
+    epoch_ms = int(ORIGIN.timestamp() * 1000)
+    assert server.capture_time(epoch_ms) == ORIGIN
+    assert server.capture_time("2026-01-01T00:00:00") == ORIGIN
+    assert server.entry_seconds("session", {"timestamp": epoch_ms + 2500}, ORIGIN) == 2.5
+    assert server.entry_seconds("session", {"timestamp": "2026-01-01T00:00:04+00:00"}, ORIGIN) == 4.0
+    assert server.entry_seconds("session", {"timestamp": "garbage"}, ORIGIN) is None
+    assert server.entry_seconds("session", {"timestamp": epoch_ms}, None) is None
+
+
+def test_cue_formatting():
+    assert server.format_clock(3723.4567, ",") == "01:02:03,457"
+    entry = {"text": "hello"}
+    assert server.format_entry("srt", 3, entry, 1.0, 2.5) == "3\n00:00:01,000 --> 00:00:02,500\nhello\n\n"
+    assert server.format_entry("vtt", 3, entry, 1.0, 2.5) == "00:00:01.000 --> 00:00:02.500\nhello\n\n"
+    assert server.format_entry("txt", 3, entry, 61.0, 62.0) == "[01:01]\nhello\n\n"
+
+
+def test_job_export_streams_cues(db, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    monkeypatch.setattr(server, "TRANSCRIPT_STORAGE", "full")
+    transcripts = [
+        {"timestamp": 0.0, "text": "first", "frame_index": 0},
+        {"timestamp": 2.0, "text": "second", "frame_index": 60},
+    ]
+    asyncio.run(db.ocr_jobs.insert_one({"id": "job", "status": "completed", "transcripts": transcripts}))
+    client = TestClient(server.app)
+
+    srt = client.get("/api/job/job/export", params={"format": "srt"})
+    assert srt.headers["content-disposition"] == 'attachment; filename="transcript-job.srt"'
+    assert srt.text.startswith("1\n00:00:00,000 --> 00:00:02,000\nfirst\n\n2\n00:00:02,000 --> ")
+    lines = client.get("/api/job/job/export", params={"format": "jsonl"}).text.splitlines()
+    assert [json.loads(line)["text"] for line in lines] == ["first", "second"]
+    assert client.get("/api/job/job/export", params={"format": "doc"}).status_code == 400
+    assert client.get("/api/job/missing/export").status_code == 404
@@ -0,0 +1,69 @@
+import asyncio
+import base64
+import os
+import time
+
+import server
+
+
+def frames(count, size=100):
+    image = base64.b64encode(b"j" * size).decode()
+    return [(i * 30, float(i), image) for i in range(count)]
+
+
+def store(key, count, last_used):
+    set_dir = server.frame_cache_dir(key, 1.0, None, None)
+    server.store_cached_frames(set_dir, frames(count))
+    os.utime(set_dir / "manifest.json", (last_used, last_used))
+    return set_dir
+
+
+def test_cached_frames_round_trip(upload_dir):
+    set_dir = store("video", 3, time.time())
+    assert server.load_cached_frames(set_dir) == frames(3)
+    # Settings that change the frames get their own set
+    assert server.frame_cache_dir("video", 1.0, {"top": 10}, None) != set_dir
+    assert server.frame_cache_dir("video", 1.0, None, {"backend": "pyav", "threads": 4}) != set_dir
+    assert server.frame_cache_dir("video", 1.0, None, {"backend": "cv2", "threads": 4}) == set_dir
+
+
+def test_incomplete_set_is_a_miss(upload_dir):
+    set_dir = store("video", 2, time.time())
+    (set_dir / "30.jpg").unlink()
+    assert server.load_cached_frames(set_dir) is None
+
+
+def test_eviction_removes_least_recently_used_sets(upload_dir, monkeypatch):
+    monkeypatch.setattr(server, "FRAME_CACHE_MAX_BYTES", 10 ** 9)
+    now = time.time()
+    oldest = store("a", 2, now - 300)
+    used = store("b", 2, now - 200)
+    newest = store("c", 2, now - 100)
+    # Reading a set makes it the most recently used
+    server.load_cached_frames(used)
+    set_size = sum(f.stat().st_size for f in newest.iterdir())
+
+    kept = server.evict_frame_cache(2 * set_size)
+    assert kept == 2 * set_size
+    assert not oldest.exists() and not oldest.parent.exists()
+    assert used.exists() and newest.exists()
+
+
+def test_second_extraction_is_served_from_cache(upload_dir, monkeypatch):
+    decodes = []
+
+    def extract(video_path, interval, crop, trace):
+        decodes.append(video_path)
+        return frames(2)
+
+    monkeypatch.setattr(server, "_extract_frames_cv2", extract)
+
+    async def run():
+        first = await server.extract_frames_from_video("v.mp4", 1.0, None, None, "video", None, "sha")
+        second = await server.extract_frames_from_video("v.mp4", 1.0, None, None, "video", None, "sha")
+        uncached = await server.extract_frames_from_video("v.mp4", 1.0, None, None, "video", None, None)
+        return first, second, uncached
+
+    first, second, uncached = asyncio.run(run())
+    assert first == second == uncached == frames(2)
+    assert len(decodes) == 2
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+import server
+
+ZERO = 0
+ONES = (1 << 256) - 1
+
+
+def test_parse_phash():
+    assert server.parse_phash("f" * 64) == ONES
+    assert server.parse_phash("F" * 64) == ONES
+    assert server.parse_phash("f" * 63) is None
+    assert server.parse_phash("g" * 64) is None
+    assert server.parse_phash(None) is None
+
+
+def test_frame_hash_updates_only_records_valid_hashes():
+    frames = [{"frame_index": 1, "phash": "A" * 64}, {"frame_index": 2, "phash": "bad"}, {"frame_index": 3}]
+    assert server.frame_hash_updates(frames) == {"frame_hashes.1": "a" * 64}
+
+
+def test_select_frames_skips_unchanged_and_uploaded(monkeypatch):
+    monkeypatch.setattr(server, "PHASH_MAX_DISTANCE", 3)
+    known = {}
+    hashes = {1: ZERO, 2: 0b111, 3: 0b1111, 4: ONES, 5: ONES}
+    needed, skipped = server.select_frames(hashes, uploaded={5}, known=known)
+    assert needed == [1, 3, 4]
+    assert skipped == [
+        {"frame_index": 2, "reason": "unchanged", "duplicate_of": 1},
+        {"frame_index": 5, "reason": "uploaded"},
+    ]
+    assert known == {1: ZERO, 3: 0b1111, 4: ONES}
+
+
+def test_select_frames_compares_with_earlier_checks(monkeypatch):
+    monkeypatch.setattr(server, "PHASH_MAX_DISTANCE", 3)
+    # Frame 10 was needed in an earlier check; 11 is the same screen
+    needed, skipped = server.select_frames({11: 1}, uploaded=set(), known={10: ZERO, 12: ONES})
+    assert needed == []
+    assert skipped == [{"frame_index": 11, "reason": "unchanged", "duplicate_of": 10}]
+
+
+def test_frame_check_endpoint(db, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    monkeypatch.setattr(server, "PHASH_MAX_DISTANCE", 3)
+    client = TestClient(server.app)
+    code = client.post("/api/mobile/create-session").json()["session_code"]
+    check = lambda frames: client.post(f"/api/mobile/frame-check/{code}", json={"frames": frames})
+
+    first = check([{"frame_index": 1, "phash": "0" * 64}, {"frame_index": 2, "phash": "0" * 63 + "1"}]).json()
+    assert first["needed"] == [1]
+    assert first["skipped"] == [{"frame_index": 2, "reason": "unchanged", "duplicate_of": 1}]
+    # The needed hash is remembered for the next check
+    assert check([{"frame_index": 3, "phash": "0" * 63 + "3"}]).json()["needed"] == []
+    session = asyncio.run(db.mobile_sessions.find_one({"session_code": code}))
+    assert session["frame_hashes"] == {"1": "0" * 64}
+    assert session["frames_skipped"] == 2
+
+    assert check([{"frame_index": 4, "phash": "xyz"}]).status_code == 400
+    # A session that expired while its code was cached
+    asyncio.run(db.mobile_sessions.delete_one({"session_code": code}))
+    assert check([{"frame_index": 5, "phash": "f" * 64}]).status_code == 404
+    assert client.post("/api/mobile/frame-check/000000", json={"frames": []}).status_code == 404
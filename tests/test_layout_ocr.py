@@ -0,0 +1,83 @@
+import asyncio
+
+import server
+
+WORDS = [
+    {"text": "Header", "line": 0, "box": [0.1, 0.02, 0.4, 0.06]},
+    {"text": "world", "line": 1, "box": [0.3, 0.5, 0.5, 0.55]},
+    {"text": "hello", "line": 1, "box": [0.05, 0.5, 0.25, 0.55]},
+    {"text": "Footer", "line": 2, "box": [0.1, 0.94, 0.4, 0.98]},
+    {"text": "side", "line": 3, "box": [0.9, 0.7, 0.98, 0.74]},
+]
+
+
+def test_words_to_text_orders_lines_and_words():
+    assert server.words_to_text(WORDS) == "Header\nhello world\nside\nFooter"
+
+
+def test_words_to_text_keeps_words_centred_in_crop():
+    crop = {"top": 10, "bottom": 10, "left": 0, "right": 20}
+    assert server.words_to_text(WORDS, crop) == "hello world"
+
+
+def test_layout_transcripts_drops_empty_frames():
+    frames = [
+        {"frame_index": 0, "timestamp": 0.0, "words": WORDS},
+        {"frame_index": 30, "timestamp": 1.0, "words": [WORDS[0]]},
+    ]
+    assert server.layout_transcripts(frames, {"top": 10}) == [
+        {"timestamp": 0.0, "text": "hello world\nside\nFooter", "frame_index": 0}
+    ]
+
+
+def test_failed_layout_frames_are_retried_then_reported(db, monkeypatch):
+    frames = [(0, 0.0, "img0"), (30, 1.0, "img1"), (60, 2.0, "img2")]
+    calls = []
+
+    async def extract(*args, **kwargs):
+        return frames
+
+    async def ocr(base64_image, *args):
+        calls.append(base64_image)
+        # img1 fails once, img2 every time
+        if base64_image == "img2" or (base64_image == "img1" and calls.count("img1") == 1):
+            return None
+        return [WORDS[1]]
+
+    monkeypatch.setattr(server, "extract_frames_from_video", extract)
+    monkeypatch.setattr(server, "ocr_frame_layout", ocr)
+    trace = server.JobTrace("video", "job", enabled=False)
+    stored, failed = asyncio.run(server.layout_ocr_frames(
+        "file", "video.mp4", 1.0, {"backend": "pyav"}, "key", "video", trace
+    ))
+
+    assert [doc["frame_index"] for doc in stored] == [0, 30]
+    assert [frame["frame_index"] for frame in failed] == [60]
+    assert calls == ["img0", "img1", "img2", "img1", "img2"]
+    # The failed frame is not stored, so the next run OCRs it again
+    assert asyncio.run(db.frame_ocr.count_documents({"content_id": "file"})) == 2
+
+
+def test_jobs_with_failed_frames_are_not_reused(db):
+    decode = server.build_decode_settings("cv2", 0, None)
+    job = {
+        "id": "job",
+        "content_id": "sha",
+        "status": "completed",
+        "frame_interval": 1.0,
+        "crop": {},
+        "ocr_mode": "layout",
+        "decode": decode,
+        "failed_frames": [{"frame_index": 60, "timestamp": 2.0, "error": "[OCR Error: layout OCR failed]"}],
+    }
+    query = server.reusable_job_query("sha", 1.0, {}, decode, "layout")
+
+    async def run():
+        await db.ocr_jobs.insert_one(dict(job))
+        missing = await db.ocr_jobs.find_one(query)
+        await db.ocr_jobs.update_one({"id": "job"}, {"$set": {"failed_frames": []}})
+        return missing, await db.ocr_jobs.find_one(query)
+
+    missing, found = asyncio.run(run())
+    assert missing is None
+    assert found["id"] == "job"
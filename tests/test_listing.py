@@ -0,0 +1,52 @@
+import asyncio
+import base64
+
+import pytest
+from fastapi import HTTPException
+
+import server
+
+
+def test_cursor_round_trip():
+    cursor = server.encode_cursor("2026-01-02T03:04:05+00:00", "job-1")
+    assert server.decode_cursor(cursor) == ("2026-01-02T03:04:05+00:00", "job-1")
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    base64.urlsafe_b64encode(b"{}").decode(),
+    base64.urlsafe_b64encode(b'["only one"]').decode(),
+    base64.urlsafe_b64encode(b"[1, 2]").decode(),
+])
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        server.decode_cursor(cursor)
+    assert error.value.status_code == 400
+
+
+def test_pages_walk_every_job_once_newest_first(db):
+    from fastapi.testclient import TestClient
+
+    # Two jobs share each created_at, so the id breaks ties
+    jobs = [
+        {"id": f"job-{i}", "status": "completed" if i % 3 else "failed",
+         "created_at": f"2026-01-01T00:00:{i // 2:02d}+00:00", "transcripts": [{"text": "x"}]}
+        for i in range(7)
+    ]
+    asyncio.run(db.ocr_jobs.insert_many([dict(job) for job in jobs]))
+    client = TestClient(server.app)
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/api/jobs", params=params).json()
+        assert all("transcripts" not in item for item in page["items"])
+        seen += [item["id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    expected = sorted(jobs, key=lambda job: (job["created_at"], job["id"]), reverse=True)
+    assert seen == [job["id"] for job in expected]
+
+    failed = client.get("/api/jobs", params={"status": "failed"}).json()["items"]
+    assert [item["id"] for item in failed] == ["job-6", "job-3", "job-0"]
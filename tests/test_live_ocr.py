@@ -0,0 +1,96 @@
+import asyncio
+
+import server
+
+SCREENS = {"a": "Inbox: 3 unread", "b": "Settings / Privacy", "c": "Order #1234 shipped"}
+
+
+def frame(index, image):
+    return {"frame_index": index, "image_base64": image, "timestamp": 1000 + index}
+
+
+def test_worker_ocrs_new_frames_in_order_and_drains(db, monkeypatch):
+    calls = []
+
+    async def ocr_frame(image, *args):
+        calls.append(image)
+        await asyncio.sleep(0.01)
+        return f"text of {image}"
+
+    monkeypatch.setattr(server, "ocr_frame", ocr_frame)
+
+    async def run():
+        await db.mobile_sessions.insert_one({"session_id": "s1", "ocr_results": []})
+        worker = server.LiveOcrWorker("s1", "key")
+        for item in [frame(3, "c"), frame(1, "a"), frame(2, "b"), frame(4, "a"), frame(5, "")]:
+            worker.submit(item)
+        await worker.drain()
+        await asyncio.sleep(0)
+        session = await db.mobile_sessions.find_one({"session_id": "s1"})
+        return worker, session["ocr_results"]
+
+    worker, results = asyncio.run(run())
+    assert worker.task.done()
+    # Lowest frame_index first, and a repeated image only once
+    assert calls == ["a", "b", "c"]
+    assert {r["image_hash"]: r["text"] for r in results} == {
+        server.frame_hash(image): f"text of {image}" for image in "abc"
+    }
+
+
+def test_processing_reuses_live_results(db, monkeypatch):
+    monkeypatch.setenv("EMERGENT_LLM_KEY", "key")
+    monkeypatch.setattr(server, "TRANSCRIPT_STORAGE", "full")
+    calls = []
+
+    async def ocr_frame(image, *args):
+        calls.append(image)
+        return SCREENS[image]
+
+    monkeypatch.setattr(server, "ocr_frame", ocr_frame)
+    frames = [frame(1, "a"), frame(2, "b"), frame(3, "c")]
+
+    async def run():
+        await db.mobile_sessions.insert_one(
+            {"session_id": "s1", "session_code": "123456", "frames": frames, "ocr_results": []}
+        )
+        server.submit_live_frames("s1", frames[:2])
+        await server.process_mobile_capture("s1")
+        return await db.mobile_sessions.find_one({"session_id": "s1"})
+
+    session = asyncio.run(run())
+    # Live OCR finished its queue before processing, which only OCR'd the new frame
+    assert sorted(calls) == ["a", "b", "c"]
+    assert "s1" not in server.live_ocr_workers
+    assert [t["text"] for t in session["processed_transcripts"]] == list(SCREENS.values())
+
+
+def test_cancelling_during_drain_stops_the_worker(db, monkeypatch):
+    monkeypatch.setenv("EMERGENT_LLM_KEY", "key")
+    calls = []
+
+    async def ocr_frame(image, *args):
+        calls.append(image)
+        await asyncio.sleep(1)
+        return SCREENS[image]
+
+    monkeypatch.setattr(server, "ocr_frame", ocr_frame)
+    frames = [frame(1, "a"), frame(2, "b"), frame(3, "c")]
+
+    async def run():
+        await db.mobile_sessions.insert_one(
+            {"session_id": "s1", "session_code": "123456", "frames": frames, "ocr_results": []}
+        )
+        server.submit_live_frames("s1", frames)
+        worker = server.live_ocr_workers["s1"]
+        processing = asyncio.create_task(server.process_mobile_capture("s1"))
+        await asyncio.sleep(0.05)
+        processing.cancel()
+        await asyncio.gather(processing, return_exceptions=True)
+        await asyncio.sleep(0)
+        return worker, await db.mobile_sessions.find_one({"session_id": "s1"})
+
+    worker, session = asyncio.run(run())
+    assert session["status"] == "cancelled"
+    assert worker.task.done()
+    assert calls == ["a"]
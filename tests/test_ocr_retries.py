@@ -0,0 +1,125 @@
+import asyncio
+
+import httpx
+import pytest
+
+import server
+
+
+def status_error(status):
+    request = httpx.Request("POST", "https://ocr.test/chat/completions")
+    return httpx.HTTPStatusError("error", request=request, response=httpx.Response(status, request=request))
+
+
+class RateLimitError(Exception):
+    """Named like the provider class LlmChat raises."""
+
+
+class AuthenticationError(Exception):
+    status_code = 401
+
+
+@pytest.mark.parametrize("error, transient", [
+    (asyncio.TimeoutError(), True),
+    (httpx.ConnectError("refused"), True),
+    (status_error(429), True),
+    (status_error(503), True),
+    (status_error(400), False),
+    (status_error(401), False),
+    (RateLimitError("slow down"), True),
+    (AuthenticationError("invalid key"), False),
+    (ValueError("bad image"), False),
+])
+def test_is_transient_error(error, transient):
+    assert server.is_transient_error(error) is transient
+
+
+def test_wrapped_provider_error_is_classified_by_its_cause():
+    try:
+        try:
+            raise RateLimitError("slow down")
+        except RateLimitError as e:
+            raise Exception("Failed to generate chat completion") from e
+    except Exception as wrapped:
+        assert server.is_transient_error(wrapped)
+
+
+@pytest.fixture
+def fake_ocr(monkeypatch):
+    """Replace the transport with a script of results (exceptions are raised)."""
+    monkeypatch.setattr(server, "OCR_RETRY_BACKOFF", 0.01)
+    monkeypatch.setattr(server, "OCR_HEDGING", False)
+    monkeypatch.setattr(server, "ocr_scheduler", server.FairShareScheduler(1))
+    script = []
+
+    async def complete(*args):
+        result = script.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    monkeypatch.setattr(server.ocr_client, "complete", complete)
+    return script
+
+
+def test_transient_errors_are_retried(fake_ocr):
+    fake_ocr.extend([status_error(503), httpx.ReadTimeout("slow"), "text"])
+    assert asyncio.run(server.request_ocr("img", "key", "system", "prompt", "video")) == "text"
+    assert fake_ocr == []
+
+
+def test_permanent_errors_fail_fast(fake_ocr):
+    fake_ocr.extend([status_error(401), "text"])
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(server.request_ocr("img", "key", "system", "prompt", "video"))
+    assert fake_ocr == ["text"]
+
+
+def test_retries_give_up_after_max_retries(fake_ocr, monkeypatch):
+    monkeypatch.setattr(server, "OCR_MAX_RETRIES", 1)
+    fake_ocr.extend([status_error(503), status_error(502), "text"])
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(server.request_ocr("img", "key", "system", "prompt", "video"))
+    assert fake_ocr == ["text"]
+
+
+def test_slot_is_released_while_backing_off(fake_ocr, monkeypatch):
+    monkeypatch.setattr(server, "OCR_RETRY_BACKOFF", 0.2)
+    monkeypatch.setattr(server.random, "uniform", lambda low, high: high)
+    fake_ocr.extend([status_error(503), "text"])
+
+    async def run():
+        failing = asyncio.create_task(server.request_ocr("img", "key", "system", "prompt", "video", "a"))
+        await asyncio.sleep(0.05)
+        # "a" is sleeping before its retry, so "b" gets the only slot at once
+        await asyncio.wait_for(server.ocr_scheduler.acquire("b"), 0.05)
+        server.ocr_scheduler.release()
+        return await failing
+
+    assert asyncio.run(run()) == "text"
+
+
+def test_hedged_request_wins_over_slow_first_attempt(monkeypatch):
+    monkeypatch.setattr(server, "OCR_HEDGING", True)
+    monkeypatch.setattr(server, "OCR_HEDGE_MIN_DELAY", 0.01)
+    monkeypatch.setattr(server, "ocr_latency", server.LatencyWindow(min_samples=1))
+    server.ocr_latency.record(0.01)
+    delays = [1.0, 0.0]
+
+    async def complete(base64_image, *args):
+        delay = delays.pop(0)
+        await asyncio.sleep(delay)
+        return f"answered after {delay}"
+
+    monkeypatch.setattr(server.ocr_client, "complete", complete)
+    result = asyncio.run(asyncio.wait_for(server.hedged_complete("img", "key", "system", "prompt", "video"), 0.5))
+    assert result == "answered after 0.0"
+
+
+def test_latency_window_percentile():
+    window = server.LatencyWindow(min_samples=3)
+    window.record(1.0)
+    assert window.p95() is None
+    for seconds in range(2, 21):
+        window.record(float(seconds))
+    assert window.p95() == 19.0
@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+
+import server
+
+
+def test_free_slots_are_granted_immediately():
+    async def run():
+        scheduler = server.FairShareScheduler(2)
+        await scheduler.acquire("a")
+        await scheduler.acquire("a")
+        assert scheduler.free == 0
+        scheduler.release()
+        scheduler.release()
+        assert scheduler.stats() == {"slots": 2, "free": 2, "waiting": {}}
+
+    asyncio.run(run())
+
+
+def test_contended_slots_rotate_between_owners():
+    async def run():
+        scheduler = server.FairShareScheduler(1)
+        granted = []
+        await scheduler.acquire("holder")
+
+        async def job(owner, name):
+            async with scheduler.slot(owner):
+                granted.append(name)
+                await asyncio.sleep(0)
+
+        tasks = [asyncio.create_task(job(owner, name)) for owner, name in
+                 [("a", "a1"), ("a", "a2"), ("a", "a3"), ("b", "b1"), ("b", "b2")]]
+        await asyncio.sleep(0)
+        assert scheduler.stats()["waiting"] == {"a": 3, "b": 2}
+        scheduler.release()
+        await asyncio.gather(*tasks)
+        return granted, scheduler.free
+
+    granted, free = asyncio.run(run())
+    assert granted == ["a1", "b1", "a2", "b2", "a3"]
+    assert free == 1
+
+
+def test_cancelled_waiter_gives_up_its_turn():
+    async def run():
+        scheduler = server.FairShareScheduler(1)
+        await scheduler.acquire("holder")
+        waiting = asyncio.create_task(scheduler.acquire("a"))
+        await asyncio.sleep(0)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        assert scheduler.stats()["waiting"] == {}
+        scheduler.release()
+        return scheduler.free
+
+    assert asyncio.run(run()) == 1
+
+
+def test_slot_records_queue_wait():
+    async def run():
+        scheduler = server.FairShareScheduler(1)
+        trace = server.JobTrace("video", "job", enabled=True)
+        async with scheduler.slot("a", trace):
+            pass
+        return trace.summary()["stages"]
+
+    assert "ocr_queue_wait" in asyncio.run(run())
+
+
+def test_batches_are_owned_by_the_client_address(db):
+    from fastapi.testclient import TestClient
+
+    decode = server.build_decode_settings("cv2", 0, None)
+    crop = {"top": 0, "bottom": 0, "left": 0, "right": 0}
+
+    async def seed():
+        await db.videos.insert_one({"file_id": "v1", "path": "/uploads/v1.mp4", "fps": 30, "frame_count": 90})
+        # An identical finished job, so the batch completes from it without running anything
+        await db.ocr_jobs.insert_one({
+            "id": "earlier", "content_id": "v1", "status": "completed", "frame_interval": 1.0,
+            "crop": crop, "decode": decode, "ocr_mode": "text", "transcripts": []
+        })
+
+    asyncio.run(seed())
+    client = TestClient(server.app)
+    owners = set()
+    for client_id in ("batch-1", "batch-2"):
+        response = client.post("/api/process-batch", json={"file_ids": ["v1"], "client_id": client_id})
+        assert response.status_code == 200
+        batch = asyncio.run(db.batches.find_one({"id": response.json()["batch_id"]}))
+        owners.add(batch["owner"])
+    # A caller-chosen client_id no longer buys extra fair-share turns
+    assert owners == {"testclient"}
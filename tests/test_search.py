@@ -0,0 +1,31 @@
+import asyncio
+
+import server
+
+
+def test_snippet_centres_on_first_matching_term(monkeypatch):
+    monkeypatch.setattr(server, "SNIPPET_CHARS", 45)
+    text = "alpha beta gamma\n" * 5 + "needle in the\nhaystack " + "omega " * 10
+    snippet = server.make_snippet(text, '"needle haystack"')
+    assert snippet.startswith("...") and snippet.endswith("...")
+    assert "needle in the haystack" in snippet
+    assert "\n" not in snippet
+
+
+def test_snippet_without_match_starts_at_the_beginning():
+    assert server.make_snippet("short text", "missing") == "short text"
+
+
+def test_index_replaces_a_jobs_entries(db):
+    async def run():
+        await db.ocr_jobs.insert_one({"id": "job", "filename": "talk.mp4", "created_at": "2026-01-01T00:00:00+00:00"})
+        await server.index_transcripts("job", "job", [{"text": "old", "frame_index": 0, "timestamp": 0.0}])
+        await server.index_transcripts("job", "job", [
+            {"text": "one", "frame_index": 0, "timestamp": 0.0},
+            {"text": "two", "frame_index": 30, "timestamp": 1.0},
+        ])
+        return await db.transcript_entries.find({}, {"_id": 0}).to_list(None)
+
+    entries = asyncio.run(run())
+    assert [entry["text"] for entry in entries] == ["one", "two"]
+    assert {entry["label"] for entry in entries} == {"talk.mp4"}
@@ -0,0 +1,74 @@
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+import server
+
+
+def iso(hours_ago):
+    return (datetime.now(timezone.utc) - timedelta(hours=hours_ago)).isoformat()
+
+
+def age(path, seconds):
+    then = time.time() - seconds
+    os.utime(path, (then, then))
+
+
+def test_sweep_releases_evicts_and_cleans_up(db, upload_dir, monkeypatch):
+    monkeypatch.setattr(server, "UPLOAD_QUOTA_BYTES", 250)
+    files = {}
+    for name in ("released", "active", "old", "recent"):
+        files[name] = upload_dir / f"{name}.mp4"
+        files[name].write_bytes(b"x" * 100)
+    blobs = [
+        # Every upload released long ago
+        {"sha256": "released", "refcount": 0, "size": 100, "last_used": iso(5)},
+        # Oldest, but a running job still reads it
+        {"sha256": "active", "refcount": 1, "size": 100, "last_used": iso(10)},
+        {"sha256": "old", "refcount": 1, "size": 100, "last_used": iso(3)},
+        {"sha256": "recent", "refcount": 1, "size": 100, "last_used": iso(2)},
+    ]
+    partial = upload_dir / "abandoned.part"
+    orphan = upload_dir / "orphan.mp4"
+    fresh = upload_dir / "uploading.part"
+    for path, seconds in ((partial, 7200), (orphan, 2 * 86400), (fresh, 10)):
+        path.write_bytes(b"y")
+        age(path, seconds)
+
+    async def run():
+        await db.video_blobs.insert_many([{**blob, "path": str(files[blob["sha256"]])} for blob in blobs])
+        await db.videos.insert_many([
+            {"file_id": name, "sha256": name, "path": str(files[name])} for name in ("active", "old", "recent")
+        ])
+        await db.ocr_jobs.insert_one({"id": "job", "content_id": "active", "status": "processing"})
+        result = await server.sweep_storage()
+        remaining = {blob["sha256"] for blob in await db.video_blobs.find().to_list(None)}
+        old_upload = await db.videos.find_one({"file_id": "old"})
+        return result, remaining, old_upload
+
+    result, remaining, old_upload = asyncio.run(run())
+    assert (result["released_videos"], result["evicted_videos"]) == (1, 1)
+    assert (result["partial_uploads"], result["orphan_files"]) == (1, 1)
+    assert result["video_bytes"] == 200
+    # The least recently used evictable video goes; the one in use stays despite being older
+    assert remaining == {"active", "recent"}
+    assert old_upload["path"] is None
+    assert sorted(p.name for p in upload_dir.iterdir()) == ["active.mp4", "recent.mp4", "uploading.part"]
+
+
+def test_sweep_spares_recently_used_unreferenced_videos(db, upload_dir):
+    video = upload_dir / "new.mp4"
+    video.write_bytes(b"x")
+
+    async def run():
+        # An upload in progress has its blob before its videos document
+        await db.video_blobs.insert_one(
+            {"sha256": "new", "refcount": 1, "size": 1, "path": str(video), "last_used": iso(0)}
+        )
+        result = await server.sweep_storage()
+        return result, await db.video_blobs.count_documents({})
+
+    result, blobs = asyncio.run(run())
+    assert result["released_videos"] == 0
+    assert blobs == 1 and video.exists()
@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+from bson import BSON
+
+import server
+
+
+def scrolling(entries, window=8):
+    lines = [f"line {i}" for i in range(entries + window)]
+    return [
+        {"timestamp": float(i), "frame_index": i * 10, "text": "\n".join(lines[i:i + window])}
+        for i in range(entries)
+    ]
+
+
+@pytest.fixture(params=[False, True], ids=["delta", "delta+zstd"])
+def zstd(request, monkeypatch):
+    if request.param and server.zstandard is None:
+        pytest.skip("zstandard not installed")
+    monkeypatch.setattr(server, "TRANSCRIPT_ZSTD", request.param)
+    monkeypatch.setattr(server, "TRANSCRIPT_KEYFRAME_INTERVAL", 5)
+    return request.param
+
+
+def test_round_trip(zstd):
+    entries = scrolling(23)
+    entries[7]["text"] = "completely different"
+    entries[8]["text"] = ""
+    entries[9]["text"] = "a\n\nb\n"
+    packed = server.pack_transcripts(entries)
+    assert packed["format"] == ("delta+zstd" if zstd else "delta")
+    assert server.unpack_transcripts(packed) == entries
+
+
+def test_round_trip_empty(zstd):
+    assert server.unpack_transcripts(server.pack_transcripts([])) == []
+
+
+def test_keyframes_and_deltas(monkeypatch):
+    monkeypatch.setattr(server, "TRANSCRIPT_ZSTD", False)
+    monkeypatch.setattr(server, "TRANSCRIPT_KEYFRAME_INTERVAL", 5)
+    items = server.pack_transcripts(scrolling(12))["entries"]
+    assert [("text" in item) for item in items] == [i % 5 == 0 for i in range(12)]
+    # One line scrolled off the top, one new line at the bottom
+    assert items[1]["ops"] == [[0, 1, []], [8, 8, ["line 8"]]]
+
+
+def test_changed_entry_stored_whole(monkeypatch):
+    monkeypatch.setattr(server, "TRANSCRIPT_ZSTD", False)
+    items = server.pack_transcripts([{"text": "one\ntwo"}, {"text": "three\nfour"}])["entries"]
+    assert items[1] == {"text": "three\nfour"}
+
+
+def test_transcript_fields_by_mode(monkeypatch):
+    entries = scrolling(3)
+    monkeypatch.setattr(server, "TRANSCRIPT_STORAGE", "full")
+    assert server.transcript_fields("transcripts", entries) == {"transcripts": entries, "transcripts_packed": None}
+    monkeypatch.setattr(server, "TRANSCRIPT_STORAGE", "delta")
+    monkeypatch.setattr(server, "TRANSCRIPT_ZSTD", False)
+    fields = server.transcript_fields("transcripts", entries)
+    assert fields["transcripts"] == []
+    record = {"id": "job", **fields}
+    assert server.stored_transcripts(record, "transcripts") == entries
+    assert server.unpack_record(record, "transcripts") == {"id": "job", "transcripts": entries}
+
+
+def test_unpack_record_leaves_plain_documents():
+    record = {"id": "job", "transcripts": [{"text": "a"}]}
+    assert server.unpack_record(dict(record), "transcripts") == record
+    assert server.unpack_record(None, "transcripts") is None
+
+
+def test_packed_scrolling_transcript_is_smaller(monkeypatch):
+    if server.zstandard is None:
+        pytest.skip("zstandard not installed")
+    monkeypatch.setattr(server, "TRANSCRIPT_KEYFRAME_INTERVAL", 50)
+    entries = scrolling(200, window=20)
+    full = len(BSON.encode({"entries": entries}))
+    monkeypatch.setattr(server, "TRANSCRIPT_ZSTD", False)
+    delta = len(BSON.encode(server.pack_transcripts(entries)))
+    monkeypatch.setattr(server, "TRANSCRIPT_ZSTD", True)
+    packed = server.pack_transcripts(entries)
+    assert isinstance(packed["data"], bytes)
+    assert len(packed["data"]) < delta < full
+
+
+def test_packed_job_is_served_unpacked(db, zstd, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    monkeypatch.setattr(server, "TRANSCRIPT_STORAGE", "delta")
+    entries = scrolling(12)
+    job = {"id": "packed-job", "status": "completed", "created_at": "2026-01-01T00:00:00+00:00",
+           **server.transcript_fields("transcripts", entries)}
+    asyncio.run(db.ocr_jobs.insert_one(job))
+
+    stored = asyncio.run(db.ocr_jobs.find_one({"id": "packed-job"}))
+    assert stored["transcripts"] == []
+    assert server.stored_transcripts(stored, "transcripts") == entries
+    server.jobs_cache.invalidate("ocr_jobs:packed-job")
+    body = TestClient(server.app).get("/api/job/packed-job").json()
+    assert body["transcripts"] == entries
+    assert "transcripts_packed" not in body
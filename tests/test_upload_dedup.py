@@ -0,0 +1,45 @@
+import asyncio
+
+import server
+
+
+def upload(client, content, name="clip.mp4"):
+    response = client.post("/api/upload-video", files={"file": (name, content, "video/mp4")})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_identical_uploads_share_one_file(db, upload_dir):
+    from fastapi.testclient import TestClient
+
+    client = TestClient(server.app)
+    first = upload(client, b"same bytes")
+    second = upload(client, b"same bytes", "copy.mp4")
+    other = upload(client, b"other bytes")
+
+    assert (first["deduplicated"], second["deduplicated"], other["deduplicated"]) == (False, True, False)
+    assert first["path"] == second["path"] != other["path"]
+    assert sorted(p.name for p in upload_dir.iterdir()) == sorted(
+        [f"{server.hashlib.sha256(b).hexdigest()}.mp4" for b in (b"same bytes", b"other bytes")]
+    )
+    blob = asyncio.run(db.video_blobs.find_one({"path": first["path"]}))
+    assert blob["refcount"] == 2
+
+
+def test_release_deletes_the_file_with_its_last_reference(db, upload_dir):
+    from fastapi.testclient import TestClient
+
+    client = TestClient(server.app)
+    first = upload(client, b"same bytes")
+    second = upload(client, b"same bytes")
+    path = upload_dir / first["path"].rsplit("/", 1)[-1]
+
+    async def release(file_id):
+        await server.release_video(file_id, str(path))
+        return path.exists(), await db.video_blobs.find_one({}, {"_id": 0, "refcount": 1})
+
+    assert asyncio.run(release(first["file_id"])) == (True, {"refcount": 1})
+    # Releasing the same upload twice must not drop the other upload's reference
+    assert asyncio.run(release(first["file_id"])) == (True, {"refcount": 1})
+    assert asyncio.run(release(second["file_id"])) == (False, None)
+    assert asyncio.run(server.find_video(first["file_id"])) is None